@@ -0,0 +1,88 @@
+"""
+BIN PASS BENCHMARK.
+-------------------
+
+Compare binning satellite passes into healpix pixels with a
+:func:`~numpy.where` search for every pixel, and with the
+single pass :func:`~embers.tile_maps.tile_maps.bin_pass`
+on synthetic passes across the sky
+
+"""
+
+import argparse
+import timeit
+
+import healpy as hp
+import numpy as np
+from embers.tile_maps.tile_maps import bin_pass
+
+parser = argparse.ArgumentParser(
+    description="""
+        Benchmark binning satellite passes into healpix pixels
+        """
+)
+
+parser.add_argument(
+    "--nside", metavar="\b", type=int, default=32, help="Healpix nside. Default=32"
+)
+
+parser.add_argument(
+    "--repeat",
+    metavar="\b",
+    type=int,
+    default=10,
+    help="Number of times each pass is binned. Default=10",
+)
+
+args = parser.parse_args()
+nside = args.nside
+repeat = args.repeat
+
+
+def bin_pass_where(healpix_index, ref_power, tile_power, times):
+    """Bin a pass with a search of the samples for every pixel."""
+
+    u = np.unique(healpix_index)
+    ref_pass = np.array(
+        [np.nanmean(ref_power[np.where(healpix_index == i)[0]]) for i in u]
+    )
+    tile_pass = np.array(
+        [np.nanmean(tile_power[np.where(healpix_index == i)[0]]) for i in u]
+    )
+    times_pass = np.array([np.mean(times[np.where(healpix_index == i)][0]) for i in u])
+
+    return (u, ref_pass, tile_pass, times_pass)
+
+
+rng = np.random.default_rng(0)
+
+# Passes from horizon to horizon, sampled once a second
+for samples in [300, 900, 1800]:
+
+    alt = np.radians(np.concatenate([np.linspace(0, 80, samples // 2), [80]]))
+    alt = np.concatenate([alt, alt[::-1]])[:samples]
+    az = np.linspace(0.3, np.pi + 0.3, samples)
+    healpix_index = hp.ang2pix(nside, np.pi / 2 - alt, az)
+
+    ref_power = rng.normal(-40, 5, samples).astype(np.float32)
+    tile_power = rng.normal(-30, 5, samples).astype(np.float32)
+    ref_power[rng.random(samples) < 0.05] = np.nan
+    times = 1570000000 + np.arange(samples, dtype=np.float64)
+
+    args = (healpix_index, ref_power, tile_power, times)
+    binned = bin_pass(*args)
+    binned_ref = bin_pass_where(*args)
+    assert np.array_equal(binned[0], binned_ref[0])
+    assert np.array_equal(binned[3], binned_ref[3])
+    for mean, mean_ref in zip(binned[1:3], binned_ref[1:3]):
+        assert np.allclose(mean, mean_ref, rtol=1e-6, equal_nan=True)
+
+    t_where = min(timeit.repeat(lambda: bin_pass_where(*args), number=1, repeat=repeat))
+    t_bincount = min(timeit.repeat(lambda: bin_pass(*args), number=1, repeat=repeat))
+
+    print(
+        f"{samples} samples in {binned[0].size} pixels: "
+        f"np.where {t_where * 1e3:.2f} ms, "
+        f"bincount {t_bincount * 1e3:.2f} ms, "
+        f"speedup {t_where / t_bincount:.1f}x"
+    )
@@ -0,0 +1,63 @@
+"""
+READ DATA BENCHMARK.
+--------------------
+
+Compare the line by line rf data decoder with the
+vectorised :func:`~embers.rf_tools.rf_data.read_data`
+on the test data in ``tests/data/rf_tools/rf_data``
+
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+import numpy as np
+from embers.rf_tools.rf_data import _read_data_lines, read_data
+
+parser = argparse.ArgumentParser(
+    description="""
+        Benchmark rf data decoders
+        """
+)
+
+parser.add_argument(
+    "--rf_dir",
+    metavar="\b",
+    default="../tests/data/rf_tools/rf_data",
+    help="Directory with raw rf data. Default=../tests/data/rf_tools/rf_data",
+)
+
+parser.add_argument(
+    "--repeat",
+    metavar="\b",
+    type=int,
+    default=10,
+    help="Number of times each file is decoded. Default=10",
+)
+
+args = parser.parse_args()
+rf_dir = Path(args.rf_dir)
+repeat = args.repeat
+
+# Skip empty files, which only serve as missing data in tests
+rf_files = sorted(f for f in rf_dir.glob("*/*/*.txt") if f.stat().st_size > 0)
+
+for rf_file in rf_files:
+
+    power, times = read_data(rf_file)
+    power_ref, times_ref = _read_data_lines(rf_file)
+    assert np.array_equal(power, power_ref) and power.dtype == power_ref.dtype
+    assert np.array_equal(times, times_ref) and times.dtype == times_ref.dtype
+
+    t_lines = min(
+        timeit.repeat(lambda: _read_data_lines(rf_file), number=1, repeat=repeat)
+    )
+    t_numpy = min(timeit.repeat(lambda: read_data(rf_file), number=1, repeat=repeat))
+
+    print(
+        f"{rf_file.name}: {power.shape[0]} lines, "
+        f"line by line {t_lines * 1e3:.1f} ms, "
+        f"vectorised {t_numpy * 1e3:.1f} ms, "
+        f"speedup {t_lines / t_numpy:.1f}x"
+    )
@@ -54,6 +54,8 @@ setup(
             "colormaps=embers.kindle.colormaps:main",
             "waterfall_single=embers.kindle.waterfall_single:main",
             "waterfall_batch=embers.kindle.waterfall_batch:main",
+            "rf_cache=embers.kindle.rf_cache:main",
+            "rf_archive=embers.kindle.rf_archive:main",
             "align_single=embers.kindle.align_single:main",
             "align_batch=embers.kindle.align_batch:main",
             "download_tle=embers.kindle.download_tle:main",
@@ -102,6 +102,20 @@ def main():
         help="Maximum number of cores to be used by this script. By default all core available cores are used",
     )
 
+    _parser.add_argument(
+        "--engine",
+        metavar="\b",
+        default="scipy",
+        choices=["scipy", "fused"],
+        help="Interpolation and smoothing engine, scipy or fused. Default=scipy",
+    )
+
+    _parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip outputs which are up to date in the manifest of out_dir, recomputing only missing or stale outputs",
+    )
+
     _args = _parser.parse_args()
     _start_date = _args.start_date
     _stop_date = _args.stop_date
@@ -113,6 +127,8 @@ def main():
     _data_dir = _args.data_dir
     _out_dir = _args.out_dir
     _max_cores = _args.max_cores
+    _engine = _args.engine
+    _resume = _args.resume
 
     print(f"Aligned files saved to: {_out_dir}")
     align_batch(
@@ -126,4 +142,6 @@ def main():
         data_dir=_data_dir,
         out_dir=_out_dir,
         max_cores=_max_cores,
+        engine=_engine,
+        resume=_resume,
     )
@@ -52,12 +52,28 @@ def main():
         help="Dir where satellite TLE files are saved. Default=./embers_out/sat_utils/TLE",
     )
 
+    _parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only download TLEs newer than the last epoch of existing TLE files, and append them",
+    )
+
+    _parser.add_argument(
+        "--batch_size",
+        metavar="\b",
+        default=25,
+        type=int,
+        help="Number of satellites in each Space-Track.org query. Default=25",
+    )
+
     _args = _parser.parse_args()
     _start_date = _args.start_date
     _stop_date = _args.stop_date
     _st_ident = _args.st_ident
     _st_pass = _args.st_pass
     _out_dir = _args.out_dir
+    _incremental = _args.incremental
+    _batch_size = _args.batch_size
 
     n_ids = norad_ids()
 
@@ -78,4 +94,6 @@ def main():
         st_ident=_st_ident,
         st_pass=_st_pass,
         out_dir=_out_dir,
+        incremental=_incremental,
+        batch_size=_batch_size,
     )
@@ -65,6 +65,18 @@ def main():
         type=int,
         help="Maximum number of cores to be used by this script. By default all core available cores are used",
     )
+    _parser.add_argument(
+        "--coarse_step",
+        metavar="\b",
+        type=int,
+        help="Find satellite passes with a coarse scan at this step, in seconds, evaluating sat alt/az at the cadence only within passes. By default every cadence is evaluated",
+    )
+
+    _parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip outputs which are up to date in the manifest of out_dir, recomputing only missing or stale outputs",
+    )
 
     _args = _parser.parse_args()
     _tle_dir = _args.tle_dir
@@ -73,8 +85,19 @@ def main():
     _alpha = _args.alpha
     _out_dir = _args.out_dir
     _max_cores = _args.max_cores
+    _resume = _args.resume
+    _coarse_step = _args.coarse_step
 
     print(f"Saving logs to {_out_dir}/ephem_data")
     print(f"Saving sky coverage plots to {_out_dir}/ephem_plots")
     print(f"Saving ephemeris of satellites to {_out_dir}/ephem_data")
-    ephem_batch(_tle_dir, _cadence, _location, _alpha, _out_dir, max_cores=_max_cores)
+    ephem_batch(
+        _tle_dir,
+        _cadence,
+        _location,
+        _alpha,
+        _out_dir,
+        max_cores=_max_cores,
+        resume=_resume,
+        coarse_step=_coarse_step,
+    )
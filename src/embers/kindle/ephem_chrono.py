@@ -76,6 +76,19 @@ def main():
         default="./embers_out/sat_utils/ephem_chrono",
         help="Dir where chrono_ephem json files will be saved. Default=./embers_out/sat_utils/ephem_chrono",
     )
+    _parser.add_argument(
+        "--chrono_format",
+        metavar="\b",
+        default="json",
+        choices=["json", "npz"],
+        help="Format of chronological ephemeris files, json or npz. The npz format is several times smaller and faster to read. Default=json",
+    )
+    _parser.add_argument(
+        "--max_cores",
+        metavar="\b",
+        type=int,
+        help="Maximum number of cores to be used by this script. By default all core available cores are used",
+    )
 
     _args = _parser.parse_args()
     _time_zone = _args.time_zone
@@ -85,6 +98,8 @@ def main():
     _interp_freq = _args.interp_freq
     _ephem_dir = _args.ephem_dir
     _out_dir = _args.out_dir
+    _max_cores = _args.max_cores
+    _chrono_format = _args.chrono_format
 
     print(f"Saving chronological Ephem files to: {_out_dir}")
 
@@ -100,4 +115,6 @@ def main():
         _interp_freq,
         _ephem_dir,
         _out_dir,
+        max_cores=_max_cores,
+        chrono_format=_chrono_format,
     )
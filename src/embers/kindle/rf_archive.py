@@ -0,0 +1,81 @@
+"""
+RF Archive
+----------
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from embers.rf_tools.rf_archive import archive_batch
+
+
+def main():
+    """
+    Pack a day of rf data files from each tile into a single archive using the :func:`~embers.rf_tools.rf_archive.archive_batch` function.
+
+    .. code-block:: console
+
+        $ rf_archive --help
+
+    """
+    _parser = argparse.ArgumentParser(
+        description="""
+        Pack rf data files within a date interval into an archive per tile per day
+        """
+    )
+
+    _parser.add_argument(
+        "--start_date",
+        metavar="\b",
+        default="2019-10-10",
+        help="start date in YYYY-MM-DD format, default=2019-10-10",
+    )
+
+    _parser.add_argument(
+        "--stop_date",
+        metavar="\b",
+        default="2019-10-10",
+        help="stop date in YYYY-MM-DD format, default=2019-10-10",
+    )
+
+    _parser.add_argument(
+        "--data_dir",
+        metavar="\b",
+        default="./tiles_data",
+        help="root of dir where rf data is saved, default=tiles_data",
+    )
+
+    _parser.add_argument(
+        "--out_dir",
+        metavar="\b",
+        default="./embers_out/rf_tools/rf_archive",
+        help="Dir where archives are saved. Default=./embers_out/rf_tools/rf_archive",
+    )
+
+    _parser.add_argument(
+        "--max_cores",
+        metavar="\b",
+        type=int,
+        help="Maximum number of cores to be used by this script. By default all core available cores are used",
+    )
+
+    _args = _parser.parse_args()
+    _start_date = _args.start_date
+    _stop_date = _args.stop_date
+    _data_dir = _args.data_dir
+    _out_dir = _args.out_dir
+    _max_cores = _args.max_cores
+
+    # Logging config
+    _log_dir = Path(_out_dir)
+    _log_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        filename=f"{_out_dir}/rf_archive.log",
+        level=logging.INFO,
+        format="%(levelname)s: %(funcName)s: %(message)s",
+    )
+
+    print(f"Processing rf data files between {_start_date} and {_stop_date}")
+    print(f"Saving archives to: {_out_dir}")
+    archive_batch(_start_date, _stop_date, _data_dir, _out_dir, max_cores=_max_cores)
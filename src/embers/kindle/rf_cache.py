@@ -0,0 +1,98 @@
+"""
+RF Cache
+--------
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+from embers.rf_tools.rf_data import rf_cache_batch
+
+
+def main():
+    """
+    Warm or prune the cache of decoded rf data files within a date interval using the :func:`~embers.rf_tools.rf_data.rf_cache_batch` function.
+
+    Set the :samp:`EMBERS_RF_CACHE` environment variable to :samp:`cache_dir` for
+    :func:`~embers.rf_tools.rf_data.read_data` to use the cached arrays.
+
+    .. code-block:: console
+
+        $ rf_cache --help
+
+    """
+    _parser = argparse.ArgumentParser(
+        description="""
+        Cache decoded rf data files within a date interval
+        """
+    )
+
+    _parser.add_argument(
+        "--start_date",
+        metavar="\b",
+        default="2019-10-10",
+        help="start date in YYYY-MM-DD format, default=2019-10-10",
+    )
+
+    _parser.add_argument(
+        "--stop_date",
+        metavar="\b",
+        default="2019-10-10",
+        help="stop date in YYYY-MM-DD format, default=2019-10-10",
+    )
+
+    _parser.add_argument(
+        "--data_dir",
+        metavar="\b",
+        default="./tiles_data",
+        help="root of dir where rf data is saved, default=tiles_data",
+    )
+
+    _parser.add_argument(
+        "--cache_dir",
+        metavar="\b",
+        default="./embers_out/rf_tools/rf_cache",
+        help="Dir where decoded rf data is cached. Default=./embers_out/rf_tools/rf_cache",
+    )
+
+    _parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Remove stale cached files instead of warming the cache",
+    )
+
+    _parser.add_argument(
+        "--max_cores",
+        metavar="\b",
+        type=int,
+        help="Maximum number of cores to be used by this script. By default all core available cores are used",
+    )
+
+    _args = _parser.parse_args()
+    _start_date = _args.start_date
+    _stop_date = _args.stop_date
+    _data_dir = _args.data_dir
+    _cache_dir = _args.cache_dir
+    _prune = _args.prune
+    _max_cores = _args.max_cores
+
+    # Logging config
+    _log_dir = Path(_cache_dir)
+    _log_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        filename=f"{_cache_dir}/rf_cache.log",
+        level=logging.INFO,
+        format="%(levelname)s: %(funcName)s: %(message)s",
+    )
+
+    print(f"Processing rf data files between {_start_date} and {_stop_date}")
+    print(f"Caching decoded rf data to: {_cache_dir}")
+    rf_cache_batch(
+        _start_date,
+        _stop_date,
+        _data_dir,
+        _cache_dir,
+        prune=_prune,
+        max_cores=_max_cores,
+    )
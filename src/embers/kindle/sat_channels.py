@@ -101,6 +101,12 @@ def main():
         help="Maximum number of cores to be used by this script. By default all core available cores are used",
     )
 
+    _parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip outputs which are up to date in the manifest of out_dir, recomputing only missing or stale outputs",
+    )
+
     _args = _parser.parse_args()
     _start_date = _args.start_date
     _stop_date = _args.stop_date
@@ -113,6 +119,7 @@ def main():
     _out_dir = _args.out_dir
     _plots = _args.plots
     _max_cores = _args.max_cores
+    _resume = _args.resume
 
     if _plots == "True":
         _plots = True
@@ -134,4 +141,5 @@ def main():
         _out_dir,
         plots=_plots,
         max_cores=_max_cores,
+        resume=_resume,
     )
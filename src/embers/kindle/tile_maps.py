@@ -147,6 +147,21 @@ def main():
         help="Maximum number of cores to be used by this script. By default all core available cores are used",
     )
 
+    _parser.add_argument(
+        "--map_format",
+        metavar="\b",
+        default="npz",
+        choices=["npz", "tmap"],
+        help="Format of tile maps, npz or memory mapped tmap. Default: npz",
+    )
+
+    _parser.add_argument(
+        "--chunk_days",
+        metavar="\b",
+        type=int,
+        help="Number of days projected by each worker. By default each tile pair is split into about two chunks per core",
+    )
+
     _args = _parser.parse_args()
     _start_date = _args.start_date
     _stop_date = _args.stop_date
@@ -165,6 +180,8 @@ def main():
     _plots = _args.plots
     _rfe_cali_bool = _args.rfe_cali_bool
     _max_cores = _args.max_cores
+    _map_format = _args.map_format
+    _chunk_days = _args.chunk_days
 
     if _plots == "False":
         _plots is False
@@ -194,6 +211,8 @@ def main():
         _plots,
         _rfe_cali_bool,
         max_cores=_max_cores,
+        map_format=_map_format,
+        chunk_days=_chunk_days,
     )
 
     print(f"MWA tile map files saved to: {_out_dir}")
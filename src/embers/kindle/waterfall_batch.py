@@ -53,11 +53,26 @@ def main():
         help="Dir where colormap sample plot is saved. Default=./embers_out/rf_tools",
     )
 
+    _parser.add_argument(
+        "--max_cores",
+        metavar="\b",
+        type=int,
+        help="Maximum number of cores to be used by this script. By default all core available cores are used",
+    )
+
+    _parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip outputs which are up to date in the manifest of out_dir, recomputing only missing or stale outputs",
+    )
+
     _args = _parser.parse_args()
     _start_date = _args.start_date
     _stop_date = _args.stop_date
     _data_dir = _args.data_dir
     _out_dir = _args.out_dir
+    _max_cores = _args.max_cores
+    _resume = _args.resume
 
     # Logging config
     _log_dir = Path(f"{_out_dir}/waterfalls")
@@ -70,4 +85,11 @@ def main():
 
     print(f"Processing rf data files between {_start_date} and {_stop_date}")
     print(f"Saving waterfall plots to: ./{_log_dir}")
-    waterfall_batch(_start_date, _stop_date, _data_dir, _out_dir)
+    waterfall_batch(
+        _start_date,
+        _stop_date,
+        _data_dir,
+        _out_dir,
+        max_cores=_max_cores,
+        resume=_resume,
+    )
@@ -7,7 +7,7 @@ Waterfall Single
 import argparse
 from pathlib import Path
 
-from embers.rf_tools.rf_data import single_waterfall
+from embers.rf_tools.rf_data import live_waterfall, single_waterfall
 
 
 def main():
@@ -37,10 +37,19 @@ def main():
         default="embers_out/rf_tools",
         help="Dir where colormap sample plot is saved. Default=./embers_out/rf_tools",
     )
+    _parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Update the waterfall plot while the rf data file is being written",
+    )
 
     _args = _parser.parse_args()
     _rf_file = _args.rf_file
     _out_dir = _args.out_dir
+    _live = _args.live
 
     print(f"Waterfall plot saved to ./{_out_dir}/{Path(_rf_file).stem}.png")
-    single_waterfall(_rf_file, _out_dir)
+    if _live:
+        live_waterfall(_rf_file, _out_dir)
+    else:
+        single_waterfall(_rf_file, _out_dir)
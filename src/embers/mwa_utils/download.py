@@ -0,0 +1,224 @@
+"""
+Download
+--------
+
+A client to download files from web servers, such as the MWA metadata service,
+with a small pool of concurrent workers sharing a token bucket rate limiter.
+Failed requests are retried with exponential backoff, files already present are
+skipped using their ETag or size and partial downloads are resumed
+
+"""
+
+import concurrent.futures
+import shutil
+import threading
+import time
+from itertools import repeat
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+# HTTP status codes of requests which are retried
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def rate_limiter(rate, burst=1):
+    """Create a token bucket rate limiter, which can be shared by threads.
+
+    Tokens are added to a bucket of size :samp:`burst` at :samp:`rate` tokens per second, and each request
+    takes a token, waiting until one is available. Unlike a fixed sleep before each request, no time is lost
+    while the bucket is full, and the time taken by each download counts towards the wait of the next one.
+
+    .. code-block:: python
+
+        from embers.mwa_utils.download import rate_limiter
+
+        # At most one request every 29 seconds
+        acquire = rate_limiter(1 / 29)
+        acquire()
+
+    :param rate: Number of requests per second. If None or 0, requests are not limited :class:`~float`
+    :param burst: Maximum number of requests which can be made at once. Default=1 :class:`~int`
+
+    :returns:
+        - acquire - function which blocks until a request can be made
+
+    """
+
+    if not rate:
+        return lambda: None
+
+    lock = threading.Lock()
+    bucket = {"tokens": float(burst), "time": time.monotonic()}
+
+    def acquire():
+        with lock:
+            now = time.monotonic()
+            tokens = min(burst, bucket["tokens"] + (now - bucket["time"]) * rate)
+            bucket["time"] = now
+
+            # Reserve a token, which may not yet be in the bucket
+            bucket["tokens"] = tokens - 1
+            delay = max(0, -bucket["tokens"] / rate)
+
+        time.sleep(delay)
+
+    return acquire
+
+
+def _open(url, headers, acquire, timeout, method="GET"):
+    """Open a url, returning responses of unmodified or already complete files instead of raising."""
+
+    acquire()
+    try:
+        return urlopen(Request(url, headers=headers, method=method), timeout=timeout)
+    except HTTPError as e:
+        if e.code in (304, 416):
+            return e
+        raise
+
+
+def _fetch(url, path, acquire, timeout):
+    """Download a url to path once, skipping or resuming from files on disk."""
+
+    part = Path(f"{path}.part")
+    etag_file = Path(f"{path}.etag")
+
+    headers = {}
+    if path.is_file():
+        if etag_file.is_file():
+            headers["If-None-Match"] = etag_file.read_text()
+        else:
+            try:
+                with _open(url, {}, acquire, timeout, method="HEAD") as head:
+                    size = head.headers.get("Content-Length")
+            except HTTPError as e:
+                # Servers which do not support HEAD requests
+                if e.code in RETRY_STATUS:
+                    raise
+                size = None
+            if size is not None and int(size) == path.stat().st_size:
+                return "skipped"
+    elif part.is_file():
+        headers["Range"] = f"bytes={part.stat().st_size}-"
+
+    with _open(url, headers, acquire, timeout) as response:
+
+        # File has not changed since it was downloaded
+        if response.code == 304:
+            return "skipped"
+
+        # Partial download is already complete
+        if response.code == 416:
+            part.replace(path)
+            return "downloaded"
+
+        # Servers which ignore the range send the whole file
+        resumed = response.code == 206
+        with open(part, "ab" if resumed else "wb") as f:
+            shutil.copyfileobj(response, f)
+        etag = response.headers.get("ETag")
+
+    part.replace(path)
+    if etag is not None:
+        etag_file.write_text(etag)
+    elif etag_file.is_file():
+        etag_file.unlink()
+
+    return "resumed" if resumed else "downloaded"
+
+
+def download_file(url, path, acquire=None, retries=4, backoff=2, timeout=60):
+    """Download a file, retrying failed requests with exponential backoff.
+
+    Data is written to :samp:`{path}.part`, which is renamed to :samp:`path` once complete, and an interrupted
+    download is resumed from the end of the partial file with a HTTP range request. The ETag of each downloaded
+    file is saved to :samp:`{path}.etag`, and an existing file is only downloaded again if the server reports that
+    its ETag has changed, or if it has no ETag and the size reported by the server differs from that on disk.
+
+    Requests which fail with a connection error, or with HTTP status 429 or 5xx, are retried after
+    :samp:`backoff * 2 ** attempt` seconds, or the :samp:`Retry-After` time requested by the server, if longer.
+
+    .. code-block:: python
+
+        from embers.mwa_utils.download import download_file
+
+        download_file(
+            "http://ws.mwatelescope.org/metadata/fits?obs_id=1253960760",
+            "./embers_out/mwa_utils/mwa_metafits/1253960760.metafits")
+
+    :param url: URL of file to download :class:`~str`
+    :param path: Path where file will be saved :class:`~str`
+    :param acquire: Rate limiter from :func:`~embers.mwa_utils.download.rate_limiter`, called before each request. Default=None
+    :param retries: Number of times a failed request is retried. Default=4 :class:`~int`
+    :param backoff: Wait before the first retry in seconds, doubled after each retry. Default=2 :class:`~float`
+    :param timeout: Timeout of each request in seconds. Default=60 :class:`~float`
+
+    :returns:
+        - status - :samp:`downloaded`, :samp:`resumed` or :samp:`skipped` :class:`~str`
+
+    """
+
+    if acquire is None:
+        acquire = rate_limiter(None)
+
+    for attempt in range(retries + 1):
+        delay = backoff * 2 ** attempt
+        try:
+            return _fetch(url, Path(path), acquire, timeout)
+        except HTTPError as e:
+            if e.code not in RETRY_STATUS or attempt == retries:
+                raise
+            retry_after = e.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+        except OSError:
+            # Connection errors, timeouts and interrupted transfers
+            if attempt == retries:
+                raise
+
+        time.sleep(delay)
+
+
+def download_batch(urls, paths, rate=None, workers=4, retries=4, backoff=2, timeout=60):
+    """Download files concurrently, at no more than :samp:`rate` requests per second.
+
+    .. code-block:: python
+
+        from embers.mwa_utils.download import download_batch
+
+        obs_ids = [1253960760, 1253966160]
+        status = download_batch(
+            [f"http://ws.mwatelescope.org/metadata/fits?obs_id={i}" for i in obs_ids],
+            [f"./embers_out/mwa_utils/mwa_metafits/{i}.metafits" for i in obs_ids],
+            rate=1 / 29)
+
+    :param urls: URLs of files to download :class:`~list`
+    :param paths: Paths where files will be saved :class:`~list`
+    :param rate: Number of requests per second, shared by all workers. Default=None, which does not limit requests :class:`~float`
+    :param workers: Number of concurrent downloads. Default=4 :class:`~int`
+    :param retries: Number of times a failed request is retried. Default=4 :class:`~int`
+    :param backoff: Wait before the first retry in seconds, doubled after each retry. Default=2 :class:`~float`
+    :param timeout: Timeout of each request in seconds. Default=60 :class:`~float`
+
+    :returns:
+        - status - status of each file, from :func:`~embers.mwa_utils.download.download_file` :class:`~list`
+
+    """
+
+    acquire = rate_limiter(rate)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        status = list(
+            executor.map(
+                download_file,
+                urls,
+                paths,
+                repeat(acquire),
+                repeat(retries),
+                repeat(backoff),
+                repeat(timeout),
+            )
+        )
+
+    return status
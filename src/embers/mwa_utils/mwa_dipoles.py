@@ -6,30 +6,38 @@ Tools to download MWA metafits files and finding dead dipoles
 """
 
 import json
-import time
 from pathlib import Path
 
 import matplotlib as mpl
 import numpy as np
-import wget
 from astropy.io import fits
+from embers.mwa_utils.download import download_batch
 from matplotlib import pylab as pl
 from matplotlib import pyplot as plt
 
 mpl.use("Agg")
 
 
-def download_metafits(num_files, wait, out_dir):
+def download_metafits(
+    num_files,
+    wait,
+    out_dir,
+    url="http://ws.mwatelescope.org/metadata/fits",
+    workers=4,
+):
     """
     Download metafits files from `mwatelescope.org <http://mwatelescope.org/>`_
 
     This function requires a list of obsids which it reads from :samp:`out_dir`.
     Before running functions in this module, run :mod:`~embers.mwa_utils.mwa_pointings` to
-    created the required obsid files.
+    created the required obsid files. Files are downloaded by :func:`~embers.mwa_utils.download.download_batch`,
+    with :samp:`workers` concurrent downloads sharing a rate limit of one request every :samp:`wait` seconds.
 
     :param num_files: The number of metafits files to download. Usually, 20 is sufficent :class:`~int`
-    :param wait: Time to sleep between downloads so as not to overload servers. Default=29
+    :param wait: Minimum time between requests so as not to overload servers. Default=29
     :param out_dir: Path to output directory where the metafits files will be saved :class:`~str`
+    :param url: URL of MWA metafits service. Default=http://ws.mwatelescope.org/metadata/fits :class:`~str`
+    :param workers: Number of concurrent downloads. Default=4 :class:`~int`
 
     :returns:
         Metafits files are saved to the :samp:`out_dir`
@@ -38,32 +46,30 @@ def download_metafits(num_files, wait, out_dir):
 
     print("Downloading MWA metafits files")
     print("Due to download limits, this will take a while")
-    t = wait * num_files
+    t = wait * (num_files - 1)
     m, _ = divmod(t, 60)
     h, m = divmod(m, 60)
     print(f"ETA: Approximately {h:d}H:{m:02d}M")
     metafits_dir = Path(f"{out_dir}/mwa_metafits")
     metafits_dir.mkdir(parents=True, exist_ok=True)
 
-    cerberus_url = "http://ws.mwatelescope.org/metadata/fits?obs_id="
     with open(f"{out_dir}/mwa_pointings.json") as gps:
 
         # list of all gpstimes [obsids]
         gps_times = np.array(json.load(gps)["start_gps"])
 
-        # select 20 equally spaced ids
-        idx = np.round(np.linspace(0, len(gps_times) - 1, num_files)).astype(int)
-        obs_ids = gps_times[idx]
+    # select 20 equally spaced ids
+    idx = np.round(np.linspace(0, len(gps_times) - 1, num_files)).astype(int)
+    obs_ids = gps_times[idx]
 
-        for obs_id in obs_ids:
+    download_batch(
+        [f"{url}?obs_id={obs_id}" for obs_id in obs_ids],
+        [f"{metafits_dir}/{obs_id}.metafits" for obs_id in obs_ids],
+        rate=1 / wait if wait else None,
+        workers=workers,
+    )
 
-            time.sleep(wait)
-            print(f"\nDownloading {obs_id} metafits")
-            wget.download(
-                f"{cerberus_url}{obs_id}", f"{metafits_dir}/{obs_id}.metafits"
-            )
-
-        print("\nMetafits download complete")
+    print("\nMetafits download complete")
 
 
 def find_flags(out_dir):
@@ -187,7 +193,7 @@ def mwa_flagged_dipoles(num_files, out_dir, wait=29):
 
     :param num_files: The number of metafits files to download. Usually, 20 is sufficent :class:`~int`
     :param out_dir: Path to output directory where the metafits files will be saved :class:`~str`
-    :param wait: Time to sleep between downloads so as not to overload servers. Default=29
+    :param wait: Minimum time between requests so as not to overload servers. Default=29
 
     :returns:
         Metafits files and dipole flagging plot saved to :samp:`out_dir`
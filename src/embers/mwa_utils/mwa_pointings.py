@@ -5,7 +5,6 @@ Tools to download metadata of the MWA telescope and extract its observational sc
 
 """
 import json
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -13,22 +12,36 @@ import matplotlib as mpl
 import numpy as np
 import pytz
 import seaborn as sns
-import wget
 from astropy.time import Time
+from embers.mwa_utils.download import download_batch
 from embers.rf_tools.rf_data import tile_names, time_tree
 from matplotlib import pyplot as plt
 
 mpl.use("Agg")
 
 
-def download_meta(start, stop, num_pages, out_dir, wait):
+def download_meta(
+    start,
+    stop,
+    num_pages,
+    out_dir,
+    wait,
+    url="http://ws.mwatelescope.org/metadata/find",
+    workers=4,
+):
     """Download MWA metadata from `mwatelescope.org <http://mwatelescope.org/>`_
 
+    Pages are downloaded by :func:`~embers.mwa_utils.download.download_batch`, with :samp:`workers` concurrent
+    downloads sharing a rate limit of one request every :samp:`wait` seconds. Pages already downloaded are skipped
+    and partial downloads are resumed, so an interrupted download can simply be run again.
+
     :param start: start date in :samp:`isot` format :samp:`YYYY-MM-DDTHH:MM:SS` :class:`~str`
     :param stop: stop date in :samp:`isot` format :samp:`YYYY-MM-DDTHH:MM:SS` :class:`~str`
     :param num_pages: Each page contains 200 observation. Visit `ws.mwatelescope.org/metadata/find <http://ws.mwatelescope.org/metadata/find>`_ to find the total number of pages :class:`~int`
     :param out_dir: Path to output directory where metadata will be saved :class:`~str`
-    :param wait: Time to sleep between downloads so as not to overload servers. Default=29
+    :param wait: Minimum time between requests so as not to overload servers. Default=29
+    :param url: URL of MWA metadata search. Default=http://ws.mwatelescope.org/metadata/find :class:`~str`
+    :param workers: Number of concurrent downloads. Default=4 :class:`~int`
 
     :returns:
         MWA metadata json files saved to :samp:`out_dir`
@@ -37,7 +50,7 @@ def download_meta(start, stop, num_pages, out_dir, wait):
 
     print("Downloading MWA metadata")
     print("Due to download limits, this will take a while")
-    t = wait * num_pages
+    t = wait * (num_pages - 1)
     m, _ = divmod(t, 60)
     h, m = divmod(m, 60)
     print(f"ETA: Approximately {h:d}H:{m:02d}M")
@@ -48,11 +61,19 @@ def download_meta(start, stop, num_pages, out_dir, wait):
 
     mwa_meta_dir = Path(f"{out_dir}/mwa_pointings")
     mwa_meta_dir.mkdir(parents=True, exist_ok=True)
-    for npg in range(num_pages):
-        time.sleep(wait)
-        cerberus_url = f"http://ws.mwatelescope.org/metadata/find?mintime={start_gps}&maxtime={stop_gps}&extended=1&page={npg+1}&pretty=1"
-        print(f"\nDownloading page {npg+1}/{num_pages} of metadata")
-        wget.download(cerberus_url, f"{mwa_meta_dir}/page_{npg+1:03d}.json")
+
+    cerberus_urls = [
+        f"{url}?mintime={start_gps}&maxtime={stop_gps}&extended=1&page={npg+1}&pretty=1"
+        for npg in range(num_pages)
+    ]
+    pages = [f"{mwa_meta_dir}/page_{npg+1:03d}.json" for npg in range(num_pages)]
+
+    status = download_batch(
+        cerberus_urls, pages, rate=1 / wait if wait else None, workers=workers
+    )
+    print(
+        f"Downloaded {num_pages - status.count('skipped')}/{num_pages} pages of metadata"
+    )
 
 
 def clean_meta_json(out_dir):
@@ -335,97 +356,122 @@ def rf_obs_times(start_date, stop_date, time_zone):
     return (obs_time, obs_gps, obs_gps_end)
 
 
-def obs_pointings(start, stop, time_zone, out_dir):
+def pointing_occupancy(
+    obs_gps, obs_gps_end, start_gps, stop_gps, grid_pt, pointings=[0, 2, 4, 41]
+):
+    """Fraction of each rf observation occupied by MWA observations at each pointing.
+
+    The rf observations are sorted in time, so the range of rf observations overlapped by each MWA observation is found
+    with :func:`~numpy.searchsorted`, and the overlap of every pair of observations is computed at once. The occupancy of a
+    rf observation at a pointing is the largest fraction of the 30 minutes covered by a single MWA observation at that pointing.
+
+    .. code-block:: python
+
+        from embers.mwa_utils.mwa_pointings import pointing_occupancy, rf_obs_times
+
+        obs_time, obs_gps, obs_gps_end = rf_obs_times("2019-10-01", "2019-10-01", "Australia/Perth")
+        occupancy = pointing_occupancy(obs_gps, obs_gps_end, [1253894418], [1253895318], [2])
+
+    :param obs_gps: start times of 30 min rf obs in :samp:`gps` format, from :func:`~embers.mwa_utils.mwa_pointings.rf_obs_times` :class:`~numpy.ndarray`
+    :param obs_gps_end: end times of 30 min rf obs in :samp:`gps` format :class:`~numpy.ndarray`
+    :param start_gps: :class:`~list` of MWA observation start times in :samp:`gps` format
+    :param stop_gps: :class:`~list` of MWA observation stop times in :samp:`gps` format
+    :param grid_pt: :class:`~list` of MWA observation :samp:`pointings`
+    :param pointings: :class:`~list` of pointings at which occupancy is computed. Default=[0, 2, 4, 41]
+
+    :returns:
+        - occupancy - fraction of each rf obs at each pointing, of shape (len(obs_gps), len(pointings)) :class:`~numpy.ndarray`
+
+    """
+
+    obs_gps = np.asarray(obs_gps, dtype=float)
+    obs_gps_end = np.asarray(obs_gps_end, dtype=float)
+    start_gps = np.asarray(start_gps, dtype=float)
+    stop_gps = np.asarray(stop_gps, dtype=float)
+
+    occupancy = np.zeros((obs_gps.size, len(pointings)))
+
+    # Column of each MWA observation, dropping other pointings
+    column = np.full(len(grid_pt), -1)
+    for p, point in enumerate(pointings):
+        column[np.asarray([g == point for g in grid_pt], dtype=bool)] = p
+    point_obs = np.where(column >= 0)[0]
+
+    # First and last + 1 rf obs which overlap each MWA obs
+    first = np.searchsorted(obs_gps_end, start_gps[point_obs], side="right")
+    last = np.searchsorted(obs_gps, stop_gps[point_obs], side="left")
+    n_overlap = np.maximum(last - first, 0)
+
+    # Every overlapping pair of MWA obs and rf obs
+    meta = np.repeat(point_obs, n_overlap)
+    offsets = np.cumsum(n_overlap) - n_overlap
+    rf = np.repeat(first, n_overlap) + (
+        np.arange(meta.size) - np.repeat(offsets, n_overlap)
+    )
+
+    overlap = (
+        np.minimum(stop_gps[meta], obs_gps_end[rf])
+        - np.maximum(start_gps[meta], obs_gps[rf])
+    ) / 1800
+
+    np.maximum.at(occupancy, (rf, column[meta]), overlap)
+
+    return occupancy
+
+
+def obs_pointings(start, stop, time_zone, out_dir, save_occupancy=False):
     """
     Classify the pointing of each :samp:`rf_obs`
 
-    Loop over all rf observations within a date interval and determine whether
-    the 30 minute period had more that a 60% majority at a single pointing. If
-    it does, the rf observation is saved to an appropriate list. Save the pointing
-    data to :samp:`obs_pointings.json` in the :samp:`out_dir`.
+    Determine whether each 30 minute rf observation within a date interval had
+    more that a 60% majority at a single pointing, with the occupancy from
+    :func:`~embers.mwa_utils.mwa_pointings.pointing_occupancy`. If it does, the
+    rf observation is saved to an appropriate list. Save the pointing data to
+    :samp:`obs_pointings.json` in the :samp:`out_dir`.
 
     :param start: in :samp:`YYYY-MM-DD` format :class:`~str`
     :param stop: in :samp:`YYYY-MM-DD` format :class:`~str`
     :param time_zone: A :class:`~str` representing a :samp:`pytz` `timezones <https://gist.github.com/heyalexej/8bf688fd67d7199be4a1682b3eec7568>`_.
     :param out_dir: Path to directory where :samp:`mwa_pointings.json` is saved
+    :param save_occupancy: If True, also save the occupancy of every rf observation at every pointing to :samp:`obs_occupancy.npz`. Default=False
 
     :returns:
         :samp:`obs_pointings.json` saved to :samp:`out_dir`
 
     """
 
-    point_0 = []
-    point_2 = []
-    point_4 = []
-    point_41 = []
+    pointings = [0, 2, 4, 41]
 
     obs_time, obs_gps, obs_gps_end = rf_obs_times(start, stop, time_zone)
 
     with open(f"{out_dir}/mwa_pointings.json") as table:
         data = json.load(table)
-        pointings = data["grid_pt"]
+        grid_pt = data["grid_pt"]
         start_gps = data["start_gps"]
         stop_gps = data["stop_gps"]
 
-    # loop over each 30 min rf_obs
-    for i in range(len(obs_time)):
-
-        # loop over mwa pointing observations from
-        # ultimate_pointing_times.json
-        for j in range(len(start_gps)):
-
-            # start and stop gps times of MWA pointing observations
-            meta_start = start_gps[j]
-            meta_stop = stop_gps[j]
-
-            # I. MWA obs starts before rf_obs, stops within rf_obs
-            if (
-                meta_start < obs_gps[i]
-                and meta_stop > obs_gps[i]
-                and meta_stop <= obs_gps_end[i]
-            ):
-                occu = (meta_stop - obs_gps[i]) / 1800
-
-            # II. MWA obs completely within rf_obs
-            elif meta_start >= obs_gps[i] and meta_stop <= obs_gps_end[i]:
-                occu = (meta_stop - meta_start) / 1800
-
-            # III. MWA obs starts within rf obs and ends after
-            elif (
-                meta_start >= obs_gps[i]
-                and meta_start < obs_gps_end[i]
-                and meta_stop > obs_gps_end[i]
-            ):
-                occu = (obs_gps_end[i] - meta_start) / 1800
-
-            # IV. MWA obs starts before and ends after rf obs
-            elif meta_start < obs_gps[i] and meta_stop > obs_gps_end[i]:
-                occu = (obs_gps_end[i] - obs_gps[i]) / 1800
-
-            # V. No common time between MWA obs and rf obs
-            else:
-                occu = 0
-
-            if occu != 0 and occu >= 0.6:
-                if pointings[j] == 0:
-                    point_0.append(obs_time[i])
-                elif pointings[j] == 2:
-                    point_2.append(obs_time[i])
-                elif pointings[j] == 4:
-                    point_4.append(obs_time[i])
-                elif pointings[j] == 41:
-                    point_41.append(obs_time[i])
-                # should there be an else statement here?
+    occupancy = pointing_occupancy(
+        obs_gps, obs_gps_end, start_gps, stop_gps, grid_pt, pointings
+    )
+
+    if save_occupancy:
+        np.savez_compressed(
+            f"{out_dir}/obs_occupancy.npz",
+            obs_time=np.asarray(obs_time),
+            pointings=np.asarray(pointings),
+            occupancy=occupancy,
+        )
 
     # Create dictionary to be saved to json
     obs_pointings = {}
 
     obs_pointings["start_date"] = start
     obs_pointings["stop_date"] = stop
-    obs_pointings["point_0"] = point_0
-    obs_pointings["point_2"] = point_2
-    obs_pointings["point_4"] = point_4
-    obs_pointings["point_41"] = point_41
+
+    for p, point in enumerate(pointings):
+        obs_pointings[f"point_{point}"] = [
+            obs_time[i] for i in np.where(occupancy[:, p] >= 0.6)[0]
+        ]
 
     with open(f"{out_dir}/obs_pointings.json", "w") as outfile:
         json.dump(obs_pointings, outfile, indent=4)
@@ -604,7 +650,7 @@ def mwa_point_meta(
     :param time_zone: A :class:`~str` representing :samp:`pytz` `timezones <https://gist.github.com/heyalexej/8bf688fd67d7199be4a1682b3eec7568>`_.
     :param rf_dir: Path to root of directory with rf data files :class:`~str`
     :param out_dir: Path to output directory where metadata will be saved :class:`~str`
-    :param wait: Time to sleep between downloads so as not to overload servers. Default=29
+    :param wait: Minimum time between requests so as not to overload servers. Default=29
 
     :returns:
         Data products saved to :samp:`out_dir`
@@ -1,6 +1,6 @@
 """
 :mod:`embers.rf_tools` is used to pre process, condition and preview raw rf data.
 
-It contains :mod:`~embers.rf_tools.rf_data`, :mod:`~embers.rf_tools.align_data`, :mod:`~embers.rf_tools.colormaps` modules.
+It contains :mod:`~embers.rf_tools.rf_data`, :mod:`~embers.rf_tools.rf_archive`, :mod:`~embers.rf_tools.manifest`, :mod:`~embers.rf_tools.align_data`, :mod:`~embers.rf_tools.colormaps` modules.
 
 """
@@ -6,19 +6,185 @@ enabling comparisons between data sets
 
 """
 
-import concurrent.futures
 import logging
 import math
 import re
-from itertools import repeat
 from pathlib import Path
 
 import numpy as np
-from embers.rf_tools.rf_data import (read_data, tile_names, tile_pairs,
-                                     time_tree)
+from embers.rf_tools.manifest import read_manifest, record_outputs, up_to_date
+from embers.rf_tools.rf_data import (read_data, run_batch, tile_names,
+                                     tile_pairs, time_tree)
 from matplotlib import pyplot as plt
 from scipy import interpolate
-from scipy.signal import savgol_filter
+from scipy.linalg import LinAlgError, lapack
+from scipy.ndimage import convolve1d
+from scipy.signal import savgol_coeffs, savgol_filter
+
+
+def interp_weights(times, time_array, interp_type):
+    """Precompute the interpolation of arrays sampled at :samp:`times` onto :samp:`time_array`.
+
+    Linear interpolation is a pair of weights for each point of :samp:`time_array`,
+    applied to the power at either end of its interval. Cubic spline interpolation,
+    identical to :class:`~scipy.interpolate.interp1d` with :samp:`kind='cubic'`, is
+    evaluated in Hermite form from two pairs of weights, applied to the power and
+    to its derivatives. The derivatives are solutions of a tridiagonal system
+    which only depends on :samp:`times`. Other types of interpolation fall
+    back to :class:`~scipy.interpolate.interp1d`.
+
+    The returned function can be applied to any power array sampled at :samp:`times`,
+    reusing the weights.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import read_data
+        from embers.rf_tools.align_data import interp_weights
+
+        power, times = read_data('~/embers-data/rf0XX.txt')
+        time_array = np.arange(np.ceil(times[0]), np.floor(times[-1]))
+        interp = interp_weights(times, time_array, "cubic")
+        power_interp = interp(power)
+
+    :param times: times at which power arrays are sampled :class:`~numpy.ndarray`
+    :param time_array: times at which to evaluate the interpolated power :class:`~numpy.ndarray`
+    :param interp_type: type of interpolation. Ex: 'cubic', 'linear' :class:`~str`
+
+    :returns:
+        - interp - function which interpolates a power array along its first axis
+
+    :raises ValueError: :samp:`time_array` is outside the range of :samp:`times`
+
+    """
+
+    times = np.asarray(times, dtype=np.double)
+    n = times.size
+
+    if interp_type not in ["linear", "slinear", "cubic"] or n < 4:
+
+        def interp(power):
+            f = interpolate.interp1d(times, power, axis=0, kind=interp_type)
+            return f(time_array)
+
+        return interp
+
+    if time_array[0] < times[0] or time_array[-1] > times[-1]:
+        raise ValueError("time_array is outside the interpolation range.")
+
+    # Interval of times in which each point of time_array lies
+    index = np.clip(np.searchsorted(times, time_array, side="right") - 1, 0, n - 2)
+    dx = np.diff(times)
+    h = dx[index]
+    t = (time_array - times[index]) / h
+
+    # Weights of the power at either end of each interval
+    w_start = (1 - t)[:, None]
+    w_stop = t[:, None]
+
+    if interp_type != "cubic":
+
+        def interp(power):
+            return w_start * power[index] + w_stop * power[index + 1]
+
+        return interp
+
+    # Hermite basis functions, weighting power and derivatives at interval ends
+    w_start = ((1 + 2 * t) * (1 - t) ** 2)[:, None]
+    w_stop = (t ** 2 * (3 - 2 * t))[:, None]
+    d_start = (h * t * (1 - t) ** 2)[:, None]
+    d_stop = (h * t ** 2 * (t - 1))[:, None]
+
+    # Tridiagonal system for derivatives of a not-a-knot cubic spline,
+    # as in scipy.interpolate.CubicSpline
+    x_start = times[2] - times[0]
+    x_stop = times[-1] - times[-3]
+    lower = np.append(dx[1:], x_stop)
+    diag = np.concatenate([[dx[1]], 2 * (dx[:-1] + dx[1:]), [dx[-2]]])
+    upper = np.append(x_start, dx[:-1])
+    dxr = dx[:, None]
+
+    def interp(power):
+        slope = np.diff(power, axis=0) / dxr
+
+        # Fortran ordered right hand side, solved in place by LAPACK
+        rhs = np.empty(power.shape, order="F")
+        rhs[1:-1] = 3 * (dxr[1:] * slope[:-1] + dxr[:-1] * slope[1:])
+        rhs[0] = (
+            (dx[0] + 2 * x_start) * dx[1] * slope[0] + dx[0] ** 2 * slope[1]
+        ) / x_start
+        rhs[-1] = (
+            dx[-1] ** 2 * slope[-2] + (2 * x_stop + dx[-1]) * dx[-2] * slope[-1]
+        ) / x_stop
+
+        *_, derivs, info = lapack.dgtsv(lower, diag, upper, rhs, overwrite_b=True)
+        if info > 0:
+            raise LinAlgError("Singular matrix in cubic spline interpolation")
+
+        return (
+            w_start * power[index]
+            + w_stop * power[index + 1]
+            + d_start * derivs[index]
+            + d_stop * derivs[index + 1]
+        )
+
+    return interp
+
+
+def savgol_weights(length, savgol_window_1, savgol_window_2, polyorder):
+    """Precompute two successive levels of savgol smoothing as a single filter.
+
+    Both levels of savgol filter are linear, and are equivalent to a single convolution
+    with the combined kernel of both filters, applied in one pass. Near the edges of the
+    array, where :func:`~scipy.signal.savgol_filter` fits polynomials to the first and last
+    windows, the combined filter is computed exactly by smoothing an identity matrix.
+
+    .. code-block:: python
+
+        from embers.rf_tools.align_data import savgol_weights
+        smooth = savgol_weights(power.shape[0], 11, 15, 2)
+        power_smooth = smooth(power)
+
+    :param length: length of the arrays to be smoothed :class:`~int`
+    :param savgol_window_1:  window size of savgol filer, must be odd :class:`~int`
+    :param savgol_window_2:  window size of savgol filer, must be odd :class:`~int`
+    :param polyorder: polynomial order to fit to savgol_window :class:`~int`
+
+    :returns:
+        - smooth - function which smooths an array along its first axis. If the array is a slice of a longer array, which was already smoothed, the slice of the smoothed array can be passed as a second argument, and only its edges are recomputed
+
+    """
+
+    # Rows affected by edges of the array at each end, and the columns they depend on
+    n_edge = savgol_window_1 // 2 + savgol_window_2 // 2
+    n_cols = min(length, 2 * n_edge + 1)
+
+    edges = np.eye(n_cols)
+    edges = savgol_filter(edges, savgol_window_1, polyorder, axis=0)
+    edges = savgol_filter(edges, savgol_window_2, polyorder, axis=0)
+    start = edges[:n_edge]
+    stop = edges[n_cols - n_edge :]
+
+    kernel = np.convolve(
+        savgol_coeffs(savgol_window_1, polyorder),
+        savgol_coeffs(savgol_window_2, polyorder),
+    )
+
+    def smooth(array, array_smooth=None):
+        if array.shape[0] <= n_cols:
+            return np.tensordot(edges, array, axes=1)
+
+        length = array.shape[0]
+        if array_smooth is None:
+            array_smooth = convolve1d(array, kernel, axis=0, mode="constant")
+        else:
+            array_smooth = array_smooth.copy()
+        array_smooth[:n_edge] = np.tensordot(start, array[:n_cols], axes=1)
+        array_smooth[length - n_edge :] = np.tensordot(
+            stop, array[length - n_cols :], axes=1
+        )
+        return array_smooth
+
+    return smooth
 
 
 def savgol_interp(
@@ -29,6 +195,7 @@ def savgol_interp(
     polyorder=None,
     interp_type=None,
     interp_freq=None,
+    engine="scipy",
 ):
 
     """Interpolate a power array followed by savgol smoothing.
@@ -41,6 +208,13 @@ def savgol_interp(
     first to capture deep nulls + small structure,
     and second level to smooth over noise.
 
+    The default :samp:`scipy` engine interpolates with :class:`~scipy.interpolate.interp1d`
+    and applies :func:`~scipy.signal.savgol_filter` twice. The :samp:`fused` engine
+    precomputes the interpolation with :func:`~embers.rf_tools.align_data.interp_weights`,
+    shared by the reference and tile if their times match, and applies both levels
+    of savgol smoothing in a single pass with :func:`~embers.rf_tools.align_data.savgol_weights`.
+    Both engines agree to within floating point precision.
+
     .. code-block:: python
 
         from embers.rf_tools.align_data import savgol_interp
@@ -64,6 +238,7 @@ def savgol_interp(
     :param polyorder: polynomial order to fit to savgol_window :class:`~int`
     :param interp_type: type of interpolation. Ex: 'cubic', 'linear' :class:`~str`
     :param interp_freq: freqency to which power array is interpolated in Hertz :class:`~int`
+    :param engine: :samp:`scipy` or :samp:`fused`. Default=scipy :class:`~str`
 
     :returns:
         A :class:`~tuple` (ref_ali, tile_ali, time_array, ref_power, tile_power, ref_time, tile_time)
@@ -89,6 +264,29 @@ def savgol_interp(
     # Array of times at which to evaluate the interpolated data
     time_array = np.arange(start_time, stop_time, (1 / interp_freq))
 
+    if engine == "fused":
+        interp_ref = interp_weights(ref_time, time_array, interp_type)
+        if np.array_equal(ref_time, tile_time):
+            interp_tile = interp_ref
+        else:
+            interp_tile = interp_weights(tile_time, time_array, interp_type)
+        smooth = savgol_weights(
+            time_array.size, savgol_window_1, savgol_window_2, polyorder
+        )
+
+        ref_ali = smooth(interp_ref(ref_power))
+        tile_ali = smooth(interp_tile(tile_power))
+
+        return (
+            ref_ali,
+            tile_ali,
+            time_array,
+            ref_power,
+            tile_power,
+            ref_time,
+            tile_time,
+        )
+
     # Mathematical interpolation functions
     f = interpolate.interp1d(ref_time, ref_power, axis=0, kind=interp_type)
     g = interpolate.interp1d(tile_time, tile_power, axis=0, kind=interp_type)
@@ -221,6 +419,7 @@ def save_aligned(
     interp_freq,
     data_dir,
     out_dir,
+    engine="scipy",
 ):
     """Save an aligned set of rf data with :func:`~numpy.savez_compressed` to an :samp:`npz` file.
 
@@ -254,6 +453,7 @@ def save_aligned(
     :param interp_freq: freqency to which power array is interpolated :class:`~int`
     :param data_dir: root of data dir where rf data is located :class:`~str`
     :param out_dir: relative path to output directory :class:`~str`
+    :param engine: engine of :func:`~embers.rf_tools.align_data.savgol_interp`. Default=scipy :class:`~str`
 
     :return:
         - aligned rf data saved to :samp:`npz` file by :func:`~numpy.savez_compressed`
@@ -278,28 +478,234 @@ def save_aligned(
             polyorder=polyorder,
             interp_type=interp_type,
             interp_freq=interp_freq,
+            engine=engine,
         )
 
-        # creates output directory if it doesn't exist
-        save_dir = Path(f"{out_dir}/{date}/{time_stamp}")
-        save_dir.mkdir(parents=True, exist_ok=True)
-
-        # Convert the power array to float32
-        # Convert list of times to float64 (double)
-        # Save as compressed npz file. Seems to drastically reduce size
-        np.savez_compressed(
-            f"{save_dir}/{ref}_{tile}_{time_stamp}_aligned.npz",
-            ref_ali=np.single(ref_ali),
-            tile_ali=np.single(tile_ali),
-            time_array=np.double(time_array),
+        result = _save_npz(
+            ref, tile, time_stamp, ref_ali, tile_ali, time_array, out_dir
+        )
+        record_outputs(
+            out_dir,
+            *_pair_files(tile_pair, time_stamp, data_dir),
+            _align_params(
+                savgol_window_1,
+                savgol_window_2,
+                polyorder,
+                interp_type,
+                interp_freq,
+                engine,
+            ),
         )
 
-        return f"Saved aligned file to {save_dir}/{ref}_{tile}_{time_stamp}_aligned.npz"
+        return result
 
     except Exception as e:
         return e
 
 
+def _pair_files(tile_pair, time_stamp, data_dir):
+    """Aligned output of a pair of antennas, relative to :samp:`out_dir`, and its rf data files."""
+
+    date = re.search(r"\d{4}.\d{2}.\d{2}", time_stamp)[0]
+    ref, tile = tile_pair
+
+    outputs = [f"{date}/{time_stamp}/{ref}_{tile}_{time_stamp}_aligned.npz"]
+    inputs = [
+        f"{data_dir}/{ref}/{date}/{ref}_{time_stamp}.txt",
+        f"{data_dir}/{tile}/{date}/{tile}_{time_stamp}.txt",
+    ]
+
+    return (outputs, inputs)
+
+
+def _align_params(
+    savgol_window_1, savgol_window_2, polyorder, interp_type, interp_freq, engine
+):
+    """Parameters of alignment, recorded in the manifest of aligned outputs."""
+
+    return {
+        "savgol_window_1": savgol_window_1,
+        "savgol_window_2": savgol_window_2,
+        "polyorder": polyorder,
+        "interp_type": interp_type,
+        "interp_freq": interp_freq,
+        "engine": engine,
+    }
+
+
+def _save_npz(ref, tile, time_stamp, ref_ali, tile_ali, time_array, out_dir):
+    """Save aligned power arrays of a pair of antennas to a :samp:`npz` file."""
+
+    date = re.search(r"\d{4}.\d{2}.\d{2}", time_stamp)[0]
+
+    # creates output directory if it doesn't exist
+    save_dir = Path(f"{out_dir}/{date}/{time_stamp}")
+    save_dir.mkdir(parents=True, exist_ok=True)
+
+    # Convert the power array to float32
+    # Convert list of times to float64 (double)
+    # Save as compressed npz file. Seems to drastically reduce size
+    np.savez_compressed(
+        f"{save_dir}/{ref}_{tile}_{time_stamp}_aligned.npz",
+        ref_ali=np.single(ref_ali),
+        tile_ali=np.single(tile_ali),
+        time_array=np.double(time_array),
+    )
+
+    return f"Saved aligned file to {save_dir}/{ref}_{tile}_{time_stamp}_aligned.npz"
+
+
+def align_timestamp(
+    time_stamp,
+    savgol_window_1,
+    savgol_window_2,
+    polyorder,
+    interp_type,
+    interp_freq,
+    data_dir,
+    out_dir,
+    engine="scipy",
+    pairs=None,
+):
+    """Align all pairs of rf data files from a single observation, like :func:`~embers.rf_tools.align_data.save_aligned`.
+
+    Each reference antenna is paired with 14 tiles, so aligning pairs independently
+    reads and interpolates every reference file 14 times. Here, the rf data file of
+    each antenna is read once and interpolated once, over the full duration of its
+    data. With the :samp:`fused` engine, the interpolated array is also smoothed
+    once, and only the edges of each pair need to be smoothed again. The aligned
+    arrays of each pair are slices of the shared arrays, identical to those of
+    :func:`~embers.rf_tools.align_data.savgol_interp` to within floating point precision.
+    If the times of a pair do not lie on the time grid of an antenna, which happens
+    when :samp:`interp_freq` is not an integer, its data is interpolated again at the
+    times of the pair.
+
+    .. code-block:: python
+
+        from embers.rf_tools.align_data import align_timestamp
+
+        results = align_timestamp(
+                    "2020-01-01-00:00",
+                    11,
+                    15,
+                    2,
+                    "cubic",
+                    1,
+                    "~/embers-data/",
+                    "~/embers-outputs")
+
+    :param time_stamp: time when rf observation began. In YYYY-MM-DD-HH-MM format :class:`~str`
+    :param savgol_window_1:  window size of savgol filer, must be odd :class:`~int`
+    :param savgol_window_2:  window size of savgol filer, must be odd :class:`~int`
+    :param polyorder: polynomial order to fit to savgol_window :class:`~int`
+    :param interp_type: type of interpolation. Ex: 'cubic', 'linear' :class:`~str`
+    :param interp_freq: freqency to which power array is interpolated :class:`~int`
+    :param data_dir: root of data dir where rf data is located :class:`~str`
+    :param out_dir: relative path to output directory :class:`~str`
+    :param engine: engine of :func:`~embers.rf_tools.align_data.savgol_interp`. Default=scipy :class:`~str`
+    :param pairs: pairs of antennas to align. Default=None, which aligns all pairs from :func:`~embers.rf_tools.rf_data.tile_pairs` :class:`~list`
+
+    :returns:
+        - results - message or exception for each pair :class:`~list`
+
+    """
+
+    date = re.search(r"\d{4}.\d{2}.\d{2}", time_stamp)[0]
+
+    if pairs is None:
+        pairs = tile_pairs(tile_names())
+    params = _align_params(
+        savgol_window_1, savgol_window_2, polyorder, interp_type, interp_freq, engine
+    )
+
+    # Read and interpolate the data of each antenna once
+    antennas = {}
+    names = {name for pair in pairs for name in pair}
+    for name in [name for name in tile_names() if name in names]:
+        rf_file = f"{data_dir}/{name}/{date}/{name}_{time_stamp}.txt"
+        try:
+            power, times = read_data(rf_file)
+            start_time = math.ceil(times[0])
+            time_array = np.arange(start_time, math.floor(times[-1]), 1 / interp_freq)
+
+            if engine == "fused":
+                power_ali = interp_weights(times, time_array, interp_type)(power)
+                power_smooth = savgol_weights(
+                    time_array.size, savgol_window_1, savgol_window_2, polyorder
+                )(power_ali)
+            else:
+                f = interpolate.interp1d(times, power, axis=0, kind=interp_type)
+                power_ali = f(time_array)
+                power_smooth = None
+
+            antennas[name] = (times, start_time, power, power_ali, power_smooth)
+
+        except Exception as e:
+            antennas[name] = e
+
+    results = []
+    for ref, tile in pairs:
+        try:
+            for antenna in [antennas[ref], antennas[tile]]:
+                if isinstance(antenna, Exception):
+                    raise antenna
+
+            ref_time, ref_start = antennas[ref][:2]
+            tile_time, tile_start = antennas[tile][:2]
+
+            # Times of the pair, as in savgol_interp
+            start_time = math.ceil(max(ref_time[0], tile_time[0]))
+            stop_time = math.floor(min(ref_time[-1], tile_time[-1]))
+            time_array = np.arange(start_time, stop_time, (1 / interp_freq))
+
+            if engine == "fused":
+                smooth = savgol_weights(
+                    time_array.size, savgol_window_1, savgol_window_2, polyorder
+                )
+
+            aligned = []
+            for name, own_start in [(ref, ref_start), (tile, tile_start)]:
+                times, _, power, power_ali, power_smooth = antennas[name]
+
+                # Slice of the interpolated data within times of the pair, if they
+                # lie on the time grid of this antenna. Otherwise, interpolate again
+                offset = (start_time - own_start) * interp_freq
+                if np.isclose(offset, round(offset)):
+                    rows = slice(round(offset), round(offset) + time_array.size)
+                    power_ali = power_ali[rows]
+                    if engine == "fused":
+                        power_smooth = power_smooth[rows]
+                elif engine == "fused":
+                    power_ali = interp_weights(times, time_array, interp_type)(power)
+                    power_smooth = None
+                else:
+                    f = interpolate.interp1d(times, power, axis=0, kind=interp_type)
+                    power_ali = f(time_array)
+
+                if engine == "fused":
+                    aligned.append(smooth(power_ali, power_smooth))
+                else:
+                    power_pair = savgol_filter(
+                        power_ali, savgol_window_1, polyorder, axis=0
+                    )
+                    power_pair = savgol_filter(
+                        power_pair, savgol_window_2, polyorder, axis=0
+                    )
+                    aligned.append(power_pair)
+
+            results.append(
+                _save_npz(ref, tile, time_stamp, *aligned, time_array, out_dir)
+            )
+            record_outputs(
+                out_dir, *_pair_files((ref, tile), time_stamp, data_dir), params
+            )
+
+        except Exception as e:
+            results.append(e)
+
+    return results
+
+
 def align_batch(
     start_date=None,
     stop_date=None,
@@ -311,8 +717,14 @@ def align_batch(
     data_dir=None,
     out_dir=None,
     max_cores=None,
+    engine="scipy",
+    resume=False,
 ):
-    """Temporally align all RF files within a date interval using :func:`~embers.rf_tools.align_data.save_aligned`.
+    """Temporally align all RF files within a date interval using :func:`~embers.rf_tools.align_data.align_timestamp`.
+
+    Each observation is aligned by a single task, which reads the rf data file of each antenna once.
+    All tasks are run in a single process pool by :func:`~embers.rf_tools.rf_data.run_batch`,
+    which logs the throughput of the batch.
 
 
     :param start_date: In YYYY-MM-DD format :class:`~str`
@@ -325,13 +737,15 @@ def align_batch(
     :param data_dir: root of data dir where rf data is located :class:`~str`
     :param out_dir: relative path to output directory :class:`~str`
     :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+    :param engine: engine of :func:`~embers.rf_tools.align_data.savgol_interp`. Default=scipy :class:`~str`
+    :param resume: If :samp:`True`, skip pairs whose aligned files are up to date in the manifest of :samp:`out_dir`, from :func:`~embers.rf_tools.manifest.up_to_date`. Default=False :class:`~bool`
 
     :return:
         - aligned rf data saved to :samp:`npz` file by :func:`~numpy.savez_compressed` in :samp:`out_dir`
 
     """
 
-    dates, time_stamps = time_tree(start_date, stop_date)
+    _, time_stamps = time_tree(start_date, stop_date)
 
     # Logging config
     log_dir = Path(f"{out_dir}")
@@ -342,25 +756,46 @@ def align_batch(
         format="%(levelname)s: %(funcName)s: %(message)s",
     )
 
-    for pair in tile_pairs(tile_names()):
-
-        for day in range(len(dates)):
-
-            with concurrent.futures.ProcessPoolExecutor(
-                max_workers=max_cores
-            ) as executor:
-                results = executor.map(
-                    save_aligned,
-                    repeat(pair),
-                    time_stamps[day],
-                    repeat(savgol_window_1),
-                    repeat(savgol_window_2),
-                    repeat(polyorder),
-                    repeat(interp_type),
-                    repeat(interp_freq),
-                    repeat(data_dir),
-                    repeat(out_dir),
+    params = _align_params(
+        savgol_window_1, savgol_window_2, polyorder, interp_type, interp_freq, engine
+    )
+    manifest = read_manifest(out_dir) if resume else {}
+
+    all_pairs = tile_pairs(tile_names())
+
+    tasks = []
+    n_skipped = 0
+    for time_stamp in [time_stamp for day in time_stamps for time_stamp in day]:
+        pairs = all_pairs
+        if resume:
+            pairs = [
+                pair
+                for pair in pairs
+                if not up_to_date(
+                    manifest, out_dir, *_pair_files(pair, time_stamp, data_dir), params
+                )
+            ]
+            n_skipped += len(all_pairs) - len(pairs)
+
+        if pairs:
+            tasks.append(
+                (
+                    time_stamp,
+                    savgol_window_1,
+                    savgol_window_2,
+                    polyorder,
+                    interp_type,
+                    interp_freq,
+                    data_dir,
+                    out_dir,
+                    engine,
+                    pairs,
                 )
+            )
+
+    if resume:
+        logging.info(f"Skipping {n_skipped} up to date aligned files")
 
-            for result in results:
-                logging.info(result)
+    for results in run_batch(align_timestamp, tasks, max_cores=max_cores):
+        for result in results:
+            logging.info(result)
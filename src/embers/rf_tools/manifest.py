@@ -0,0 +1,155 @@
+"""
+Manifest
+--------
+
+A manifest of the outputs produced by batch tools, recording
+fingerprints of their inputs and the parameters used to create
+them, enabling interrupted batch runs to be resumed
+
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def manifest_path(out_dir):
+    """Path to the manifest of outputs saved to :samp:`out_dir`.
+
+    :param out_dir: path to output directory :class:`~str`
+
+    :returns:
+        - manifest - path to :samp:`{out_dir}/manifest.jsonl` :class:`~pathlib.Path`
+
+    """
+
+    return Path(f"{out_dir}/manifest.jsonl")
+
+
+def fingerprint(path):
+    """Fingerprint a file by its size and modification time.
+
+    :param path: path to file :class:`~str`
+
+    :returns:
+        - fingerprint - :samp:`{size}:{mtime_ns}` of the file, or :samp:`None` if it does not exist :class:`~str`
+
+    """
+
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _record(out_dir, outputs, inputs, params):
+    """Create a manifest record of outputs, relative to :samp:`out_dir`."""
+
+    return {
+        "outputs": {output: fingerprint(f"{out_dir}/{output}") for output in outputs},
+        "inputs": {f"{path}": fingerprint(path) for path in inputs},
+        "params": json.loads(json.dumps(params)),
+    }
+
+
+def record_outputs(out_dir, outputs, inputs, params):
+    """Record outputs of a task in the manifest of :samp:`out_dir`.
+
+    Each record is appended to the manifest as a single line of json, with a single
+    write, so records can safely be appended by many processes at once.
+
+    .. code-block:: python
+
+        from embers.rf_tools.manifest import record_outputs
+
+        record_outputs(
+            "./embers_out/rf_tools",
+            ["waterfalls/2019-10-01/2019-10-01-14:30/S06XX_2019-10-01-14:30.png"],
+            ["./tiles_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"],
+            {})
+
+    :param out_dir: path to output directory :class:`~str`
+    :param outputs: paths to outputs of the task, relative to :samp:`out_dir` :class:`~list`
+    :param inputs: paths to all inputs of the task :class:`~list`
+    :param params: parameters of the task, which can be serialized to json :class:`~dict`
+
+    :returns:
+        record of the task appended to :samp:`{out_dir}/manifest.jsonl`
+
+    """
+
+    line = json.dumps(_record(out_dir, outputs, inputs, params)) + "\n"
+
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    fd = os.open(manifest_path(out_dir), os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def read_manifest(out_dir):
+    """Read the manifest of :samp:`out_dir`.
+
+    :param out_dir: path to output directory :class:`~str`
+
+    :returns:
+        - manifest - latest record of each output :class:`~dict`
+
+    """
+
+    manifest = {}
+    path = manifest_path(out_dir)
+    if not path.is_file():
+        return manifest
+
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Skip lines truncated by an interrupted run
+                continue
+
+            for output in record["outputs"]:
+                manifest[output] = record
+
+    return manifest
+
+
+def up_to_date(manifest, out_dir, outputs, inputs, params):
+    """Check whether outputs of a task are up to date.
+
+    Outputs are up to date if they were recorded in the manifest with the same
+    parameters, and neither they nor any of the inputs have changed since.
+
+    .. code-block:: python
+
+        from embers.rf_tools.manifest import read_manifest, up_to_date
+
+        manifest = read_manifest("./embers_out/rf_tools")
+        up_to_date(
+            manifest,
+            "./embers_out/rf_tools",
+            ["waterfalls/2019-10-01/2019-10-01-14:30/S06XX_2019-10-01-14:30.png"],
+            ["./tiles_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"],
+            {})
+
+    :param manifest: manifest from :func:`~embers.rf_tools.manifest.read_manifest` :class:`~dict`
+    :param out_dir: path to output directory :class:`~str`
+    :param outputs: paths to outputs of the task, relative to :samp:`out_dir` :class:`~list`
+    :param inputs: paths to all inputs of the task :class:`~list`
+    :param params: parameters of the task :class:`~dict`
+
+    :returns:
+        - up_to_date - :samp:`True` if the task need not be run again :class:`~bool`
+
+    """
+
+    record = manifest.get(outputs[0])
+    if record is None:
+        return False
+
+    return record == _record(out_dir, outputs, inputs, params)
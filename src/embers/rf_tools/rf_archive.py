@@ -0,0 +1,185 @@
+"""
+RF Archive
+----------
+
+Tools to pack a day of raw rf data from a single tile
+into a memory mapped archive, reducing the number of
+files opened in batch processing by a factor of 48
+
+"""
+
+import concurrent.futures
+import logging
+import re
+from itertools import product, repeat
+from pathlib import Path
+
+import numpy as np
+from embers.rf_tools.rf_data import read_data, tile_names, time_tree
+
+
+def pack_archive(tile, date, data_dir, out_dir):
+    """Pack a day of rf data files from a tile into a single archive.
+
+    The archive is a sequence of three :samp:`npy` arrays written to a single
+    :samp:`{tile}_{date}.rfa` file. The first is an index of 49 rows, marking the
+    start and end of each 30 minute observation, the second all the times and
+    the third all the power, stored as unsigned bytes like the raw data.
+    Rows of observations which are missing or empty have zero length in the index.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_archive import pack_archive
+        pack_archive("S06XX", "2019-10-01", "~/embers-data", "~/embers-archive")
+
+    :param tile: tile name :class:`~str`
+    :param date: day of rf observations in :samp:`YYYY-MM-DD` format :class:`~str`
+    :param data_dir: path to root of data directory :class:`~str`
+    :param out_dir: path to output directory :class:`~str`
+
+    :returns:
+        archive saved to :samp:`{out_dir}/{tile}/{tile}_{date}.rfa`
+
+    """
+
+    try:
+        _, time_stamps = time_tree(date, date)
+
+        index = [0]
+        times = []
+        data = []
+        for time_stamp in time_stamps[0]:
+            rf_path = Path(f"{data_dir}/{tile}/{date}/{tile}_{time_stamp}.txt")
+
+            n_rows = 0
+            if rf_path.is_file():
+                power, rf_times = read_data(rf_path)
+                n_rows = rf_times.size
+                if n_rows > 0:
+                    times.append(rf_times)
+
+                    # Convert power in dBm back to unsigned bytes
+                    data.append((power * -2).astype(np.uint8))
+
+            index.append(index[-1] + n_rows)
+
+        if not times:
+            return f"No rf data found for {tile} on {date}, skipping"
+
+        save_dir = Path(f"{out_dir}/{tile}")
+        save_dir.mkdir(parents=True, exist_ok=True)
+        archive = save_dir / f"{tile}_{date}.rfa"
+
+        arrays = [
+            np.asarray(index, dtype=np.int64),
+            np.concatenate(times),
+            np.concatenate(data),
+        ]
+        with open(archive, "wb") as f:
+            for array in arrays:
+                np.lib.format.write_array(f, array, version=(1, 0))
+
+        return f"Archive saved to {archive}"
+
+    except Exception as e:
+        return e
+
+
+def load_archive(archive):
+    """Memory map the index, times and power arrays of an rf archive.
+
+    No data is read from disk until the arrays are accessed, and slices of
+    the arrays are views of the archive file.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_archive import load_archive
+        index, times, data = load_archive("~/embers-archive/S06XX/S06XX_2019-10-01.rfa")
+
+        # Raw bytes of the 15:00 observation
+        data_1500 = data[index[30] : index[31]]
+
+    :param archive: path to archive from :func:`~embers.rf_tools.rf_archive.pack_archive` :class:`~str`
+
+    :returns:
+        A :class:`~tuple` (index, times, data)
+
+        - index - start and end rows of each 30 minute observation :class:`~numpy.memmap`
+        - times - times in UNIX :class:`~numpy.memmap`
+        - data - raw power as unsigned bytes :class:`~numpy.memmap`
+
+    """
+
+    arrays = []
+    with open(archive, "rb") as f:
+        for _ in range(3):
+            np.lib.format.read_magic(f)
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            offset = f.tell()
+            arrays.append(
+                np.memmap(
+                    archive,
+                    dtype=dtype,
+                    mode="r",
+                    offset=offset,
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+            )
+            f.seek(offset + int(np.prod(shape)) * dtype.itemsize)
+
+    return tuple(arrays)
+
+
+def read_archive(archive, time_stamp):
+    """Read a 30 minute observation from an rf archive, like :func:`~embers.rf_tools.rf_data.read_data`.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_archive import read_archive
+        power, times = read_archive(
+            "~/embers-archive/S06XX/S06XX_2019-10-01.rfa", "2019-10-01-14:30")
+
+    :param archive: path to archive from :func:`~embers.rf_tools.rf_archive.pack_archive` :class:`~str`
+    :param time_stamp: start of rf observation in :samp:`YYYY-MM-DD-HH:MM` format :class:`~str`
+
+    :returns:
+        - power - power in dBm :class:`~numpy.ndarray`
+        - times - times in UNIX, a view of the archive :class:`~numpy.memmap`
+
+    """
+
+    index, times, data = load_archive(archive)
+
+    # Index of the 30 minute observation within the day
+    hour, minute = re.search(r"(\d{2}):(\d{2})$", time_stamp).groups()
+    obs = 2 * int(hour) + int(minute) // 30
+    start, stop = index[obs], index[obs + 1]
+
+    # The (-1/2) converts an unsigned byte to a real value
+    power = data[start:stop].astype(np.single) * np.single(-1 / 2)
+
+    return (power, times[start:stop])
+
+
+def archive_batch(start_date, stop_date, data_dir, out_dir, max_cores=None):
+    """Pack rf data files of all tiles within a date interval into archives.
+
+    :param start_date: date in style YYYY-MM-DD :class:`~str`
+    :param stop_date: date in style YYYY-MM-DD :class:`~str`
+    :param data_dir: path to root of rf data dir :class:`~str`
+    :param out_dir: path to output dir :class:`~str`
+    :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+
+    """
+
+    dates, _ = time_tree(start_date, stop_date)
+    tiles, days = zip(*product(tile_names(), dates))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+        results = executor.map(
+            pack_archive, tiles, days, repeat(data_dir), repeat(out_dir)
+        )
+
+    for result in results:
+        logging.info(result)
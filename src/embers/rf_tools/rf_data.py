@@ -8,7 +8,9 @@ RF Explorers and visualise waterfall plots
 """
 
 import concurrent.futures
+import hashlib
 import logging
+import os
 import re
 import time
 from datetime import datetime, timedelta
@@ -18,28 +20,170 @@ from pathlib import Path
 import matplotlib
 import numpy as np
 from embers.rf_tools.colormaps import spectral
+from embers.rf_tools.manifest import read_manifest, record_outputs, up_to_date
 from matplotlib import pyplot as plt
 
 matplotlib.use("Agg")
 _spec, _ = spectral()
 
 
-def read_data(rf_file=None):
+def read_data(rf_file=None, cache_dir=None):
     """Convert rf binary data into :class:`~numpy.ndarray` of power and time.
 
+    The entire file is read as a single bytes buffer and decoded by
+    :func:`~embers.rf_tools.rf_data.decode_data`.
+
+    Decoding can be skipped on repeated reads by opting in to a cache of decoded
+    arrays, with the :samp:`cache_dir` parameter or the :samp:`EMBERS_RF_CACHE`
+    environment variable. The first read of a file saves its decoded arrays to
+    :samp:`cache_dir` with :func:`~embers.rf_tools.rf_data.save_rf_cache`, which
+    subsequent reads memory map, as long as the size and modification time of the
+    file are unchanged. Cached arrays are read-only.
+
     .. code-block:: python
 
         from embers.rf_tools.rf_data import read_data
         power, times = read_data(rf_file='~/embers-data/rf.txt')
 
+        # Cache decoded arrays
+        power, times = read_data(rf_file='~/embers-data/rf.txt', cache_dir='~/embers-cache')
+
     :param rf_file: path to rf binary data file :class:`str`
+    :param cache_dir: path to cache of decoded rf data. Default=None, which uses :samp:`EMBERS_RF_CACHE` if set :class:`str`
+
+    :returns:
+        - power - power in dBm :class:`~numpy.ndarray`
+        - times - times in UNIX :class:`~numpy.ndarray`
+
+    """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get("EMBERS_RF_CACHE")
+
+    if cache_dir:
+        power_path, times_path = rf_cache_paths(rf_file, cache_dir)
+        if power_path.is_file() and times_path.is_file():
+            power = np.load(power_path, mmap_mode="r")
+            times = np.load(times_path, mmap_mode="r")
+            return (power, times)
+
+    with open(rf_file, "rb") as f:
+        rf_bytes = f.read()
+
+    power, times = decode_data(rf_bytes)
+
+    if cache_dir:
+        save_rf_cache(rf_file, power, times, cache_dir)
+
+    return (power, times)
+
+
+def decode_data(rf_bytes):
+    """Decode a buffer of raw rf data into :class:`~numpy.ndarray` of power and time.
+
+    Raw rf data files begin with a single header line, followed by one line
+    per spectrum of the form :samp:`<unix time>$Sp<power bytes>\\r\\n`. Rather
+    than splitting the buffer line by line, the offsets of all newlines and
+    :samp:`$Sp` separators are located with :mod:`numpy`. The power payload
+    is viewed as a 2D array of unsigned bytes and the timestamps are parsed in
+    bulk. When every line has the same length, which is the case for data
+    recorded by RF Explorers, both are strided views of the original buffer.
+
+    Any trailing bytes after the last newline are an incomplete line and are ignored.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import decode_data
+
+        with open('~/embers-data/rf.txt', 'rb') as f:
+            power, times = decode_data(f.read())
+
+    :param rf_bytes: contents of an rf binary data file :class:`~bytes`
 
     :returns:
         - power - power in dBm :class:`~numpy.ndarray`
         - times - times in UNIX :class:`~numpy.ndarray`
 
+    :raises ValueError: a line has no :samp:`$Sp` separator, or lines have different numbers of channels
+
     """
 
+    buf = np.frombuffer(rf_bytes, dtype=np.uint8)
+
+    # The first newline terminates the header, each subsequent newline ends a line of data
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = newlines[:-1] + 1
+    ends = newlines[1:]
+
+    if starts.size == 0:
+        return (np.zeros(0, dtype=np.single), np.zeros(0, dtype=np.double))
+
+    # Offsets of the first "$Sp" separator in each line
+    seps = np.flatnonzero(buf[:-2] == ord("$"))
+    seps = seps[(buf[seps + 1] == ord("S")) & (buf[seps + 2] == ord("p"))]
+    sep_index = np.searchsorted(seps, starts)
+    if sep_index[-1] >= seps.size or np.any(seps[sep_index] >= ends):
+        raise ValueError("rf data line without a '$Sp' separator")
+    seps = seps[sep_index]
+
+    # Length of the timestamps and number of channels in each line
+    # The last two charachters are excluded - Newline char
+    t_lens = seps - starts
+    n_chans = ends - seps - 4
+    if np.any(n_chans != n_chans[0]):
+        raise ValueError("rf data lines have different numbers of channels")
+    n_chans = n_chans[0]
+
+    if np.all(t_lens == t_lens[0]):
+        # Fixed width lines, view the buffer as a 2D array with a line per row
+        t_len = t_lens[0]
+        lines = buf[starts[0] : ends[-1] + 1].reshape(-1, t_len + n_chans + 5)
+        data = lines[:, t_len + 3 : t_len + 3 + n_chans]
+        stamps = np.ascontiguousarray(lines[:, :t_len])
+    else:
+        # Variable width timestamps, gather each line into a zero padded array
+        data = buf[(seps + 3)[:, None] + np.arange(n_chans)]
+        t_len = t_lens.max()
+        chars = np.arange(t_len)
+        stamps = np.zeros((starts.size, t_len), dtype=np.uint8)
+        mask = chars < t_lens[:, None]
+        stamps[mask] = buf[(starts[:, None] + chars)[mask]]
+
+    # The (-1/2) converts an unsigned byte to a real value
+    power = data.astype(np.single) * np.single(-1 / 2)
+
+    times = _parse_times(stamps)
+
+    return (power, times)
+
+
+def _parse_times(stamps):
+    """Parse a 2D array of timestamp charachters, one timestamp per row, to UNIX times."""
+
+    n_times, t_len = stamps.shape
+    digits = stamps.astype(np.int64) - ord("0")
+    dot = np.flatnonzero(stamps[0] == ord("."))
+
+    # Timestamps with aligned decimal points are read as integers. If these are
+    # exactly representable as doubles, division by a power of ten is correctly
+    # rounded and identical to parsing each timestamp with float()
+    if n_times > 0 and dot.size == 1 and t_len <= 19:
+        dot = dot[0]
+        is_digit = np.arange(t_len) != dot
+        digits = digits[:, is_digit]
+        if np.all(stamps[:, dot] == ord(".")) and np.all((digits >= 0) & (digits <= 9)):
+            places = 10 ** np.arange(t_len - 2, -1, -1, dtype=np.int64)
+            integers = digits @ places
+            if integers.max() < 2 ** 53:
+                return integers.astype(np.double) / 10.0 ** (t_len - 1 - dot)
+
+    # Otherwise, each row of timestamp charachters is a null padded byte string
+    return stamps.view(f"S{t_len}").ravel().astype(np.double)
+
+
+def _read_data_lines(rf_file):
+    """Line by line decoder of rf binary data, used as a reference for :func:`decode_data`."""
+
     with open(rf_file, "rb") as f:
         next(f)
         lines = f.readlines()
@@ -62,6 +206,164 @@ def read_data(rf_file=None):
         return (power, times)
 
 
+def read_new_data(rf_file, offset=0):
+    """Decode complete lines of rf data appended to a file since a byte offset.
+
+    RF Explorers append a line of data to the current rf data file every few
+    hundred milliseconds. Only the bytes after :samp:`offset` are read, and
+    any incomplete line at the end of the file is left for the next call.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import read_new_data
+        power, times, offset = read_new_data('~/embers-data/rf.txt')
+
+        # Later, only decode lines written since
+        new_power, new_times, offset = read_new_data('~/embers-data/rf.txt', offset)
+
+    :param rf_file: path to rf binary data file :class:`str`
+    :param offset: byte offset of the first unread line, 0 at the start of the file :class:`~int`
+
+    :returns:
+        A :class:`~tuple` (power, times, offset)
+
+        - power - power in dBm of new lines :class:`~numpy.ndarray`
+        - times - times in UNIX of new lines :class:`~numpy.ndarray`
+        - offset - byte offset after the last complete line :class:`~int`
+
+    """
+
+    with open(rf_file, "rb") as f:
+        f.seek(offset)
+        rf_bytes = f.read()
+
+    # Keep incomplete lines for the next read
+    n_bytes = rf_bytes.rfind(b"\n") + 1
+
+    # Past the header, an empty header is added for decode_data
+    if offset > 0:
+        rf_bytes = b"\n" + rf_bytes[:n_bytes]
+
+    power, times = decode_data(rf_bytes)
+
+    return (power, times, offset + n_bytes)
+
+
+def tail_data(rf_file, interval=1, timeout=60):
+    """Follow an rf data file as it is being written, yielding blocks of new data.
+
+    Every :samp:`interval` seconds, lines appended to the file are decoded with
+    :func:`~embers.rf_tools.rf_data.read_new_data`. The byte offset of the last
+    complete line is kept between polls, so each poll only reads new data.
+    Polling stops once no new lines are written for :samp:`timeout` seconds,
+    which includes waiting for the file to be created.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import tail_data
+
+        for power_block, times_block in tail_data('~/embers-data/rf.txt'):
+            print(f"{times_block.size} new lines")
+
+    :param rf_file: path to rf binary data file :class:`str`
+    :param interval: time between polls in seconds, default=1 :class:`~float`
+    :param timeout: stop after this many seconds without new lines, default=60 :class:`~float`
+
+    :returns:
+        A generator of :class:`~tuple` (power_block, times_block)
+
+        - power_block - power in dBm of new lines :class:`~numpy.ndarray`
+        - times_block - times in UNIX of new lines :class:`~numpy.ndarray`
+
+    """
+
+    offset = 0
+    last_data = time.monotonic()
+
+    while time.monotonic() - last_data < timeout:
+
+        if Path(rf_file).is_file():
+            power, times, offset = read_new_data(rf_file, offset)
+
+            if times.size > 0:
+                last_data = time.monotonic()
+                yield (power, times)
+                continue
+
+        time.sleep(interval)
+
+
+def rf_cache_paths(rf_file, cache_dir):
+    """Paths to the cached power and time arrays of an rf data file.
+
+    The cache mirrors the :samp:`tile/YYYY-MM-DD` structure of the data directory.
+    Cached files are keyed on the absolute path, size and modification time
+    of the rf data file, such that an rf data file which has been modified
+    never matches stale arrays.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import rf_cache_paths
+        power_path, times_path = rf_cache_paths(
+            '~/embers-data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt', '~/embers-cache')
+
+    .. code-block:: python
+
+        print(power_path)
+        >>> ~/embers-cache/S06XX/2019-10-01/S06XX_2019-10-01-14:30_8d2c1e0f6a7b9c3d_power.npy
+
+    :param rf_file: path to rf binary data file :class:`~str`
+    :param cache_dir: path to cache of decoded rf data :class:`~str`
+
+    :returns:
+        A :class:`~tuple` (power_path, times_path)
+
+        - power_path - path to cached power array :class:`~pathlib.Path`
+        - times_path - path to cached times array :class:`~pathlib.Path`
+
+    :raises FileNotFoundError: rf data file does not exist
+
+    """
+
+    rf_path = Path(rf_file).resolve()
+    rf_stat = rf_path.stat()
+    key = f"{rf_path}:{rf_stat.st_size}:{rf_stat.st_mtime_ns}"
+    key = hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    cache_path = Path(cache_dir) / rf_path.parent.parent.name / rf_path.parent.name
+    power_path = cache_path / f"{rf_path.stem}_{key}_power.npy"
+    times_path = cache_path / f"{rf_path.stem}_{key}_times.npy"
+
+    return (power_path, times_path)
+
+
+def save_rf_cache(rf_file, power, times, cache_dir):
+    """Save decoded arrays of an rf data file to the cache read by :func:`~embers.rf_tools.rf_data.read_data`.
+
+    Arrays are written to temporary files which are then renamed, so that
+    parallel processes caching the same rf data file never see partial arrays.
+
+    :param rf_file: path to rf binary data file :class:`~str`
+    :param power: power array from :func:`~embers.rf_tools.rf_data.decode_data` :class:`~numpy.ndarray`
+    :param times: times array from :func:`~embers.rf_tools.rf_data.decode_data` :class:`~numpy.ndarray`
+    :param cache_dir: path to cache of decoded rf data :class:`~str`
+
+    :returns:
+        - decoded arrays saved to :samp:`cache_dir` with :func:`~numpy.save`
+
+    """
+
+    power_path, times_path = rf_cache_paths(rf_file, cache_dir)
+    power_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Times are saved before power, so a cached power array always has its times
+    for path, array in [(times_path, times), (power_path, power)]:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+
 def tile_names():
     """List of MWA and reference antenna names
 
@@ -229,6 +531,66 @@ def time_tree(start_date, stop_date):
     return (dates, time_stamps)
 
 
+def _run_chunk(func, chunk):
+    """Apply a function to a chunk of argument tuples within a worker process."""
+
+    return [func(*args) for args in chunk]
+
+
+def run_batch(func, tasks, max_cores=None, chunk_size=None):
+    """Run a batch of tasks in a single process pool, yielding results as they complete.
+
+    All tasks are submitted at once to one :class:`~concurrent.futures.ProcessPoolExecutor`,
+    which lives for the whole batch, so workers are only started once and never wait on other
+    workers at the end of each day. Tasks are grouped into chunks, to reduce the overhead
+    of inter process communication, and the results of each chunk are collected with
+    :func:`~concurrent.futures.as_completed`. The throughput of the batch is logged after
+    each chunk completes.
+
+    .. code-block:: python
+
+        from embers.rf_tools.rf_data import batch_waterfall, run_batch
+
+        tasks = [("S06XX", "2019-10-01-14:30", "~/embers-data", "~/embers-outputs")]
+        for result in run_batch(batch_waterfall, tasks, max_cores=4):
+            print(result)
+
+    :param func: function applied to each task, which must be picklable :class:`~function`
+    :param tasks: arguments of :samp:`func` for each task :class:`~list` of :class:`~tuple`
+    :param max_cores: Maximum number of cores to be used. Default=None, which means that all available cores are used
+    :param chunk_size: number of tasks in each chunk. Default=None, which splits tasks into ~4 chunks per core :class:`~int`
+
+    :returns:
+        - generator of results of :samp:`func`, in order of completion
+
+    """
+
+    tasks = list(tasks)
+    n_tasks = len(tasks)
+    if n_tasks == 0:
+        return
+
+    if chunk_size is None:
+        n_workers = max_cores or os.cpu_count() or 1
+        chunk_size = max(1, -(-n_tasks // (4 * n_workers)))
+
+    chunks = [tasks[i : i + chunk_size] for i in range(0, n_tasks, chunk_size)]
+
+    n_done = 0
+    start = time.monotonic()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+        futures = [executor.submit(_run_chunk, func, chunk) for chunk in chunks]
+
+        for future in concurrent.futures.as_completed(futures):
+            results = future.result()
+            n_done += len(results)
+            elapsed = time.monotonic() - start
+            logging.info(
+                f"Completed {n_done}/{n_tasks} tasks in {elapsed:.1f} s, {n_done / elapsed:.2f} tasks/s"
+            )
+            yield from results
+
+
 def plt_waterfall(power, times, name):
     """
     Create waterfall :func:`~matplotlib.pyplot.plot` object from rf data.
@@ -319,6 +681,42 @@ def single_waterfall(rf_file, out_dir):
     plt.close()
 
 
+def live_waterfall(rf_file, out_dir, interval=10, timeout=60):
+    """Update a waterfall plot as an rf data file is being written.
+
+    New data is read with :func:`~embers.rf_tools.rf_data.tail_data`,
+    and the waterfall plot is saved again after each poll.
+
+    :param rf_file: path to a rf data file :class:`~str`
+    :param out_dir: path to output directory :class:`~str`
+    :param interval: time between updates in seconds, default=10 :class:`~float`
+    :param timeout: stop after this many seconds without new data, default=60 :class:`~float`
+
+    :returns:
+        waterfall plot saved by :func:`~matplotlib.pyplot.savefig`
+
+    """
+
+    rf_name = Path(rf_file).stem
+
+    # Make out_dir if it doesn't exist
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    power_blocks = []
+    times_blocks = []
+    for power, times in tail_data(rf_file, interval=interval, timeout=timeout):
+        power_blocks.append(power)
+        times_blocks.append(times)
+
+        # plt_waterfall labels 5 time steps
+        if sum(t.size for t in times_blocks) >= 5:
+            plt = plt_waterfall(
+                np.concatenate(power_blocks), np.concatenate(times_blocks), rf_name
+            )
+            plt.savefig(f"{out_dir}/{rf_name}.png")
+            plt.close()
+
+
 def batch_waterfall(tile, time_stamp, data_dir, out_dir):
     """Save a waterfall plot for a batch of rf data files.
 
@@ -350,15 +748,31 @@ def batch_waterfall(tile, time_stamp, data_dir, out_dir):
         plt.savefig(f"{save_dir}/{rf_name}.png")
         plt.close()
 
+        record_outputs(out_dir, *_waterfall_files(tile, time_stamp, data_dir), {})
+
         return f"Waterfall plot saved to {save_dir}/{rf_name}.png"
 
     except Exception as e:
         return e
 
 
-def waterfall_batch(start_date, stop_date, data_dir, out_dir):
+def _waterfall_files(tile, time_stamp, data_dir):
+    """Waterfall plot of an rf data file, relative to :samp:`out_dir`, and the rf data file."""
+
+    rf_name = f"{tile}_{time_stamp}"
+    date = re.search(r"\d{4}.\d{2}.\d{2}", time_stamp)[0]
+
+    outputs = [f"waterfalls/{date}/{time_stamp}/{rf_name}.png"]
+    inputs = [f"{data_dir}/{tile}/{date}/{rf_name}.txt"]
+
+    return (outputs, inputs)
+
+
+def waterfall_batch(
+    start_date, stop_date, data_dir, out_dir, max_cores=None, resume=False
+):
     """
-    Save a series of waterfall plots in parallel.
+    Save a series of waterfall plots in parallel with :func:`~embers.rf_tools.rf_data.run_batch`.
 
     :param start_date: date in style YYYY-MM-DD
     :type start_date: str
@@ -368,22 +782,132 @@ def waterfall_batch(start_date, stop_date, data_dir, out_dir):
     :type data_dir: str
     :param out_dir: path to output dir
     :type out_dir: str
+    :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+    :param resume: If :samp:`True`, skip waterfall plots which are up to date in the manifest of :samp:`out_dir`, from :func:`~embers.rf_tools.manifest.up_to_date`. Default=False
+    :type resume: bool
 
     """
 
-    dates, time_stamps = time_tree(start_date, stop_date)
+    _, time_stamps = time_tree(start_date, stop_date)
 
-    for tile in tile_names():
-        for day in range(len(dates)):
+    tasks = [
+        (tile, time_stamp, data_dir, out_dir)
+        for tile in tile_names()
+        for day in time_stamps
+        for time_stamp in day
+    ]
 
-            with concurrent.futures.ProcessPoolExecutor() as executor:
-                results = executor.map(
-                    batch_waterfall,
-                    repeat(tile),
-                    time_stamps[day],
-                    repeat(data_dir),
-                    repeat(out_dir),
-                )
+    if resume:
+        manifest = read_manifest(out_dir)
+        n_tasks = len(tasks)
+        tasks = [
+            task
+            for task in tasks
+            if not up_to_date(manifest, out_dir, *_waterfall_files(*task[:3]), {})
+        ]
+        logging.info(f"Skipping {n_tasks - len(tasks)} up to date waterfall plots")
+
+    for result in run_batch(batch_waterfall, tasks, max_cores=max_cores):
+        logging.info(result)
+
+
+def warm_rf_cache(tile, time_stamp, data_dir, cache_dir):
+    """Decode an rf data file and save its arrays to the cache read by :func:`~embers.rf_tools.rf_data.read_data`.
+
+    :param tile: tile name :class:`~str`
+    :param time_stamp: start of rf observation in :samp:`YYYY-MM-DD-HH:MM` format :class:`~str`
+    :param data_dir: path to root of data directory :class:`~str`
+    :param cache_dir: path to cache of decoded rf data :class:`~str`
+
+    :returns:
+        decoded arrays saved to :samp:`cache_dir` with :func:`~embers.rf_tools.rf_data.save_rf_cache`
+
+    :raises FileNotFoundError: input file does not exist
+
+    """
+
+    rf_name = f"{tile}_{time_stamp}"
+    date = re.search(r"\d{4}.\d{2}.\d{2}", time_stamp)[0]
+    rf_path = Path(f"{data_dir}/{tile}/{date}/{rf_name}.txt")
+
+    try:
+        power_path, _ = rf_cache_paths(rf_path, cache_dir)
+        if power_path.is_file():
+            return f"Cached rf data {power_path} is up to date"
+
+        read_data(rf_path, cache_dir=cache_dir)
+
+        return f"Cached rf data saved to {power_path}"
+
+    except Exception as e:
+        return e
+
+
+def prune_rf_cache(tile, date, data_dir, cache_dir):
+    """Remove stale cached arrays of a tile for a single day.
+
+    Cached arrays are stale if the rf data file they were decoded from
+    no longer exists, or has been modified since.
+
+    :param tile: tile name :class:`~str`
+    :param date: day of rf observations in :samp:`YYYY-MM-DD` format :class:`~str`
+    :param data_dir: path to root of data directory :class:`~str`
+    :param cache_dir: path to cache of decoded rf data :class:`~str`
+
+    :returns:
+        stale cached arrays removed from :samp:`cache_dir`
+
+    """
+
+    cache_path = Path(f"{cache_dir}/{tile}/{date}")
+
+    pruned = 0
+    for cached in sorted(cache_path.glob(f"{tile}_*.npy")):
+
+        # Cached files are named rf_name_key_[power|times].npy
+        rf_name = cached.stem.rsplit("_", 2)[0]
+        rf_path = Path(f"{data_dir}/{tile}/{date}/{rf_name}.txt")
+
+        if not rf_path.is_file() or cached not in rf_cache_paths(rf_path, cache_dir):
+            cached.unlink()
+            pruned += 1
+
+    # Also remove temporary files left behind by interrupted processes
+    for tmp in cache_path.glob(f"{tile}_*.tmp"):
+        tmp.unlink()
+        pruned += 1
+
+    return f"Pruned {pruned} stale files from {cache_path}"
+
+
+def rf_cache_batch(
+    start_date, stop_date, data_dir, cache_dir, prune=False, max_cores=None
+):
+    """Warm or prune the cache of decoded rf data for all tiles within a date interval.
+
+    :param start_date: date in style YYYY-MM-DD :class:`~str`
+    :param stop_date: date in style YYYY-MM-DD :class:`~str`
+    :param data_dir: path to root of rf data dir :class:`~str`
+    :param cache_dir: path to cache of decoded rf data :class:`~str`
+    :param prune: remove stale cached arrays with :func:`~embers.rf_tools.rf_data.prune_rf_cache` instead of warming the cache. Default=False :class:`~bool`
+    :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+
+    """
+
+    dates, time_stamps = time_tree(start_date, stop_date)
 
-            for result in results:
-                logging.info(result)
+    # Prune a day of each tile at a time, or warm each rf data file
+    if prune:
+        tiles, stamps = zip(*product(tile_names(), dates))
+        func = prune_rf_cache
+    else:
+        tiles, stamps = zip(*product(tile_names(), sum(time_stamps, [])))
+        func = warm_rf_cache
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+        results = executor.map(
+            func, tiles, stamps, repeat(data_dir), repeat(cache_dir), chunksize=16
+        )
+
+    for result in results:
+        logging.info(result)
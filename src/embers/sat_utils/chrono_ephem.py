@@ -7,9 +7,11 @@ and determine all ephemeris present in 30 minute observation windows.
 
 """
 
+import concurrent.futures
 import json
 import math
 from datetime import datetime, timedelta
+from itertools import repeat
 from pathlib import Path
 
 import numpy as np
@@ -97,6 +99,40 @@ def obs_times(time_zone, start_date, stop_date):
     return (obs_time, obs_unix, obs_unix_end)
 
 
+def time_index(times, time):
+    """Index of the sample of a sorted time array nearest to a time.
+
+    The index is found by bisection, rather than by an exact comparison with
+    every sample, so times offset from the samples by rounding errors, or by
+    any fraction of a sample, resolve to the nearest sample.
+
+    .. code-block:: python
+
+        from embers.sat_utils.chrono_ephem import time_index
+        times = np.arange(1570674600, 1570676400, 1.0)
+
+        print(time_index(times, 1570674700.4))
+        >>> 100
+
+    :param times: Sorted time array :class:`~numpy.ndarray`
+    :param time: Time to look up in :samp:`times` :class:`~float`
+
+    :returns:
+        - index: index of the sample of :samp:`times` nearest to :samp:`time` :class:`~int`
+
+    """
+
+    index = np.searchsorted(times, time)
+
+    # Step back to the previous sample, if it is nearer
+    if index == len(times) or (
+        index > 0 and time - times[index - 1] < times[index] - time
+    ):
+        index -= 1
+
+    return int(index)
+
+
 def interp_ephem(t_array, s_alt, s_az, interp_type, interp_freq):
     """Interpolates satellite ephemeris from :mod:`~embers.sat_utils.sat_ephemeris`
 
@@ -159,8 +195,119 @@ def write_json(data, filename=None, out_dir=None):
         json.dump(data, f, indent=4)
 
 
+def write_npz(data, filename=None, out_dir=None):
+    """writes chrono ephem data to a binary npz file in output dir
+
+    The ephemeris of all satellite passes in :samp:`data` is concatenated into
+    :samp:`time_array`, :samp:`sat_alt` and :samp:`sat_az` arrays, with one
+    :samp:`sat_id` per pass and an :samp:`index` marking the start and end of
+    each pass. Times are saved as :samp:`float64` and angles as :samp:`float32`.
+
+    :param data: :class:`~list` of satellite passes, from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem`
+    :param filename: npz filename :class:`~str`
+    :param out_dir: Path to output directory :class:`~str`
+
+    """
+
+    lengths = [len(sat_pass["time_array"]) for sat_pass in data]
+
+    np.savez(
+        f"{out_dir}/{filename}",
+        sat_id=np.array([sat_pass["sat_id"][0] for sat_pass in data], dtype=str),
+        index=np.cumsum([0] + lengths, dtype=np.int64),
+        time_array=np.array(
+            [t for sat_pass in data for t in sat_pass["time_array"]], dtype=np.float64
+        ),
+        sat_alt=np.array(
+            [a for sat_pass in data for a in sat_pass["sat_alt"]], dtype=np.float32
+        ),
+        sat_az=np.array(
+            [a for sat_pass in data for a in sat_pass["sat_az"]], dtype=np.float32
+        ),
+    )
+
+
+def chrono_path(chrono_dir, timestamp):
+    """Path to the chrono ephem file of a 30 minute observation.
+
+    Binary :samp:`npz` chrono ephem files are preferred to :samp:`json` files, if both exist.
+    :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` removes files of the other
+    format, so only files of its latest run are found.
+
+    :param chrono_dir: Path to directory with chrono ephem files from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
+    :param timestamp: Time at start of 30 minute observation in :samp:`YYYY-MM-DD-HH:MM` format :class:`~str`
+
+    :returns:
+        - chrono_file - path to :samp:`{timestamp}.npz` if it exists, else to :samp:`{timestamp}.json` :class:`~pathlib.Path`
+
+    """
+
+    chrono_file = Path(f"{chrono_dir}/{timestamp}.npz")
+    if chrono_file.is_file():
+        return chrono_file
+
+    return Path(f"{chrono_dir}/{timestamp}.json")
+
+
+def read_chrono(chrono_file):
+    """Read a chrono ephem file, in either :samp:`json` or :samp:`npz` format.
+
+    The format is detected from the contents of the file. Satellite passes of
+    :samp:`npz` files are views of the arrays saved by :func:`~embers.sat_utils.chrono_ephem.write_npz`.
+
+    .. code-block:: python
+
+        from embers.sat_utils.chrono_ephem import chrono_path, read_chrono
+        chrono_ephem = read_chrono(chrono_path("~/embers_out/sat_utils/ephem_chrono", "2019-10-10-02:30"))
+
+        norad_list = [sat_pass["sat_id"][0] for sat_pass in chrono_ephem]
+
+    :param chrono_file: Path to chrono ephem file from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
+
+    :returns:
+        - chrono_ephem - :class:`~list` of satellite passes, each a :class:`~dict` with :samp:`sat_id`, :samp:`time_array`, :samp:`sat_alt` and :samp:`sat_az` keys
+
+    """
+
+    with open(chrono_file, "rb") as f:
+        magic = f.read(2)
+
+    # npz files are zip archives
+    if magic != b"PK":
+        with open(chrono_file) as chrono:
+            return json.load(chrono)
+
+    with np.load(chrono_file) as chrono:
+        sat_id = chrono["sat_id"]
+        index = chrono["index"]
+        time_array = chrono["time_array"]
+        sat_alt = chrono["sat_alt"]
+        sat_az = chrono["sat_az"]
+
+    chrono_ephem = []
+    for i, start, stop in zip(range(len(sat_id)), index[:-1], index[1:]):
+        chrono_ephem.append(
+            {
+                "sat_id": [str(sat_id[i])],
+                "time_array": time_array[start:stop],
+                "sat_alt": sat_alt[start:stop],
+                "sat_az": sat_az[start:stop],
+            }
+        )
+
+    return chrono_ephem
+
+
 def save_chrono_ephem(
-    time_zone, start_date, stop_date, interp_type, interp_freq, ephem_dir, out_dir
+    time_zone,
+    start_date,
+    stop_date,
+    interp_type,
+    interp_freq,
+    ephem_dir,
+    out_dir,
+    max_cores=None,
+    chrono_format="json",
 ):
     """Save 30 minute ephem from all satellites to file.
 
@@ -171,6 +318,17 @@ def save_chrono_ephem(
     from each 30 min observation. This will help in the
     next stage, where we identify all sats in each obs.
 
+    The observations overlapping each pass are found by bisecting the sorted
+    start and end times of all observations. Passes are collected in memory
+    for each observation, and each file is written exactly once.
+
+    With :samp:`chrono_format="npz"`, each observation is saved to a binary
+    :samp:`npz` file by :func:`~embers.sat_utils.chrono_ephem.write_npz`, which is
+    several times smaller and much faster to read than the :samp:`json` file.
+    Files of the other format, from previous runs over the same observations,
+    are removed, so :func:`~embers.sat_utils.chrono_ephem.chrono_path` never
+    finds stale files.
+
     :param time_zone: A :class:`~str` representing a :samp:`pytz` `timezones <https://gist.github.com/heyalexej/8bf688fd67d7199be4a1682b3eec7568>`_.
     :param start_date: in :samp:`YYYY-MM-DD` format :class:`~str`
     :param stop_date: in :samp:`YYYY-MM-DD` format :class:`~str`
@@ -178,18 +336,20 @@ def save_chrono_ephem(
     :param interp_freq: Frequency at which to interpolate, in Hertz. :class:`~int`
     :param ephem_dir: Directory where :samp:`npz` ephemeris files from :func:`~embers.sat_utils.sat_ephemeris.save_ephem` are saved :class:`~str`
     :param out_dir: Path to output directory where chronological ephemeris files will be saved :class:`~str`
+    :param max_cores: Maximum number of cores used to write chrono ephem files. Default=None, which means that all available cores are used
+    :param chrono_format: Format of chrono ephem files, :samp:`json` or :samp:`npz`. Default=json :class:`~str`
 
     """
 
     obs_time, obs_unix, obs_unix_end = obs_times(time_zone, start_date, stop_date)
+    obs_unix = np.asarray(obs_unix)
+    obs_unix_end = np.asarray(obs_unix_end)
 
     # creates output dir, if it doesn't exist
     Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-    # Lets make the a json file for each 30 min observation, with an empty list
-    data = []
-    for i in range(len(obs_time)):
-        write_json(data, filename=f"{obs_time[i]}.json", out_dir=out_dir)
+    # Satellite passes within each 30 min observation
+    chrono_ephem = [[] for _ in obs_time]
 
     # Finds all sat ephem json files, and loops over them
     for ephem_npz in list(Path(ephem_dir).glob("*.npz")):
@@ -216,78 +376,61 @@ def save_chrono_ephem(
                     interp_freq,
                 )
 
-                # Find which sat passes are within a 30 minute obs
-                for obs_int in range(len(obs_unix)):
+                # Observations which end after the pass begins,
+                # and begin before the pass ends
+                first = np.searchsorted(obs_unix_end, time_interp[0], side="right")
+                last = np.searchsorted(obs_unix, time_interp[-1], side="left")
 
-                    sat_ephem = {}
-                    sat_ephem["sat_id"] = [s_id]
-                    sat_ephem["time_array"] = []
-                    sat_ephem["sat_alt"] = []
-                    sat_ephem["sat_az"] = []
+                for obs_int in range(first, last):
 
                     # Case I: Satpass occurs completely within the 30min observation
                     if (
                         obs_unix[obs_int] < time_interp[0]
                         and obs_unix_end[obs_int] > time_interp[-1]
                     ):
-
-                        # append the whole pass to the dict
-                        sat_ephem["time_array"].extend(time_interp)
-                        sat_ephem["sat_alt"].extend(sat_alt)
-                        sat_ephem["sat_az"].extend(sat_az)
+                        start_idx, stop_idx = 0, len(time_interp)
 
                     # Case II: Satpass begins before the obs, but ends within it
                     elif (
                         obs_unix[obs_int] > time_interp[0]
-                        and obs_unix[obs_int] < time_interp[-1]
                         and obs_unix_end[obs_int] > time_interp[-1]
                     ):
 
                         # find index of time_interp == obs_unix
-                        start_idx = (
-                            np.where(np.asarray(time_interp) == obs_unix[obs_int])
-                        )[0][0]
-
-                        # append the end of the pass which is within the obs
-                        sat_ephem["time_array"].extend(time_interp[start_idx:])
-                        sat_ephem["sat_alt"].extend(sat_alt[start_idx:])
-                        sat_ephem["sat_az"].extend(sat_az[start_idx:])
+                        start_idx = time_index(time_interp, obs_unix[obs_int])
+                        stop_idx = len(time_interp)
 
                     # Case III: Satpass begins within the obs, but ends after it
                     elif (
-                        obs_unix_end[obs_int] > time_interp[0]
-                        and obs_unix_end[obs_int] < time_interp[-1]
+                        obs_unix_end[obs_int] < time_interp[-1]
                         and obs_unix[obs_int] < time_interp[0]
                     ):
 
                         # find index of time_interp == obs_unix_end
-                        stop_idx = (
-                            np.where(np.asarray(time_interp) == obs_unix_end[obs_int])
-                        )[0][0]
-
-                        # append the end of the pass which is within the obs
-                        sat_ephem["time_array"].extend(time_interp[: stop_idx + 1])
-                        sat_ephem["sat_alt"].extend(sat_alt[: stop_idx + 1])
-                        sat_ephem["sat_az"].extend(sat_az[: stop_idx + 1])
-
-                    # doesn't create json if there are no satellite passes within it
-                    if sat_ephem["time_array"] != []:
-
-                        print(f"Satellite {s_id} in {obs_time[obs_int]}")
+                        start_idx = 0
+                        stop_idx = time_index(time_interp, obs_unix_end[obs_int]) + 1
 
-                        # open the relevant json file and loads contents to 'data_json'
-                        with open(f"{out_dir}/{obs_time[obs_int]}.json") as json_file:
-                            data_json = json.load(json_file)
+                    else:
+                        continue
 
-                            # append new satpass ephem data to data_json
-                            data_json.append(sat_ephem)
+                    print(f"Satellite {s_id} in {obs_time[obs_int]}")
 
-                            # write the combined data back to the original file
-                            write_json(
-                                data_json,
-                                filename=f"{obs_time[obs_int]}.json",
-                                out_dir=out_dir,
-                            )
-
-                            # clear data_json
-                            data_json = []
+                    sat_ephem = {}
+                    sat_ephem["sat_id"] = [s_id]
+                    sat_ephem["time_array"] = time_interp[start_idx:stop_idx]
+                    sat_ephem["sat_alt"] = sat_alt[start_idx:stop_idx]
+                    sat_ephem["sat_az"] = sat_az[start_idx:stop_idx]
+                    chrono_ephem[obs_int].append(sat_ephem)
+
+    # Write a file for each 30 min observation, with no passes if no sats were present
+    write = write_npz if chrono_format == "npz" else write_json
+    filenames = [f"{obs}.{chrono_format}" for obs in obs_time]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+        list(executor.map(write, chrono_ephem, filenames, repeat(out_dir)))
+
+    # Remove files of the other format from previous runs, which would be stale
+    other_format = "json" if chrono_format == "npz" else "npz"
+    for obs in obs_time:
+        stale_file = Path(f"{out_dir}/{obs}.{other_format}")
+        if stale_file.is_file():
+            stale_file.unlink()
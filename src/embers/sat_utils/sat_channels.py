@@ -16,7 +16,9 @@ from pathlib import Path
 import matplotlib as mpl
 import numpy as np
 from embers.rf_tools.colormaps import spectral
+from embers.rf_tools.manifest import read_manifest, record_outputs, up_to_date
 from embers.rf_tools.rf_data import time_tree
+from embers.sat_utils.chrono_ephem import chrono_path, read_chrono, time_index
 from matplotlib import pylab as pl
 from matplotlib import pyplot as plt
 from scipy.stats import median_absolute_deviation as mad
@@ -89,7 +91,9 @@ def time_filter(s_rise, s_set, times):
     Isolate the portion of a rf power array where a satellite is above the
     horizon using the rise and set times of a satellite's ephemeris. This
     function returns a pair of indices which can be used to slice the rf
-    power and times arrays to precisely only include the satellite.
+    power and times arrays to precisely only include the satellite. Rise and
+    set times are resolved to the nearest sample of :samp:`times`, with
+    :func:`~embers.sat_utils.chrono_ephem.time_index`.
 
     :param s_rise: satellite rise time from ephemeris :class:`~float`
     :param s_set: satellite set time from ephemeris :class:`~float`
@@ -103,27 +107,19 @@ def time_filter(s_rise, s_set, times):
 
     # I. sat rises before times, sets within times window
     if s_rise < times[0] and s_set > times[0] and s_set <= times[-1]:
-        i_0 = np.where(times == times[0])[0][0]
-        i_1 = np.where(times == s_set)[0][0]
-        intvl = [i_0, i_1]
+        intvl = [0, time_index(times, s_set)]
 
     # II. sat rises and sets within times
     elif s_rise >= times[0] and s_set <= times[-1]:
-        i_0 = np.where(times == s_rise)[0][0]
-        i_1 = np.where(times == s_set)[0][0]
-        intvl = [i_0, i_1]
+        intvl = [time_index(times, s_rise), time_index(times, s_set)]
 
     # III. sat rises within times, and sets after
     elif s_rise >= times[0] and s_rise < times[-1] and s_set > times[-1]:
-        i_0 = np.where(times == s_rise)[0][0]
-        i_1 = np.where(times == times[-1])[0][0]
-        intvl = [i_0, i_1]
+        intvl = [time_index(times, s_rise), len(times) - 1]
 
     # IV. sat rises before times and sets after
     elif s_rise < times[0] and s_set > times[-1]:
-        i_0 = np.where(times == times[0])[0][0]
-        i_1 = np.where(times == times[-1])[0][0]
-        intvl = [i_0, i_1]
+        intvl = [0, len(times) - 1]
 
     # V. sat completely out of times. Could be on either side
     else:
@@ -258,7 +254,7 @@ def plt_sats(ids, chrono_file, timestamp):
     """Polar plot of satellite passes in a 30 minute observation
 
     :param ids: :class:`~list` of Norad catalogue IDs
-    :param chrono_file: path to chrono ephemeris json file :class:`~str`
+    :param chrono_file: path to chrono ephemeris file :class:`~str`
     :param timestamp: Time at start of 30 minute observation in :samp:`YYYY-MM-DD-HH:MM` format :class:`~str`
 
     :returns:
@@ -279,8 +275,7 @@ def plt_sats(ids, chrono_file, timestamp):
 
     colors = pl.cm.Spectral(np.linspace(0.17, 0.9, len(ids)))
 
-    with open(chrono_file) as chrono:
-        chrono_ephem = json.load(chrono)
+    chrono_ephem = read_chrono(chrono_file)
 
     norad_list = [chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))]
 
@@ -311,6 +306,112 @@ def plt_sats(ids, chrono_file, timestamp):
     return plt
 
 
+def window_data(ali_file, chrono_ephem, sat_thresh, noi_thresh):
+    """Read and reduce the data of a 30 minute observation, shared by all satellites within it.
+
+    .. code-block:: python
+
+        from embers.sat_utils.chrono_ephem import read_chrono
+        from embers.sat_utils.sat_channels import window_data
+
+        ali_file = "~/embers_out/rf0XX_S06XX_2019-10-10-02:30_aligned.npz"
+        chrono_ephem = read_chrono("~/embers_out/2019-10-10-02:30.json")
+        window = window_data(ali_file, chrono_ephem, 1, 3)
+
+    :param ali_file: Path to a :samp:`npz` aligned file from :func:`~embers.rf_tools.align_data.save_aligned` :class:`~str`
+    :param chrono_ephem: Chrono ephemeris of the observation, from :func:`~embers.sat_utils.chrono_ephem.read_chrono` :class:`~list`
+    :param sat_thresh: Satellite threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
+    :param noi_thresh: Noise threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
+
+    :returns:
+        A :class:`~tuple` (power, times, p_med, noise_threshold, norad_ephem)
+
+        - power: reference power array :class:`~numpy.ndarry`
+        - times: time array :class:`~numpy.ndarry`
+        - p_med: median of :samp:`power` :class:`~float`
+        - noise_threshold: noise floor of :samp:`power`, from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~float`
+        - norad_ephem: ephemeris of the first pass of each satellite in :samp:`chrono_ephem`, by Norad catalogue ID :class:`~dict`
+
+    """
+
+    power, _, times = read_aligned(ali_file=ali_file)
+    p_med = np.median(power)
+
+    # Determine noise threshold
+    noise_threshold = noise_floor(sat_thresh, noi_thresh, power)
+
+    # Index of sat_ids in chrono ephem
+    norad_ephem = {}
+    for sat_ephem in chrono_ephem:
+        norad_ephem.setdefault(sat_ephem["sat_id"][0], sat_ephem)
+
+    return (power, np.asarray(times), p_med, noise_threshold, norad_ephem)
+
+
+def channel_scores(
+    power, noise_threshold, p_med, pow_thresh, occ_thresh, head=True, tail=True
+):
+    """Score all channels of a satellite window, as possible channels of the satellite.
+
+    A channel is a possible channel of the satellite if its peak power is :samp:`pow_thresh`
+    above the median power :samp:`p_med`, if at least :samp:`occ_thresh` of the window, but not
+    all of it, is above the :samp:`noise_threshold`, and if the first and last 10 samples of the
+    window are below the :samp:`noise_threshold`, as the satellite rises and sets. All channels
+    are scored at once, with reductions along the time axis of :samp:`power`.
+
+    .. code-block:: python
+
+        from embers.sat_utils.sat_channels import channel_scores
+
+        scores = channel_scores(power[w_start : w_stop + 1], noise_threshold, p_med, 15, 0.8)
+        possible_chans = np.flatnonzero(scores["possible"])
+
+    :param power: Rf power array, sliced to the window in which the satellite is above the horizon :class:`~numpy.ndarry`
+    :param noise_threshold: Noise floor in :samp:`dBm`, from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~float`
+    :param p_med: Median of rf power array :class:`~float`
+    :param pow_thresh: Minimum power threshold in :samp:`dBm` :class:`~float`
+    :param occ_thresh: Window occupation threshold. Minimum fractional signal above the noise floor in window :class:`~float`
+    :param head: If :samp:`True`, the first 10 samples of the window must be below the noise floor :class:`~bool`
+    :param tail: If :samp:`True`, the last 10 samples of the window must be below the noise floor :class:`~bool`
+
+    :returns:
+        - scores: table of :samp:`occupancy`, :samp:`peak` power, :samp:`quiet_head`, :samp:`quiet_tail` and :samp:`possible` fields, with a row for each channel :class:`~numpy.ndarray`
+
+    """
+
+    scores = np.zeros(
+        power.shape[1],
+        dtype=[
+            ("occupancy", np.float64),
+            ("peak", np.float64),
+            ("quiet_head", bool),
+            ("quiet_tail", bool),
+            ("possible", bool),
+        ],
+    )
+
+    # Fraction of window with signal above noise threshold
+    above = np.count_nonzero(power >= noise_threshold, axis=0)
+    scores["occupancy"] = above / len(power)
+    scores["peak"] = np.amax(power, axis=0)
+
+    # first and last 10 data points (10 seconds) are below the noise threshold
+    scores["quiet_head"] = np.all(power[:10] < noise_threshold, axis=0)
+    scores["quiet_tail"] = np.all(power[-11:-1] < noise_threshold, axis=0)
+
+    # Power threshold below which satellites aren't counted
+    # Only count channels with signal for more than occ_thresh of satellite pass
+    scores["possible"] = (
+        (scores["peak"] >= p_med + pow_thresh)
+        & (occ_thresh <= scores["occupancy"])
+        & (scores["occupancy"] < 1.00)
+        & (scores["quiet_head"] | (not head))
+        & (scores["quiet_tail"] | (not tail))
+    )
+
+    return scores
+
+
 def good_chans(
     ali_file,
     chrono_file,
@@ -322,6 +423,7 @@ def good_chans(
     timestamp,
     out_dir,
     plots=None,
+    window=None,
 ):
     """Determine the channels a satellite could occupy, in a 30 minute observation
 
@@ -332,6 +434,10 @@ def good_chans(
     channel passes the three thresholds, the channel with the highest window occupancy is
     selected.
 
+    The aligned data, its median and noise floor, and the chrono ephemeris are the same for
+    all satellites in an observation. They can be computed once with
+    :func:`~embers.sat_utils.sat_channels.window_data` and passed to each call as :samp:`window`.
+
     .. code-block:: python
 
         from embers.sat_utils.sat_channels import good_chans
@@ -363,7 +469,7 @@ def good_chans(
         >>> 59
 
     :param ali_file: Path to a :samp:`npz` aligned file from :func:`~embers.rf_tools.align_data.save_aligned` :class:`~str`
-    :param chrono_file: Path to chrono ephem json file from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
+    :param chrono_file: Path to chrono ephem file from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
     :param sat_id: Norad catalogue ID :class:`~str`
     :param sat_thresh: Satellite threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
     :param noi_thresh: Noise threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
@@ -372,6 +478,7 @@ def good_chans(
     :param timestamp: Time at start of observation in format :samp:`YYYY-MM-DD-HH:MM` :class:`~str`
     :param out_dir: Path to output directory to save plots :class:`~str`
     :param plots: If :samp:`True`, disagnostic plots are generated and saved to :samp:`out_dir`
+    :param window: Data of the observation from :func:`~embers.sat_utils.sat_channels.window_data`. Default=None, which reads :samp:`ali_file` and :samp:`chrono_file`
 
     :returns:
         - good_chan: The channel number of most probable channel for :samp:`sat_id`
@@ -379,187 +486,102 @@ def good_chans(
 
     """
 
-    spec, _ = spectral()
+    # Colormap for waterfall plots, slow to build
+    if plots is True:
+        spec, _ = spectral()
 
-    power, _, times = read_aligned(ali_file=ali_file)
-    p_med = np.median(power)
+    if window is None:
+        window = window_data(ali_file, read_chrono(chrono_file), sat_thresh, noi_thresh)
+    power, times, p_med, noise_threshold, norad_ephem = window
 
-    # Determine noise threshold
-    noise_threshold = noise_floor(sat_thresh, noi_thresh, power)
+    # Extract ephemeris for sat_id
+    sat_ephem = norad_ephem[sat_id]
 
-    with open(chrono_file) as chrono:
-        chrono_ephem = json.load(chrono)
+    rise_ephem = sat_ephem["time_array"][0]
+    set_ephem = sat_ephem["time_array"][-1]
 
-        # All satellites in chrono ephem json file
-        norad_list = [chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))]
+    # indices of times, when sat rose and set
+    intvl = time_filter(rise_ephem, set_ephem, times)
 
-        # Index of sat_id in chrono ephem json file
-        norad_index = norad_list.index(sat_id)
+    # Window start, stop
+    w_start, w_stop = intvl
 
-        # Extract ephemeris for sat_id
-        norad_ephem = chrono_ephem[norad_index]
+    # Slice the power/times arrays to the times of sat pass
+    power_c = power[w_start : w_stop + 1, :]
+    times_c = times[w_start : w_stop + 1]
 
-        rise_ephem = norad_ephem["time_array"][0]
-        set_ephem = norad_ephem["time_array"][-1]
+    # Score all channels at once. Edges of the window which are
+    # also edges of the observation need not be below the noise floor
+    scores = channel_scores(
+        power_c,
+        noise_threshold,
+        p_med,
+        pow_thresh,
+        occ_thresh,
+        head=times[0] != times_c[0],
+        tail=times[0] == times_c[0] or times[-1] != times_c[-1],
+    )
 
-        # indices of times, when sat rose and set
-        intvl = time_filter(rise_ephem, set_ephem, np.asarray(times))
+    # possible identified channels
+    possible_chans = [int(s_chan) for s_chan in np.flatnonzero(scores["possible"])]
+    # window occupancy of possible channels
+    occu_list = list(scores["occupancy"][possible_chans])
 
-        # Window start, stop
-        w_start, w_stop = intvl
-        window_len = w_stop - w_start + 1
+    if plots is True:
+        for s_chan, window_occupancy in zip(possible_chans, occu_list):
+            channel_power = power_c[:, s_chan]
+            plt = plt_channel(
+                times_c,
+                channel_power,
+                p_med,
+                s_chan,
+                [np.amin(channel_power) - 1, np.amax(channel_power) + 1],
+                noise_threshold,
+                pow_thresh + p_med,
+            )
+            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
+            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
+            plt_dir.mkdir(parents=True, exist_ok=True)
+            plt.savefig(
+                f"{plt_dir}/{sat_id}_channel_{s_chan}_{window_occupancy:.2f}.png"
+            )
+            plt.close()
 
-        # Slice the power/times arrays to the times of sat pass
-        power_c = power[w_start : w_stop + 1, :]
-        times_c = times[w_start : w_stop + 1]
+    # If channels are identified in the 30 min obs
+    n_chans = len(possible_chans)
+    if n_chans > 0:
 
-        # possible identified channels
-        possible_chans = []
-        # window occupancy of possible channels
-        occu_list = []
+        # The most probable channel is one with the highest occupation
+        good_chan = possible_chans[occu_list.index(max(occu_list))]
 
-        # Loop over every channel
-        for s_chan in range(len(power_c[0])):
+        if plots is True:
+            plt = plt_window_chans(
+                power,
+                sat_id,
+                w_start,
+                w_stop,
+                spec,
+                chs=possible_chans,
+                good_ch=good_chan,
+            )
+            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
+            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
+            plt_dir.mkdir(parents=True, exist_ok=True)
+            plt.savefig(f"{plt_dir}/{sat_id}_waterfall_{good_chan}.png")
+            plt.close()
 
-            channel_power = power_c[:, s_chan]
+        return good_chan
 
-            # Percentage of signal occupancy above noise threshold
-            window_occupancy = (np.where(channel_power >= noise_threshold))[
-                0
-            ].size / window_len
-
-            # Power threshold below which satellites aren't counted
-            # Only continue if there is signal for more than 80% of satellite pass
-            if (
-                max(channel_power) >= p_med + pow_thresh
-                and occ_thresh <= window_occupancy < 1.00
-            ):
-
-                # If satellite window begins from the start of the observation
-                if times[0] == times_c[0]:
-                    # last 10 data points (10 seconds) are below the noise threshold
-                    if (
-                        all(p < noise_threshold for p in channel_power[-11:-1])
-                    ) is True:
-                        occu_list.append(window_occupancy)
-                        possible_chans.append(s_chan)
-
-                        if plots is True:
-                            plt = plt_channel(
-                                times_c,
-                                channel_power,
-                                p_med,
-                                s_chan,
-                                [
-                                    np.amin(channel_power) - 1,
-                                    np.amax(channel_power) + 1,
-                                ],
-                                noise_threshold,
-                                pow_thresh + p_med,
-                            )
-                            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
-                            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
-                            plt_dir.mkdir(parents=True, exist_ok=True)
-                            plt.savefig(
-                                f"{plt_dir}/{sat_id}_channel_{s_chan}_{window_occupancy:.2f}.png"
-                            )
-                            plt.close()
-
-                # if the satellite window ends and the end of the observation
-                elif times[-1] == times_c[-1]:
-
-                    # first 10 data points (10 seconds) are below the noise threshold
-                    if (all(p < noise_threshold for p in channel_power[:10])) is True:
-                        occu_list.append(window_occupancy)
-                        possible_chans.append(s_chan)
-
-                        if plots is True:
-                            plt = plt_channel(
-                                times_c,
-                                channel_power,
-                                p_med,
-                                s_chan,
-                                [
-                                    np.amin(channel_power) - 1,
-                                    np.amax(channel_power) + 1,
-                                ],
-                                noise_threshold,
-                                pow_thresh + p_med,
-                            )
-                            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
-                            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
-                            plt_dir.mkdir(parents=True, exist_ok=True)
-                            plt.savefig(
-                                f"{plt_dir}/{sat_id}_channel_{s_chan}_{window_occupancy:.2f}.png"
-                            )
-                            plt.close()
-
-                # satellite window completely within the observation
-                else:
-                    # first and last 10 data points (10 seconds) are below the noise threshold
-                    if (
-                        all(p < noise_threshold for p in channel_power[:10])
-                        and all(p < noise_threshold for p in channel_power[-11:-1])
-                    ) is True:
-                        occu_list.append(window_occupancy)
-                        possible_chans.append(s_chan)
-
-                        if plots is True:
-                            plt = plt_channel(
-                                times_c,
-                                channel_power,
-                                p_med,
-                                s_chan,
-                                [
-                                    np.amin(channel_power) - 1,
-                                    np.amax(channel_power) + 1,
-                                ],
-                                noise_threshold,
-                                pow_thresh + p_med,
-                            )
-                            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
-                            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
-                            plt_dir.mkdir(parents=True, exist_ok=True)
-                            plt.savefig(
-                                f"{plt_dir}/{sat_id}_channel_{s_chan}_{window_occupancy:.2f}.png"
-                            )
-                            plt.close()
-
-        # If channels are identified in the 30 min obs
-        n_chans = len(possible_chans)
-        if n_chans > 0:
-
-            # The most probable channel is one with the highest occupation
-            good_chan = possible_chans[occu_list.index(max(occu_list))]
-
-            if plots is True:
-                plt = plt_window_chans(
-                    power,
-                    sat_id,
-                    w_start,
-                    w_stop,
-                    spec,
-                    chs=possible_chans,
-                    good_ch=good_chan,
-                )
-                date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
-                plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
-                plt_dir.mkdir(parents=True, exist_ok=True)
-                plt.savefig(f"{plt_dir}/{sat_id}_waterfall_{good_chan}.png")
-                plt.close()
-
-            return good_chan
-
-        else:
-            if plots is True:
-                plt = plt_window_chans(power, sat_id, w_start, w_stop, spec)
-                date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
-                plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
-                plt_dir.mkdir(parents=True, exist_ok=True)
-                plt.savefig(f"{plt_dir}/{sat_id}_waterfall_window.png")
-                plt.close()
-
-            return None
+    else:
+        if plots is True:
+            plt = plt_window_chans(power, sat_id, w_start, w_stop, spec)
+            date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
+            plt_dir = Path(f"{out_dir}/window_plots/{date}/{timestamp}")
+            plt_dir.mkdir(parents=True, exist_ok=True)
+            plt.savefig(f"{plt_dir}/{sat_id}_waterfall_window.png")
+            plt.close()
+
+        return None
 
 
 def window_chan_map(
@@ -605,7 +627,7 @@ def window_chan_map(
            plots)
 
     :param ali_dir: Path to directory containing :samp:`npz` aligned file from :func:`~embers.rf_tools.align_data.save_aligned` :class:`~str`
-    :param chrono_dir: Path to directory containg chrono ephem json file from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
+    :param chrono_dir: Path to directory containg chrono ephem files from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
     :param sat_thresh: Satellite threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
     :param noi_thresh: Noise threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
     :param pow_thresh: Minimum power threshold in :samp:`dBm` :class:`~float`
@@ -621,45 +643,50 @@ def window_chan_map(
     """
 
     channel_map = {}
+    failed = False
     date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
 
     try:
         ali_files = [i for i in Path(f"{ali_dir}/{date}/{timestamp}").glob("*.npz")]
         if ali_files != []:
             ali_file = ali_files[0]
-            chrono_file = f"{chrono_dir}/{timestamp}.json"
+            chrono_file = chrono_path(chrono_dir, timestamp)
+
+            chrono_ephem = read_chrono(chrono_file)
 
-            with open(chrono_file) as chrono:
-                chrono_ephem = json.load(chrono)
+            if chrono_ephem != []:
 
-                if chrono_ephem != []:
+                # Data shared by all satellites in the observation
+                window = window_data(ali_file, chrono_ephem, sat_thresh, noi_thresh)
 
-                    norad_list = [
-                        chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))
-                    ]
+                norad_list = [
+                    chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))
+                ]
 
-                    if norad_list != []:
+                if norad_list != []:
 
-                        for sat_id in norad_list:
+                    for sat_id in norad_list:
 
-                            sat_chan = good_chans(
-                                ali_file,
-                                chrono_file,
-                                sat_id,
-                                sat_thresh,
-                                noi_thresh,
-                                pow_thresh,
-                                occ_thresh,
-                                timestamp,
-                                out_dir,
-                                plots=plots,
-                            )
+                        sat_chan = good_chans(
+                            ali_file,
+                            chrono_file,
+                            sat_id,
+                            sat_thresh,
+                            noi_thresh,
+                            pow_thresh,
+                            occ_thresh,
+                            timestamp,
+                            out_dir,
+                            plots=plots,
+                            window=window,
+                        )
 
-                            if sat_chan is not None:
-                                channel_map[f"{sat_id}"] = sat_chan
+                        if sat_chan is not None:
+                            channel_map[f"{sat_id}"] = sat_chan
 
     except Exception as e:
         print(e)
+        failed = True
 
     if channel_map != {}:
 
@@ -679,6 +706,38 @@ def window_chan_map(
             f"Saved window channel map of satellites in {timestamp} to {out_dir}/window_maps/{timestamp}"
         )
 
+    # Record the observation as done, unless it failed
+    if not failed:
+        record_outputs(
+            out_dir,
+            *_window_files(ali_dir, chrono_dir, timestamp),
+            _window_params(sat_thresh, noi_thresh, pow_thresh, occ_thresh, plots),
+        )
+
+
+def _window_files(ali_dir, chrono_dir, timestamp):
+    """Channel map of an observation, relative to :samp:`out_dir`, and its aligned and chrono ephem files."""
+
+    date = re.search(r"\d{4}.\d{2}.\d{2}", timestamp)[0]
+
+    outputs = [f"window_maps/{timestamp}.json"]
+    inputs = sorted(Path(f"{ali_dir}/{date}/{timestamp}").glob("*.npz"))
+    inputs.append(chrono_path(chrono_dir, timestamp))
+
+    return (outputs, inputs)
+
+
+def _window_params(sat_thresh, noi_thresh, pow_thresh, occ_thresh, plots):
+    """Parameters of a channel map, recorded in the manifest of channel maps."""
+
+    return {
+        "sat_thresh": sat_thresh,
+        "noi_thresh": noi_thresh,
+        "pow_thresh": pow_thresh,
+        "occ_thresh": occ_thresh,
+        "plots": plots,
+    }
+
 
 def batch_window_map(
     start_date,
@@ -692,6 +751,7 @@ def batch_window_map(
     out_dir,
     plots=None,
     max_cores=None,
+    resume=False,
 ):
     """Find satellite channels for all rfobservations in a date interval
 
@@ -729,7 +789,7 @@ def batch_window_map(
     :param start_date: In format :samp:`YYYY-MM-DD` :class:`~str`
     :param stop_date: In format :samp:`YYYY-MM-DD` :class:`~str`
     :param ali_dir: Path to directory containing :samp:`npz` aligned file from :func:`~embers.rf_tools.align_data.save_aligned` :class:`~str`
-    :param chrono_dir: Path to directory containg chrono ephem json file from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
+    :param chrono_dir: Path to directory containg chrono ephem files from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem` :class:`~str`
     :param sat_thresh: Satellite threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
     :param noi_thresh: Noise threshold from :func:`~embers.sat_utils.sat_channels.noise_floor` :class:`~int`
     :param pow_thresh: Minimum power threshold in :samp:`dBm` :class:`~float`
@@ -737,6 +797,7 @@ def batch_window_map(
     :param out_dir: Path to output directory to save plots :class:`~str`
     :param plots: If :samp:`True`, disagnostic plots are generated and saved to :samp:`out_dir`
     :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+    :param resume: If :samp:`True`, skip observations whose channel maps are up to date in the manifest of :samp:`out_dir`, from :func:`~embers.rf_tools.manifest.up_to_date`. Default=False :class:`~bool`
 
     :returns:
         - :samp:`window_chan_map` json file saved to :samp:`out_dir/window_maps/.json`
@@ -747,6 +808,22 @@ def batch_window_map(
     _, time_stamps = time_tree(start_date, stop_date)
     timestamps = [timestamp for t_list in time_stamps for timestamp in t_list]
 
+    if resume:
+        manifest = read_manifest(out_dir)
+        params = _window_params(sat_thresh, noi_thresh, pow_thresh, occ_thresh, plots)
+        n_timestamps = len(timestamps)
+        timestamps = [
+            timestamp
+            for timestamp in timestamps
+            if not up_to_date(
+                manifest,
+                out_dir,
+                *_window_files(ali_dir, chrono_dir, timestamp),
+                params,
+            )
+        ]
+        print(f"Skipping {n_timestamps - len(timestamps)} up to date channel maps")
+
     # Parallization magic happens here
     with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
         executor.map(
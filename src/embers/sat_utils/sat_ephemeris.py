@@ -16,8 +16,14 @@ import matplotlib as mpl
 import numpy as np
 import skyfield as sf
 from astropy.time import Time
+from embers.rf_tools.manifest import read_manifest, record_outputs, up_to_date
 from matplotlib import pyplot as plt
+from sgp4.api import jday
 from skyfield.api import Topos, load
+from skyfield.constants import AU_KM
+from skyfield.functions import rot_y, rot_z, to_spherical
+from skyfield.sgp4lib import theta_GMST1982
+from skyfield.units import Angle
 
 mpl.use("Agg")
 
@@ -201,31 +207,247 @@ def sat_pass(sats, t_arr, index_epoch, location=None):
     alt, az, _ = orbit.altaz()
 
     if alt.degrees.shape[0] > 0:
+        passes = _pass_indices(alt.degrees)
 
-        # Check if sat is above the horizon (above -1 degrees), return boolean array
-        above_horizon = alt.degrees >= -1
+        return (passes, alt, az)
 
-        # Indicies of rare times that sats are above the horizon
-        (indicies,) = above_horizon.nonzero()
+    else:
+        return None
 
-        # Boundary times at which the sat either rises or sets
-        (boundaries,) = np.diff(above_horizon).nonzero()
 
-        if above_horizon[0]:
-            boundaries = [indicies[0]] + list(boundaries)
-            boundaries = np.asarray(boundaries)
+def _pass_indices(alt_degrees):
+    """Pairs of indices of an altitude array at which a satellite rises and sets."""
 
-        if above_horizon[-1]:
-            boundaries = list(boundaries) + [indicies[-1]]
-            boundaries = np.asarray(boundaries)
+    # Check if sat is above the horizon (above -1 degrees), return boolean array
+    above_horizon = alt_degrees >= -1
 
-        # Reshape into pairs rise & set indicies
-        passes = boundaries.reshape(len(boundaries) // 2, 2)
+    # Indicies of rare times that sats are above the horizon
+    (indicies,) = above_horizon.nonzero()
 
-        return (passes, alt, az)
+    # Boundary times at which the sat either rises or sets
+    (boundaries,) = np.diff(above_horizon).nonzero()
+
+    if above_horizon[0]:
+        boundaries = [indicies[0]] + list(boundaries)
+        boundaries = np.asarray(boundaries)
+
+    if above_horizon[-1]:
+        boundaries = list(boundaries) + [indicies[-1]]
+        boundaries = np.asarray(boundaries)
+
+    # Reshape into pairs rise & set indicies
+    return boundaries.reshape(len(boundaries) // 2, 2)
+
+
+def epoch_time_arrays(epoch_range, cadence=None):
+    """Create a single time array spanning all time intervals in :samp:`epoch_range`.
+
+    The time array of each interval is identical to that of
+    :func:`~embers.sat_utils.sat_ephemeris.epoch_time_array`, but the time arrays of
+    all intervals are concatenated into a single Skyfield :class:`~skyfield.timelib.Time`
+    object, with all time conversions done in bulk.
+
+    .. code-block:: python
+
+        from embers.sat_utils.sat_ephemeris import load_tle, epoch_ranges, epoch_time_arrays
+        sats, epochs = load_tle('~/embers-data/TLE/21576.txt')
+        epoch_range = epoch_ranges(epochs)
+
+        t_arr, index = epoch_time_arrays(epoch_range, cadence=10)
+
+        # Times of the first interval
+        t_0 = t_arr[index[0] : index[1]]
+
+    :param epoch_range: List of time intervals where an epoch is most accurate, from :func:`embers.sat_utils.sat_ephemeris.epoch_ranges`
+    :param cadence: Time cadence at which to evaluate sat position, in seconds :class:`~int`
+
+    :returns:
+        A :class:`~tuple` of (t_arr, index)
+
+        - t_arr: Skyfield :class:`~skyfield.timelib.Time` object with times of all intervals
+        - index: start and end of each interval in :samp:`t_arr` :class:`~numpy.ndarray`
+
+    """
 
+    # Skyfield Timescale
+    ts = load.timescale(builtin=True)
+
+    # find time between epochs/ midpoints in seconds, using Astropy Time
+    epochs = Time(epoch_range, scale="tt", format="jd")
+    durations = np.round(np.diff(epochs.gps))
+
+    # Calendar date of each epoch, truncated to the minute
+    calendar = []
+    for iso in epochs[:-1].iso:
+        date, time = iso.split()
+        year, month, day = date.split("-")
+        hour, minute, _ = time.split(":")
+        calendar.append([int(year), int(month), int(day), int(hour), int(minute)])
+
+    seconds = [np.arange(0, dt, cadence) for dt in durations]
+    counts = [len(sec) for sec in seconds]
+    index = np.concatenate([[0], np.cumsum(counts)]).astype(int)
+
+    calendar = np.repeat(np.asarray(calendar, dtype=int).reshape(-1, 5), counts, axis=0)
+    t_arr = ts.tt(*calendar.T, np.concatenate(seconds + [np.zeros(0)]))
+
+    return (t_arr, index)
+
+
+def sat_altaz(sats, t_arr, index, location=None, rows=None):
+    """Calculate the :samp:`Altitude` & :samp:`Azimuth` of a satellite over many epochs at once.
+
+    Each satellite in :samp:`sats` is propagated with the array interface of
+    :mod:`sgp4` over the times of its own interval of :samp:`t_arr`,
+    from :func:`~embers.sat_utils.sat_ephemeris.epoch_time_arrays`. Positions
+    are then rotated to the alt-az frame at :samp:`location` in bulk. Skyfield
+    computes alt-az by rotating positions from the Earth fixed frame to the
+    celestial frame, and back to the horizon at :samp:`location`, so the
+    rotation of the Earth cancels out and is skipped here. Only public Skyfield
+    time attributes are used, and the results match
+    :func:`~embers.sat_utils.sat_ephemeris.sat_pass` to within floating point precision,
+    or to within an arcsecond with older versions of Skyfield, which round times to a
+    single Julian date.
+
+    .. code-block:: python
+
+        from embers.sat_utils.sat_ephemeris import load_tle, epoch_ranges, epoch_time_arrays, sat_altaz
+        sats, epochs = load_tle('~/embers-data/TLE/21576.txt')
+        epoch_range = epoch_ranges(epochs)
+        t_arr, index = epoch_time_arrays(epoch_range, cadence=10)
+        MWA = (-26.703319, 116.670815, 337.83)   # gps coordinates of MWA Telescope
+
+        alt, az = sat_altaz(sats, t_arr, index, location=MWA)
+
+    :param sats: list of :class:`~skyfield.sgp4lib.EarthSatellite` objects
+    :param t_arr: skyfield :class:`~skyfield.timelib.Time` object with times of all intervals
+    :param index: start and end of each interval in :samp:`t_arr` :class:`~numpy.ndarray`
+    :param location: The :samp:`gps` coordinates of the :samp:`location` at which satellite passes are to be computed. :samp:`location` is a :class:`~tuple` in the format (:samp:`latitude`, :samp:`longitude`, :samp:`elevation`), with :samp:`elevation` given in :samp:`meters`
+    :param rows: sorted indices of :samp:`t_arr` at which to evaluate the sat position. Default=None, which evaluates all times :class:`~numpy.ndarray`
+
+    :returns:
+        A :class:`~tuple` of (alt, az)
+
+        - alt: :samp:`Altitudes` of sat at :samp:`t_arr` times, or at :samp:`rows` :class:`~skyfield.units.Angle`
+        - az: :samp:`Azimuths` of sat at :samp:`t_arr` times, or at :samp:`rows` :class:`~skyfield.units.Angle`
+
+    """
+
+    # Position where sat passes are to be determined in Lat/Lon/Elevation
+    position = Topos(
+        latitude=location[0], longitude=location[1], elevation_m=location[2]
+    )
+
+    # Times at selected rows, without converting all times to other time scales
+    if rows is None:
+        bounds = index
     else:
-        return None
+        t_arr = t_arr[rows]
+        bounds = np.searchsorted(rows, index)
+
+    # Position of each sat in its interval, in the TEME frame of SGP4,
+    # which takes UTC Julian dates like Skyfield
+    jd, fr = jday(*t_arr.utc)
+    r_teme = np.empty((3, jd.size))
+    for i in range(len(bounds) - 1):
+        interval = slice(bounds[i], bounds[i + 1])
+        if bounds[i + 1] > bounds[i]:
+            _, r, _ = sats[i].model.sgp4_array(jd[interval], fr[interval])
+            r_teme[:, interval] = r.T / AU_KM
+
+    # Rotate to the Earth fixed frame, ignoring polar motion like Skyfield
+    theta, _ = theta_GMST1982(t_arr.ut1)
+    cos, sin = np.cos(theta), np.sin(theta)
+    r_itrf = np.array(
+        [
+            cos * r_teme[0] + sin * r_teme[1],
+            -sin * r_teme[0] + cos * r_teme[1],
+            r_teme[2],
+        ]
+    )
+
+    # Rotate from the Earth fixed frame to the horizon at location
+    rotation = rot_y(position.latitude.radians)[::-1] @ rot_z(
+        -position.longitude.radians
+    )
+    r_topo = rotation @ (r_itrf - position.itrf_xyz().au[:, np.newaxis])
+    _, alt, az = to_spherical(r_topo)
+
+    return (Angle(radians=alt), Angle(radians=az))
+
+
+def find_passes(sats, t_arr, index, location=None, cadence=None, step=60):
+    """Find satellite passes with a coarse scan, refined to the :samp:`cadence` of :samp:`t_arr`.
+
+    Low Earth orbit satellites are only above the horizon for a small fraction of the time, so
+    evaluating their position at every time of :samp:`t_arr` is mostly wasted. Instead, the
+    position of the satellite is evaluated every :samp:`step` seconds, to bracket the times at which
+    it rises and sets. The rise and set times within each bracket are then found by bisection on
+    the times of :samp:`t_arr`, so the passes found are identical to those of
+    :func:`~embers.sat_utils.sat_ephemeris.sat_pass`, as long as no pass is shorter than :samp:`step`.
+
+    .. code-block:: python
+
+        from embers.sat_utils.sat_ephemeris import load_tle, epoch_ranges, epoch_time_arrays, find_passes
+        sats, epochs = load_tle('~/embers-data/TLE/21576.txt')
+        epoch_range = epoch_ranges(epochs)
+        t_arr, index = epoch_time_arrays(epoch_range, cadence=4)
+        MWA = (-26.703319, 116.670815, 337.83)   # gps coordinates of MWA Telescope
+
+        passes = find_passes(sats, t_arr, index, location=MWA, cadence=4, step=60)
+
+    :param sats: list of :class:`~skyfield.sgp4lib.EarthSatellite` objects
+    :param t_arr: skyfield :class:`~skyfield.timelib.Time` object with times of all intervals
+    :param index: start and end of each interval in :samp:`t_arr` :class:`~numpy.ndarray`
+    :param location: The :samp:`gps` coordinates of the :samp:`location` at which satellite passes are to be computed. :samp:`location` is a :class:`~tuple` in the format (:samp:`latitude`, :samp:`longitude`, :samp:`elevation`), with :samp:`elevation` given in :samp:`meters`
+    :param cadence: Time cadence of :samp:`t_arr`, in seconds :class:`~int`
+    :param step: Time step of the coarse scan, in seconds. Default=60 :class:`~int`
+
+    :returns:
+        - passes: 2D array with pairs of indicies of :samp:`t_arr` corresponding to rise/set of satellite :class:`~numpy.ndarray`
+
+    """
+
+    stride = max(1, int(round(step / cadence)))
+
+    # Coarse rows of each interval, including the first and last
+    coarse = [np.zeros(0, dtype=int)]
+    for i in range(len(index) - 1):
+        if index[i + 1] > index[i]:
+            rows = np.arange(index[i], index[i + 1], stride)
+            coarse.append(np.unique(np.append(rows, index[i + 1] - 1)))
+    coarse = np.concatenate(coarse)
+
+    if coarse.size == 0:
+        return np.zeros((0, 2), dtype=int)
+
+    alt, _ = sat_altaz(sats, t_arr, index, location=location, rows=coarse)
+    above = alt.degrees >= -1
+
+    # Brackets of successive coarse rows of an interval, where the sat rises or sets
+    interval = np.searchsorted(index, coarse, side="right") - 1
+    crossing = (interval[1:] == interval[:-1]) & (above[1:] != above[:-1])
+    lo = coarse[:-1][crossing]
+    hi = coarse[1:][crossing]
+    above_lo = above[:-1][crossing]
+
+    # Bisect brackets until the last row before each rise or set is found
+    while np.any(hi - lo > 1):
+        wide = hi - lo > 1
+        mid = (lo[wide] + hi[wide]) // 2
+        alt_mid, _ = sat_altaz(sats, t_arr, index, location=location, rows=mid)
+        before = (alt_mid.degrees >= -1) == above_lo[wide]
+        lo[wide] = np.where(before, mid, lo[wide])
+        hi[wide] = np.where(before, hi[wide], mid)
+
+    # Intervals which start or end with the sat above the horizon
+    first = np.diff(np.append(-1, interval)) != 0
+    last = np.diff(np.append(interval, -1)) != 0
+    boundaries = np.concatenate([lo, coarse[first & above], coarse[last & above]])
+
+    # Reshape into pairs rise & set indicies
+    boundaries = np.sort(boundaries)
+    return boundaries.reshape(len(boundaries) // 2, 2)
 
 
 def ephem_data(t_arr, pass_index, alt, az):
@@ -300,7 +522,7 @@ def sat_plot(sat_id, alt, az, alpha=0.5):
     return plt
 
 
-def save_ephem(sat, tle_dir, cadence, location, alpha, out_dir):
+def save_ephem(sat, tle_dir, cadence, location, alpha, out_dir, coarse_step=None):
     """Save ephemeris of all satellite passes and plot sky coverage.
 
     This function brings everything in :mod:`~embers.sat_utils.sat_ephemeris` home.
@@ -311,6 +533,13 @@ def save_ephem(sat, tle_dir, cadence, location, alpha, out_dir):
     of all satellite passes detected within the :samp:`TLE` file is also saved
     to the :samp:`out_dir`.
 
+    Rather than propagating each epoch separately, blocks of epochs are propagated at
+    once with :func:`~embers.sat_utils.sat_ephemeris.epoch_time_arrays` and
+    :func:`~embers.sat_utils.sat_ephemeris.sat_altaz`, finding the same passes as
+    :func:`~embers.sat_utils.sat_ephemeris.sat_pass`. If :samp:`coarse_step` is given,
+    passes are instead found with :func:`~embers.sat_utils.sat_ephemeris.find_passes`,
+    and the sat position is only evaluated at the :samp:`cadence` within passes.
+
     .. code-block:: python
 
         from embers.sat_utils.sat_ephemeris import save_ephem
@@ -333,6 +562,7 @@ def save_ephem(sat, tle_dir, cadence, location, alpha, out_dir):
     :param location: The :samp:`gps` coordinates of the :samp:`location` at which satellite passes are to be computed. :samp:`location` is a :class:`~tuple` in the format (:samp:`latitude`, :samp:`longitude`, :samp:`elevation`), with :samp:`elevation` given in :samp:`meters`
     :param alpha: transparency of individual passes in :func:`~embers.sat_utils.sat_ephemeris.sat_plot` default=0.5
     :param out_dir: path to output directory :class:`~str`
+    :param coarse_step: Time step of the coarse scan of :func:`~embers.sat_utils.sat_ephemeris.find_passes`, in seconds. Default=None, which scans at the :samp:`cadence` :class:`~int`
 
     :returns:
         - satellite ephemeris at :samp:`location` and sky coverage ephemeris plot, saved to :samp:`out_dir`
@@ -362,37 +592,112 @@ def save_ephem(sat, tle_dir, cadence, location, alpha, out_dir):
         sats, epochs = load_tle(tle_path)
         epoch_range = epoch_ranges(epochs)
 
-        for i in range(len(epoch_range) - 1):
-            t_arr, index_epoch = epoch_time_array(
-                epoch_range, index_epoch=i, cadence=cadence
+        # Propagate blocks of epochs at once, limiting memory used by long TLE files
+        for start in range(0, len(epoch_range) - 1, 32):
+            stop = min(start + 32, len(epoch_range) - 1)
+            t_arr, index = epoch_time_arrays(
+                epoch_range[start : stop + 1], cadence=cadence
             )
 
-            try:
-                passes, alt, az = sat_pass(sats, t_arr, index_epoch, location=location)
-
-                for pass_index in passes:
-                    time_array, sat_alt, sat_az = ephem_data(t_arr, pass_index, alt, az)
-
-                    sat_ephem["time_array"].append(time_array)
-                    sat_ephem["sat_alt"].append(sat_alt)
-                    sat_ephem["sat_az"].append(sat_az)
-
-            # Catch exceptions in sat_pass
-            # sometimes sat_object is empty and can't be iterated over
-            except Exception:
-                pass
+            passes = []
+            if coarse_step is None:
+                alt, az = sat_altaz(sats[start:stop], t_arr, index, location=location)
+                for i in range(stop - start):
+
+                    # Skip empty intervals between duplicate epochs
+                    if index[i + 1] == index[i]:
+                        continue
+
+                    for first, last in _pass_indices(
+                        alt.degrees[index[i] : index[i + 1]]
+                    ):
+                        passes.append(np.arange(index[i] + first, index[i] + last + 1))
+            else:
+                for first, last in find_passes(
+                    sats[start:stop],
+                    t_arr,
+                    index,
+                    location=location,
+                    cadence=cadence,
+                    step=coarse_step,
+                ):
+                    passes.append(np.arange(first, last + 1))
+
+            if passes == []:
+                continue
+
+            rows = np.concatenate(passes)
+            if coarse_step is None:
+                sat_alt = alt.degrees[rows]
+                sat_az = az.radians[rows]
+            else:
+                # Evaluate the sat position at the cadence only within passes
+                alt, az = sat_altaz(
+                    sats[start:stop], t_arr, index, location=location, rows=rows
+                )
+                sat_alt = alt.degrees
+                sat_az = az.radians
+
+            # Convert times of all passes to unix time at once,
+            # to match the rf explorer timestamps
+            unix = Time(t_arr.tt[rows], scale="tt", format="jd").unix
+            splits = np.cumsum([len(p) for p in passes])[:-1]
+
+            sat_ephem["time_array"].extend(np.split(unix, splits))
+            sat_ephem["sat_alt"].extend(np.split(sat_alt, splits))
+            sat_ephem["sat_az"].extend(np.split(sat_az, splits))
 
         plt = sat_plot(sat, sat_ephem["sat_alt"], sat_ephem["sat_az"], alpha=alpha)
         plt.savefig(f"{out_dir}/ephem_plots/{sat}.png")
         plt.close()
         np.savez_compressed(f"{out_dir}/ephem_data/{sat}.npz", **sat_ephem)
+        record_outputs(
+            out_dir,
+            *_ephem_files(sat, tle_dir),
+            _ephem_params(cadence, location, alpha, coarse_step),
+        )
 
         return f"Saved sky coverage plot of satellite [{sat}] to {out_dir}ephem_plots/{sat}.png \nSaved ephemeris of satellite [{sat}] to {out_dir}ephem_data/{sat}.npz"
 
+    record_outputs(
+        out_dir,
+        *_ephem_files(sat, tle_dir),
+        _ephem_params(cadence, location, alpha, coarse_step),
+    )
+
     return f"File {tle_dir}/{sat} is empty, skipping"
 
 
-def ephem_batch(tle_dir, cadence, location, alpha, out_dir, max_cores=None):
+def _ephem_files(sat, tle_dir):
+    """Ephemeris and plot of a satellite, relative to :samp:`out_dir`, and its TLE file."""
+
+    outputs = [f"ephem_data/{sat}.npz", f"ephem_plots/{sat}.png"]
+    inputs = [f"{tle_dir}/{sat}.txt"]
+
+    return (outputs, inputs)
+
+
+def _ephem_params(cadence, location, alpha, coarse_step):
+    """Parameters of satellite ephemeris, recorded in the manifest of ephemeris."""
+
+    return {
+        "cadence": cadence,
+        "location": location,
+        "alpha": alpha,
+        "coarse_step": coarse_step,
+    }
+
+
+def ephem_batch(
+    tle_dir,
+    cadence,
+    location,
+    alpha,
+    out_dir,
+    max_cores=None,
+    resume=False,
+    coarse_step=None,
+):
     """
     Process ephemeris for multiple satellites in parallel.
 
@@ -402,6 +707,8 @@ def ephem_batch(tle_dir, cadence, location, alpha, out_dir, max_cores=None):
     :param alpha: Transparency of individual passes in :func:`~embers.sat_utils.sat_ephemeris.sat_plot` default=0.5
     :param out_dir: Path to output directory :class:`~str`
     :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+    :param resume: If :samp:`True`, skip satellites whose ephemeris is up to date in the manifest of :samp:`out_dir`, from :func:`~embers.rf_tools.manifest.up_to_date`. Default=False :class:`~bool`
+    :param coarse_step: Time step of the coarse scan of :func:`~embers.sat_utils.sat_ephemeris.find_passes`, in seconds. Default=None, which scans at the :samp:`cadence` :class:`~int`
 
     :returns:
         - satellite ephemeris at :samp:`location` and sky coverage ephemeris plot, saved to :samp:`out_dir`
@@ -418,6 +725,17 @@ def ephem_batch(tle_dir, cadence, location, alpha, out_dir, max_cores=None):
     )
     sat_names = [tle.stem for tle in Path(tle_dir).glob("*.txt")]
 
+    if resume:
+        manifest = read_manifest(out_dir)
+        params = _ephem_params(cadence, location, alpha, coarse_step)
+        n_sats = len(sat_names)
+        sat_names = [
+            sat
+            for sat in sat_names
+            if not up_to_date(manifest, out_dir, *_ephem_files(sat, tle_dir), params)
+        ]
+        logging.info(f"Skipping {n_sats - len(sat_names)} up to date satellites")
+
     with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
         results = executor.map(
             save_ephem,
@@ -427,6 +745,7 @@ def ephem_batch(tle_dir, cadence, location, alpha, out_dir, max_cores=None):
             repeat(location),
             repeat(alpha),
             repeat(out_dir),
+            repeat(coarse_step),
         )
 
     for result in results:
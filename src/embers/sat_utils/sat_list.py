@@ -15,9 +15,10 @@ Includes a method to download TLE orbital parameters from `Space-Track.org <http
 
 """
 
-import time
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from embers.mwa_utils.download import rate_limiter
 from spacetrack import SpaceTrackClient
 
 
@@ -119,6 +120,60 @@ def norad_ids():
     return norad_ids
 
 
+def tle_epoch(line1):
+    """Epoch of a TLE from its first line.
+
+    .. code-block:: python
+
+        from embers.sat_utils.sat_list import tle_epoch
+        epoch = tle_epoch("1 25986U 99065G   19255.49978013 +.00000005 +00000-0 +53080-4 0  9997")
+
+    :param line1: first line of a TLE :class:`~str`
+
+    :returns:
+        - epoch - epoch of TLE in UTC :class:`~datetime.datetime`
+
+    """
+
+    # Two digit years from 57 to 99 are in the 1900s
+    year = int(line1[18:20])
+    year += 1900 if year >= 57 else 2000
+    day = float(line1[20:32])
+
+    return datetime(year, 1, 1) + timedelta(days=day - 1)
+
+
+def read_tle(tle_file):
+    """Read the pairs of lines of each TLE in a TLE file.
+
+    :param tle_file: path to TLE file :class:`~str`
+
+    :returns:
+        - tles - :class:`~list` of (line1, line2) :class:`~tuple` of each TLE, or an empty list if the file does not exist
+
+    """
+
+    if not Path(tle_file).is_file():
+        return []
+
+    with open(tle_file) as f:
+        lines = [line.strip() for line in f if line.strip() != ""]
+
+    return list(zip(lines[0::2], lines[1::2]))
+
+
+def _sat_tles(data):
+    """Group the TLE lines returned by space-track by norad catalogue id."""
+
+    lines = [line.strip() for line in data if line.strip() != ""]
+
+    sat_tles = {}
+    for line1, line2 in zip(lines[0::2], lines[1::2]):
+        sat_tles.setdefault(int(line1[2:7]), []).append((line1, line2))
+
+    return sat_tles
+
+
 def download_tle(
     start_date,
     stop_date,
@@ -128,11 +183,22 @@ def download_tle(
     out_dir=None,
     sleep=20,
     mock=False,
+    incremental=False,
+    batch_size=25,
+    client=None,
 ):
     """Download TLEs from space-track.org.
 
     Download satellite TLEs within a date interval
-    for all sats in :func:`~embers.sat_utils.sat_list.norad_ids`
+    for all sats in :func:`~embers.sat_utils.sat_list.norad_ids`.
+    The TLEs of up to :samp:`batch_size` satellites are requested
+    in a single space-track query, with no more than one query
+    every :samp:`sleep` seconds.
+
+    With :samp:`incremental=True`, TLEs are only requested from the
+    last epoch in each existing TLE file, and TLEs with newer epochs
+    are appended to the file, so that TLE files can be kept up to date
+    by a daily job.
 
     .. code-block:: python
 
@@ -148,7 +214,7 @@ def download_tle(
 
         >>> Starting TLE download
         >>> Grab a coffee, this may take a while
-        >>> downloading tle for ORBCOMM-X satellite [21576] from space-tracks.org
+        >>> downloading tle for 25 satellites [21576, ..., 25117] from space-tracks.org
         >>> ...
 
 
@@ -158,44 +224,86 @@ def download_tle(
     :param st_ident: space-track.org login identity :class:`~str`
     :param st_pass: space-track.org login password :class:`~str`
     :param out_dir: output dir to save TLE files :class:`~str`
-    :param sleep: The amount of time to sleep between downloads. Default is 20 so as not to exceed the space-track download limit
+    :param sleep: Minimum time between downloads. Default is 20 so as not to exceed the space-track download limit
     :param mock: For testing purposes. If True, will use a sample string to write test data to tle file
+    :param incremental: If True, append TLEs newer than the last epoch of each existing TLE file. Default=False
+    :param batch_size: Number of satellites in each space-track query. Default=25 :class:`~int`
+    :param client: Client with the :samp:`tle` method of :class:`~spacetrack.SpaceTrackClient`. Default=None, which logs in to space-track.org with :samp:`st_ident` and :samp:`st_pass`
 
     :return:
         - tle file - saved to output directory
 
     """
 
-    if st_ident is not None and st_pass is not None:
+    if client is None and (st_ident is None or st_pass is None):
+        print(
+            "Space-Track.org credentials not provided. Make an account before downloading TLEs"
+        )
+        return
 
-        st = SpaceTrackClient(identity=st_ident, password=st_pass)
+    if client is None:
+        client = SpaceTrackClient(identity=st_ident, password=st_pass)
 
-        # make a TLE directory
-        Path(out_dir).mkdir(parents=True, exist_ok=True)
+    # make a TLE directory
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-        print("Starting TLE download")
-        print("Grab a coffee, this may take a while")
-        for sat_name, sat_id in norad_ids.items():
-            print(
-                f"downloading tle for {sat_name} satellite [{sat_id}] from space-tracks.org"
-            )
-            if mock is True:
-                data = "Hello!"
-            else:
-                data = st.tle(
-                    iter_lines=True,
-                    norad_cat_id=sat_id,
-                    orderby="epoch asc",
-                    epoch=f"{start_date}--{stop_date}",
-                    format="tle",
-                )
-
-            with open(f"{out_dir}/{sat_id}.txt", "w") as fp:
-                for line in data:
-                    fp.write(line + "\n")
-            # Sleep to limit downloads to 200 TLEs per hour
-            time.sleep(sleep)
-    else:
+    # Limit downloads to 200 TLEs per hour
+    acquire = rate_limiter(1 / sleep if sleep else None)
+
+    sat_ids = list(norad_ids.values())
+
+    print("Starting TLE download")
+    print("Grab a coffee, this may take a while")
+    for i in range(0, len(sat_ids), batch_size):
+        batch = sat_ids[i : i + batch_size]
+
+        # Last epoch of TLEs already downloaded
+        last_epochs = {}
+        if incremental is True:
+            for sat_id in batch:
+                tles = read_tle(f"{out_dir}/{sat_id}.txt")
+                if tles != []:
+                    last_epochs[sat_id] = max(tle_epoch(line1) for line1, _ in tles)
+
+        # Request TLEs from the earliest last epoch of the batch
+        start = start_date
+        if len(last_epochs) == len(batch):
+            start = max(start_date, min(last_epochs.values()).strftime("%Y-%m-%d"))
+
+        acquire()
         print(
-            "Space-Track.org credentials not provided. Make an account before downloading TLEs"
+            f"downloading tle for {len(batch)} satellites {batch} from space-tracks.org"
         )
+        if mock is True:
+            sat_tles = {sat_id: [("Hello!", "")] for sat_id in batch}
+        else:
+            data = client.tle(
+                iter_lines=True,
+                norad_cat_id=batch,
+                orderby="epoch asc",
+                epoch=f"{start}--{stop_date}",
+                format="tle",
+            )
+            sat_tles = _sat_tles(data)
+
+        for sat_id in batch:
+            tles = sat_tles.get(sat_id, [])
+
+            if sat_id in last_epochs:
+
+                # Only append TLEs newer than those in the file, once per epoch
+                epochs = set()
+                new_tles = []
+                for line1, line2 in tles:
+                    epoch = tle_epoch(line1)
+                    if epoch > last_epochs[sat_id] and epoch not in epochs:
+                        epochs.add(epoch)
+                        new_tles.append((line1, line2))
+
+                with open(f"{out_dir}/{sat_id}.txt", "a") as fp:
+                    for line1, line2 in new_tles:
+                        fp.write(f"{line1}\n{line2}\n")
+            else:
+                with open(f"{out_dir}/{sat_id}.txt", "w") as fp:
+                    for line1, line2 in tles:
+                        fp.write(f"{line1}\n{line2}\n")
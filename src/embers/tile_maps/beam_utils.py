@@ -9,11 +9,11 @@ A set of tools used to create and visualize tile maps
 import healpy as hp
 import matplotlib
 import numpy as np
+from embers.tile_maps.map_stats import ragged_stats
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from numpy.polynomial import polynomial as poly
 from scipy import optimize as opt
 from scipy.stats import chisquare
-from scipy.stats import median_absolute_deviation as mad
 
 matplotlib.use("Agg")
 
@@ -150,16 +150,7 @@ def nan_mad(good_ref_map):
 
     """
 
-    ref_map_mad = []
-    for j in good_ref_map:
-        if j != []:
-            j = np.asarray(j)
-            j = j[~np.isnan(j)]
-            ref_map_mad.append(mad(j))
-        else:
-            ref_map_mad.append(np.nan)
-
-    ref_map_mad = np.asarray(ref_map_mad)
+    ref_map_mad = ragged_stats(good_ref_map)["mad"]
     ref_map_mad[np.where(ref_map_mad == np.nan)] = np.nanmean(ref_map_mad)
 
     return ref_map_mad
@@ -181,20 +172,16 @@ def map_slices(nside, good_map, za_max):
         nside, np.asarray(good_map), za_max
     )
 
-    NS_med_map = np.asarray(
-        [(np.nanmedian(i) if i != [] else np.nan) for i in ref_map_NS[0]]
-    )
+    NS_stats = ragged_stats(ref_map_NS[0])
     # Scale peak to 0
-    NS_med_map = np.asarray([i - np.nanmax(NS_med_map) for i in NS_med_map])
-    NS_mad_map = np.asarray(nan_mad(ref_map_NS[0]))
+    NS_med_map = NS_stats["median"] - np.nanmax(NS_stats["median"])
+    NS_mad_map = NS_stats["mad"]
     za_NS = ref_map_NS[1]
 
-    EW_med_map = np.asarray(
-        [(np.nanmedian(i) if i != [] else np.nan) for i in ref_map_EW[0]]
-    )
+    EW_stats = ragged_stats(ref_map_EW[0])
     # Scale peak to 0
-    EW_med_map = np.asarray([i - np.nanmax(EW_med_map) for i in EW_med_map])
-    EW_mad_map = np.asarray(nan_mad(ref_map_EW[0]))
+    EW_med_map = EW_stats["median"] - np.nanmax(EW_stats["median"])
+    EW_mad_map = EW_stats["mad"]
     za_EW = ref_map_EW[1]
 
     NS_data = [NS_med_map, NS_mad_map, za_NS]
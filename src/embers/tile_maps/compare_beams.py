@@ -17,6 +17,9 @@ from embers.tile_maps.beam_utils import (chisq_fit_gain,
                                          healpix_cardinal_slices, map_slices,
                                          plot_healpix, plt_slice, poly_fit,
                                          rotate_map)
+from embers.tile_maps.map_columns import (load_maps, map_path, pixel_lists,
+                                          pixel_maps)
+from embers.tile_maps.map_stats import ragged_stats
 from matplotlib import pyplot as plt
 
 matplotlib.use("Agg")
@@ -30,7 +33,7 @@ def beam_slice(nside, tile_map, fee_map, out_dir):
     power gradients across the beam.
 
     :param nside: Healpix nside
-    :param tile_map: Clean MWA tile map created by :func:`~embers.tile_maps.tile_maps.mwa_clean_maps`
+    :param tile_map: Clean MWA tile map :samp:`.npz` or :samp:`.tmap` file created by :func:`~embers.tile_maps.tile_maps.mwa_clean_maps`
     :param fee_map: MWA FEE model created  my :func:`~embers.mwa_utils.mwa_fee`
     :param out_dir: Path to output directory where diagnostic plots will be saved
     """
@@ -39,8 +42,18 @@ def beam_slice(nside, tile_map, fee_map, out_dir):
 
     pointings = ["0", "2", "4", "41"]
 
-    # load data from map .npz file
-    tile_map = np.load(tile_map, allow_pickle=True)
+    # load data from map file
+    if tile_map.suffix == ".tmap":
+        maps = load_maps(tile_map)
+        tile_map = {}
+        for p in pointings:
+            # object array of pixel lists, like the npz maps, which can be rotated
+            pixels = pixel_lists(*pixel_maps(maps, "mwa", [p]))
+            tile_map[p] = np.empty(len(pixels), dtype=object)
+            for i, pix in enumerate(pixels):
+                tile_map[p][i] = pix
+    else:
+        tile_map = np.load(tile_map, allow_pickle=True)
     fee_m = np.load(fee_map, allow_pickle=True)
 
     # MWA beam pointings
@@ -89,9 +102,7 @@ def beam_slice(nside, tile_map, fee_map, out_dir):
 
             # Visualize the tile map and diff map
             # healpix meadian map
-            tile_med = np.asarray(
-                [(np.nanmedian(j) if j != [] else np.nan) for j in tile]
-            )
+            tile_med = ragged_stats(tile)["median"]
 
             residuals = tile_med - fee
             residuals[np.where(fee < -30)] = np.nan
@@ -189,8 +200,10 @@ def batch_compare_beam(nside, fee_map, map_dir, out_dir, max_cores=None):
     # make output dir if it doesn't exist
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # find all map files
-    map_files = [item for item in map_dir.glob("*.npz")]
+    # find all map files, preferring .tmap to .npz files of the same map
+    map_names = {item.stem for item in map_dir.glob("*.npz")}
+    map_names.update(item.stem for item in map_dir.glob("*.tmap"))
+    map_files = [map_path(map_dir, name) for name in sorted(map_names)]
 
     # Parallization magic happens here
     with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
@@ -0,0 +1,540 @@
+"""
+Map Columns
+-----------
+
+A columnar accumulator of healpix map data. Samples from satellite passes are
+appended to typed arrays of pixel, pointing, satellite, time and power, which
+are grouped by pointing, satellite and pixel with a single sort, and saved as
+flat arrays of samples with CSR style offsets of each pixel, which can be memory mapped
+
+"""
+
+from pathlib import Path
+
+import healpy as hp
+import numpy as np
+
+# Columns of map data and their types
+COLUMNS = {
+    "pixel": np.int64,
+    "pointing": np.int64,
+    "sat": np.int64,
+    "time": np.float64,
+    "mwa": np.float64,
+    "ref": np.float64,
+    "tile": np.float64,
+}
+
+
+def map_path(map_dir, name):
+    """Path to a tile map file.
+
+    Memory mapped :samp:`.tmap` tile maps are preferred to :samp:`.npz` files, if both exist.
+
+    :param map_dir: Path to directory with tile maps :class:`~str`
+    :param name: name of tile map file without extension. Ex: :samp:`S06XX_rf0XX_sat_maps` :class:`~str`
+
+    :returns:
+        - map_file - path to :samp:`{name}.tmap` if it exists, else to :samp:`{name}.npz` :class:`~pathlib.Path`
+
+    """
+
+    map_file = Path(f"{map_dir}/{name}.tmap")
+    if map_file.is_file():
+        return map_file
+
+    return Path(f"{map_dir}/{name}.npz")
+
+
+def map_columns():
+    """Create an empty accumulator of map data.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import map_columns
+        columns = map_columns()
+
+    :returns:
+        - columns - empty list of array chunks for each column in :samp:`COLUMNS` :class:`~dict`
+
+    """
+
+    return {col: [] for col in COLUMNS}
+
+
+def append_pass(columns, pixels, pointing, sat, times, mwa, ref, tile):
+    """Append the samples of a satellite pass to the map columns.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import append_pass, map_columns
+
+        columns = map_columns()
+        append_pass(columns, [0, 1], 0, 25338, [1.0, 2.0], [-3, -4], [-30, -31], [-33, -35])
+
+    :param columns: map columns from :func:`~embers.tile_maps.map_columns.map_columns` :class:`~dict`
+    :param pixels: healpix pixels of the pass :class:`~numpy.ndarray`
+    :param pointing: MWA sweet pointing of the observation :class:`~int`
+    :param sat: Norad catalogue ID :class:`~int`
+    :param times: time of each pixel in UNIX :class:`~numpy.ndarray`
+    :param mwa: MWA beam power in each pixel :class:`~numpy.ndarray`
+    :param ref: reference power in each pixel :class:`~numpy.ndarray`
+    :param tile: tile power in each pixel :class:`~numpy.ndarray`
+
+    :returns:
+        samples of the pass appended to :samp:`columns`
+
+    """
+
+    pixels = np.asarray(pixels, dtype=COLUMNS["pixel"])
+
+    columns["pixel"].append(pixels)
+    columns["pointing"].append(np.full(pixels.size, pointing, COLUMNS["pointing"]))
+    columns["sat"].append(np.full(pixels.size, sat, COLUMNS["sat"]))
+    columns["time"].append(np.asarray(times, dtype=COLUMNS["time"]))
+    columns["mwa"].append(np.asarray(mwa, dtype=COLUMNS["mwa"]))
+    columns["ref"].append(np.asarray(ref, dtype=COLUMNS["ref"]))
+    columns["tile"].append(np.asarray(tile, dtype=COLUMNS["tile"]))
+
+
+def stack_columns(columns):
+    """Join the chunks of each map column into a single array.
+
+    :param columns: map columns from :func:`~embers.tile_maps.map_columns.map_columns` :class:`~dict`
+
+    :returns:
+        - columns - :class:`~numpy.ndarray` of each column :class:`~dict`
+
+    """
+
+    return {
+        col: np.concatenate(columns[col]) if columns[col] else np.empty(0, dtype)
+        for col, dtype in COLUMNS.items()
+    }
+
+
+def merge_columns(partials):
+    """Merge partial map columns, accumulated in parallel, into a single accumulator.
+
+    The chunks of each partial are joined in order, so merging is associative, and
+    partials of consecutive date intervals merge into the same columns as if all
+    passes had been appended to a single accumulator.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import append_pass, map_columns, merge_columns
+
+        first, second = map_columns(), map_columns()
+        append_pass(first, [0, 1], 0, 25338, [1.0, 2.0], [-3, -4], [-30, -31], [-33, -35])
+        append_pass(second, [2], 2, 25982, [3.0], [-5], [-32], [-36])
+        columns = merge_columns([first, second])
+
+    :param partials: map columns from :func:`~embers.tile_maps.map_columns.map_columns` :class:`~list`
+
+    :returns:
+        - columns - map columns with the chunks of all partials :class:`~dict`
+
+    """
+
+    columns = map_columns()
+    for partial in partials:
+        for col in COLUMNS:
+            columns[col].extend(partial[col])
+
+    return columns
+
+
+def group_columns(columns, keys):
+    """Group samples of map columns by the values of key columns.
+
+    Samples are sorted by the keys, in order of significance, with a stable sort
+    which preserves the order in which samples were appended within each group.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import group_columns, stack_columns
+
+        columns = stack_columns(columns)
+        order, groups, offsets = group_columns(columns, ["sat", "pixel"])
+
+        # Samples of the first satellite in the first pixel
+        mwa = columns["mwa"][order][offsets[0] : offsets[1]]
+
+    :param columns: stacked map columns from :func:`~embers.tile_maps.map_columns.stack_columns` :class:`~dict`
+    :param keys: names of columns to group by :class:`~list`
+
+    :returns:
+        A :class:`~tuple` (order, groups, offsets)
+
+        - order - indices which sort the samples by group :class:`~numpy.ndarray`
+        - groups - values of the keys in each group, with shape (groups, keys) :class:`~numpy.ndarray`
+        - offsets - start of each group in the sorted samples, followed by the number of samples :class:`~numpy.ndarray`
+
+    """
+
+    order = np.lexsort([columns[key] for key in reversed(keys)])
+    values = np.stack([columns[key][order] for key in keys], axis=-1)
+
+    if order.size == 0:
+        return order, values, np.zeros(1, dtype=np.int64)
+
+    # A new group starts wherever any of the keys change
+    starts = np.flatnonzero(np.any(values[1:] != values[:-1], axis=1)) + 1
+    starts = np.concatenate([[0], starts])
+
+    offsets = np.append(starts, order.size)
+
+    return order, values[starts], offsets
+
+
+def sat_pixel_maps(columns, pointings, sat_ids, nside):
+    """Split map columns into healpix maps of each satellite at each pointing.
+
+    Creates the nested layout of the raw tile maps saved by
+    :func:`~embers.tile_maps.tile_maps.project_tile_healpix`, in which each map is
+    a list of samples for each healpix pixel.
+
+    :param columns: map columns from :func:`~embers.tile_maps.map_columns.map_columns` :class:`~dict`
+    :param pointings: list of MWA sweet pointings :class:`~list`
+    :param sat_ids: list of Norad catalogue IDs :class:`~list`
+    :param nside: Healpix nside
+
+    :returns:
+        - maps - :samp:`{map: {pointing: {sat: [[samples] for pixel]}}}` for the mwa_map, ref_map, tile_map & time_map :class:`~dict`
+
+    """
+
+    return maps_to_nested(
+        column_maps(stack_columns(columns), pointings, sat_ids, nside)
+    )
+
+
+def column_maps(columns, pointings, sat_ids, nside):
+    """Arrange map columns into CSR healpix maps of each satellite at each pointing.
+
+    Samples are sorted by pointing, satellite and pixel into flat arrays of each
+    value column. The samples of a satellite at a pointing are a contiguous slice of
+    these arrays, split into healpix pixels by a row of CSR style offsets. Only pairs
+    of pointings and satellites with data have a row of offsets.
+
+    :param columns: stacked map columns from :func:`~embers.tile_maps.map_columns.stack_columns` :class:`~dict`
+    :param pointings: list of MWA sweet pointings :class:`~list`
+    :param sat_ids: list of Norad catalogue IDs :class:`~list`
+    :param nside: Healpix nside
+
+    :returns:
+        - maps - :class:`~numpy.ndarray` of each of the following :class:`~dict`
+
+        - pointings - MWA sweet pointings
+        - sats - Norad catalogue IDs
+        - groups - row of :samp:`indptr` of each pointing & satellite, or -1 if it has no data, with shape (pointings, sats)
+        - indptr - offsets of each pixel in the samples, with shape (rows, npix + 1)
+        - time, mwa, ref, tile - values of samples, of the value columns in :samp:`columns`
+
+    """
+
+    npix = hp.nside2npix(nside)
+    pointings = np.asarray([int(p) for p in pointings], dtype=np.int64)
+    sats = np.asarray(sat_ids, dtype=np.int64)
+
+    # Drop samples of unknown pointings and satellites
+    keep = np.isin(columns["pointing"], pointings) & np.isin(columns["sat"], sats)
+    columns = {col: values[keep] for col, values in columns.items()}
+
+    # Sort samples by pointing, satellite and pixel, so the pixels of each group are sorted
+    order, _, _ = group_columns(columns, ["pointing", "sat", "pixel"])
+    columns = {col: values[order] for col, values in columns.items()}
+
+    _, keys, offsets = group_columns(columns, ["pointing", "sat"])
+    pixels = columns["pixel"]
+
+    point_index = {p: i for i, p in enumerate(pointings.tolist())}
+    sat_index = {s: j for j, s in enumerate(sats.tolist())}
+
+    groups = np.full((pointings.size, sats.size), -1, dtype=np.int64)
+    indptr = np.zeros((len(keys), npix + 1), dtype=np.int64)
+    for row, (p, s) in enumerate(keys.tolist()):
+        groups[point_index[p], sat_index[s]] = row
+
+        # Offsets of each pixel within the samples of the group
+        start, stop = offsets[row], offsets[row + 1]
+        indptr[row] = start + np.searchsorted(pixels[start:stop], np.arange(npix + 1))
+
+    maps = {"pointings": pointings, "sats": sats, "groups": groups, "indptr": indptr}
+    for col in ["time", "mwa", "ref", "tile"]:
+        if col in columns:
+            maps[col] = columns[col]
+
+    return maps
+
+
+def save_maps(maps, filename):
+    """Save CSR healpix maps to a single file, which can be memory mapped.
+
+    The file is a sequence of :samp:`npy` arrays. The first is an array of the names
+    of the arrays which follow it. No array is pickled.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import save_maps
+        save_maps(maps, "./embers_out/tile_maps/tile_maps_raw/S06XX_rf0XX_sat_maps.tmap")
+
+    :param maps: CSR maps from :func:`~embers.tile_maps.map_columns.column_maps` :class:`~dict`
+    :param filename: path to :samp:`.tmap` file :class:`~str`
+
+    :returns:
+        maps saved to :samp:`filename`
+
+    """
+
+    names = list(maps.keys())
+    with open(filename, "wb") as f:
+        np.lib.format.write_array(f, np.asarray(names), version=(1, 0))
+        for name in names:
+            np.lib.format.write_array(
+                f, np.ascontiguousarray(maps[name]), version=(1, 0)
+            )
+
+
+def load_maps(filename):
+    """Memory map the arrays of CSR healpix maps.
+
+    No samples are read from disk until they are accessed, and slices of the
+    arrays are views of the file.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import load_maps
+        maps = load_maps("./embers_out/tile_maps/tile_maps_raw/S06XX_rf0XX_sat_maps.tmap")
+
+    :param filename: path to :samp:`.tmap` file from :func:`~embers.tile_maps.map_columns.save_maps` :class:`~str`
+
+    :returns:
+        - maps - :class:`~numpy.memmap` of each array saved :class:`~dict`
+
+    """
+
+    maps = {}
+    with open(filename, "rb") as f:
+        names = np.lib.format.read_array(f, allow_pickle=False)
+
+        for name in names:
+            np.lib.format.read_magic(f)
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            offset = f.tell()
+            size = int(np.prod(shape)) * dtype.itemsize
+
+            # Empty arrays can not be memory mapped
+            if size == 0:
+                maps[name] = np.empty(shape, dtype=dtype)
+            else:
+                maps[name] = np.memmap(
+                    filename,
+                    dtype=dtype,
+                    mode="r",
+                    offset=offset,
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+            f.seek(offset + size)
+
+    return maps
+
+
+def pixel_maps(maps, column, pointings=None, sats=None):
+    """Select samples from CSR healpix maps, grouped by healpix pixel.
+
+    Only the slices of samples of the selected pointings and satellites are read.
+    Within each pixel, samples are ordered by pointing, then by satellite, in the
+    order given.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import load_maps, pixel_maps
+
+        maps = load_maps("./embers_out/tile_maps/tile_maps_raw/S06XX_rf0XX_sat_maps.tmap")
+        values, offsets = pixel_maps(maps, "mwa", pointings=["0"], sats=[25338, 41188])
+
+        # Samples in pixel 42
+        values[offsets[42] : offsets[43]]
+
+    :param maps: CSR maps from :func:`~embers.tile_maps.map_columns.load_maps` :class:`~dict`
+    :param column: name of value column, :samp:`time`, :samp:`mwa`, :samp:`ref` or :samp:`tile` :class:`~str`
+    :param pointings: list of MWA sweet pointings. Default=None, which selects all pointings :class:`~list`
+    :param sats: list of Norad catalogue IDs. Default=None, which selects all satellites :class:`~list`
+
+    :returns:
+        A :class:`~tuple` (values, offsets)
+
+        - values - values of selected samples, sorted by pixel :class:`~numpy.ndarray`
+        - offsets - start of each pixel in :samp:`values`, followed by the number of samples :class:`~numpy.ndarray`
+
+    """
+
+    npix = maps["indptr"].shape[1] - 1
+    point_list = maps["pointings"].tolist()
+    sat_list = maps["sats"].tolist()
+
+    if pointings is None:
+        pointings = point_list
+    if sats is None:
+        sats = sat_list
+
+    rows = [
+        maps["groups"][point_list.index(int(p)), sat_list.index(s)]
+        for p in pointings
+        for s in sats
+        if int(p) in point_list and s in sat_list
+    ]
+    rows = [row for row in rows if row >= 0]
+
+    if rows == []:
+        return np.empty(0, dtype=maps[column].dtype), np.zeros(npix + 1, dtype=np.int64)
+
+    indptr = np.asarray(maps["indptr"][rows])
+    values = np.concatenate([maps[column][ptr[0] : ptr[-1]] for ptr in indptr])
+    pixels = np.concatenate(
+        [np.repeat(np.arange(npix), np.diff(ptr)) for ptr in indptr]
+    )
+
+    # A stable sort keeps the order of groups within each pixel
+    order = np.argsort(pixels, kind="stable")
+    counts = np.diff(indptr, axis=1).sum(axis=0)
+
+    return values[order], np.concatenate([[0], np.cumsum(counts)])
+
+
+def pixel_lists(values, offsets):
+    """Split samples grouped by pixel into a list of samples for each pixel.
+
+    :param values: samples sorted by pixel :class:`~numpy.ndarray`
+    :param offsets: start of each pixel in :samp:`values`, from :func:`~embers.tile_maps.map_columns.pixel_maps` :class:`~numpy.ndarray`
+
+    :returns:
+        - pixel_lists - list of samples in each pixel :class:`~list`
+
+    """
+
+    return [pix.tolist() for pix in np.split(np.asarray(values), offsets[1:-1])]
+
+
+def merge_sats(maps, sats, column):
+    """Merge the samples of satellites at each pointing of CSR healpix maps.
+
+    Creates clean tile maps, with a single satellite ID of 0 at each pointing,
+    which contains the samples of all :samp:`sats` in each pixel.
+
+    :param maps: CSR maps from :func:`~embers.tile_maps.map_columns.load_maps` :class:`~dict`
+    :param sats: list of Norad catalogue IDs to merge :class:`~list`
+    :param column: name of value column to keep :class:`~str`
+
+    :returns:
+        - maps - CSR maps of the merged satellites, as from :func:`~embers.tile_maps.map_columns.column_maps` :class:`~dict`
+
+    """
+
+    npix = maps["indptr"].shape[1] - 1
+    pointings = maps["pointings"].tolist()
+
+    columns = {"pixel": [], "pointing": [], "sat": [], column: []}
+    for p in pointings:
+        values, offsets = pixel_maps(maps, column, [p], sats)
+        columns["pixel"].append(np.repeat(np.arange(npix), np.diff(offsets)))
+        columns["pointing"].append(np.full(values.size, p))
+        columns["sat"].append(np.zeros(values.size))
+        columns[column].append(values)
+
+    columns = {
+        col: np.concatenate(chunks).astype(COLUMNS[col], copy=False)
+        for col, chunks in columns.items()
+    }
+
+    return column_maps(columns, pointings, [0], hp.npix2nside(npix))
+
+
+def nested_to_maps(nested, nside):
+    """Convert raw tile maps from the nested layout into CSR healpix maps.
+
+    .. code-block:: python
+
+        import numpy as np
+        from embers.tile_maps.map_columns import nested_to_maps, save_maps
+
+        raw = np.load("S06XX_rf0XX_sat_maps.npz", allow_pickle=True)
+        raw = {key: raw[key].item() for key in raw}
+        save_maps(nested_to_maps(raw, 32), "S06XX_rf0XX_sat_maps.tmap")
+
+        # Clean tile maps have a single satellite ID of 0
+        clean = np.load("S06XX_rf0XX_tile_maps.npz", allow_pickle=True)
+        clean = {"mwa_map": {p: {0: clean[p]} for p in clean}}
+        save_maps(nested_to_maps(clean, 32), "S06XX_rf0XX_tile_maps.tmap")
+
+    :param nested: :samp:`{map: {pointing: {sat: [[samples] for pixel]}}}`, as saved by :func:`~embers.tile_maps.tile_maps.project_tile_healpix` :class:`~dict`
+    :param nside: Healpix nside
+
+    :returns:
+        - maps - CSR maps, as from :func:`~embers.tile_maps.map_columns.column_maps` :class:`~dict`
+
+    """
+
+    names = {"time_map": "time", "mwa_map": "mwa", "ref_map": "ref", "tile_map": "tile"}
+    first = nested[next(iter(nested))]
+    pointings = list(first.keys())
+    sat_ids = list(first[pointings[0]].keys())
+
+    columns = {"pixel": [], "pointing": [], "sat": []}
+    columns.update({names[m]: [] for m in nested})
+    for p in pointings:
+        for s in sat_ids:
+            counts = [len(pix) for pix in first[p][s]]
+            columns["pixel"].append(np.repeat(np.arange(len(counts)), counts))
+            columns["pointing"].append(np.full(sum(counts), int(p)))
+            columns["sat"].append(np.full(sum(counts), s))
+            for m in nested:
+                columns[names[m]].append(
+                    np.fromiter(
+                        (v for pix in nested[m][p][s] for v in pix),
+                        dtype=COLUMNS[names[m]],
+                        count=sum(counts),
+                    )
+                )
+
+    columns = {
+        col: np.concatenate(chunks).astype(COLUMNS[col], copy=False)
+        for col, chunks in columns.items()
+    }
+
+    return column_maps(columns, pointings, sat_ids, nside)
+
+
+def maps_to_nested(maps):
+    """Convert CSR healpix maps into the nested layout of raw tile maps.
+
+    :param maps: CSR maps from :func:`~embers.tile_maps.map_columns.load_maps` :class:`~dict`
+
+    :returns:
+        - nested - :samp:`{map: {pointing: {sat: [[samples] for pixel]}}}` of each value column in :samp:`maps` :class:`~dict`
+
+    """
+
+    names = {"mwa_map": "mwa", "ref_map": "ref", "tile_map": "tile", "time_map": "time"}
+    names = {m: col for m, col in names.items() if col in maps}
+    npix = maps["indptr"].shape[1] - 1
+
+    nested = {m: {} for m in names}
+    for i, p in enumerate(maps["pointings"].tolist()):
+        for m in nested:
+            nested[m][f"{p}"] = {}
+
+        for j, s in enumerate(maps["sats"].tolist()):
+            row = maps["groups"][i, j]
+            for m, col in names.items():
+                if row < 0:
+                    nested[m][f"{p}"][s] = [[] for pixel in range(npix)]
+                else:
+                    ptr = np.asarray(maps["indptr"][row])
+                    nested[m][f"{p}"][s] = pixel_lists(
+                        maps[col][ptr[0] : ptr[-1]], ptr - ptr[0]
+                    )
+
+    return nested
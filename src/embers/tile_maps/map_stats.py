@@ -0,0 +1,160 @@
+"""
+Map Stats
+---------
+
+Vectorized statistics of ragged healpix maps, in which each pixel contains
+a list of samples. The samples of all pixels are sorted into segments once,
+from which the nan-aware count, mean, median, MAD and percentiles of every
+pixel are computed, as dense arrays ready for :func:`~embers.tile_maps.beam_utils.plot_healpix`
+
+"""
+
+import numpy as np
+
+
+def ragged_offsets(ragged):
+    """Flatten a ragged healpix map into samples and the offsets of each pixel.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_stats import ragged_offsets
+        values, offsets = ragged_offsets([[1, 2], [], [3]])
+
+        # values = [1., 2., 3.], offsets = [0, 2, 2, 3]
+
+    :param ragged: list of samples in each pixel :class:`~list`
+
+    :returns:
+        A :class:`~tuple` (values, offsets)
+
+        - values - samples of all pixels :class:`~numpy.ndarray`
+        - offsets - start of each pixel in :samp:`values`, followed by the number of samples :class:`~numpy.ndarray`
+
+    """
+
+    counts = np.fromiter(
+        (len(pix) for pix in ragged), dtype=np.int64, count=len(ragged)
+    )
+    values = np.fromiter(
+        (v for pix in ragged for v in pix), dtype=np.float64, count=counts.sum()
+    )
+
+    return values, np.concatenate([[0], np.cumsum(counts)])
+
+
+def _segment_sort(values, segments):
+    """Sort values within each of the sorted segments, with nans last."""
+
+    return values[np.lexsort((values, segments))]
+
+
+def _segment_median(values, starts, counts):
+    """Median of the first :samp:`counts` sorted values of each segment."""
+
+    median = np.full(starts.size, np.nan)
+    has = counts > 0
+
+    # Mean of the middle two values, which are the same value if counts are odd
+    lo = (starts + (counts - 1) // 2)[has]
+    hi = (starts + counts // 2)[has]
+    median[has] = (values[lo] + values[hi]) / 2
+
+    return median
+
+
+def pixel_stats(values, offsets, percentiles=None, scale=1.4826):
+    """Nan-aware statistics of the samples in every pixel of a ragged healpix map.
+
+    NaN samples are ignored, and pixels without other samples have a count of 0
+    and NaN statistics. The MAD matches :func:`~scipy.stats.median_absolute_deviation`
+    of the samples which aren't NaN, scaled to the standard deviation of a normal
+    distribution by default, and percentiles are linearly interpolated, like
+    :func:`~numpy.nanpercentile`.
+
+    .. code-block:: python
+
+        from embers.tile_maps.map_columns import load_maps, pixel_maps
+        from embers.tile_maps.map_stats import pixel_stats
+
+        maps = load_maps("./embers_out/tile_maps/tile_maps_clean/S06XX_rf0XX_tile_maps.tmap")
+        stats = pixel_stats(*pixel_maps(maps, "mwa", ["0"]), percentiles=[16, 84])
+        median = stats["median"]
+
+    :param values: samples of all pixels, grouped by pixel :class:`~numpy.ndarray`
+    :param offsets: start of each pixel in :samp:`values`, followed by the number of samples :class:`~numpy.ndarray`
+    :param percentiles: percentiles between 0 and 100 to compute. Default=None :class:`~list`
+    :param scale: scale factor of the MAD. Default=1.4826 :class:`~float`
+
+    :returns:
+        - stats - :class:`~numpy.ndarray` of each of the following statistics of every pixel :class:`~dict`
+
+        - count - number of samples which aren't NaN
+        - mean - mean of samples
+        - median - median of samples
+        - mad - median absolute deviation of samples
+        - percentiles - percentiles of samples, with shape (percentiles, pixels), if :samp:`percentiles` are given
+
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    npix = offsets.size - 1
+
+    segments = np.repeat(np.arange(npix), np.diff(offsets))
+    values = _segment_sort(values, segments)
+    good = ~np.isnan(values)
+
+    counts = np.bincount(segments[good], minlength=npix)
+    starts = offsets[:-1]
+
+    stats = {"count": counts}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats["mean"] = (
+            np.bincount(segments[good], weights=values[good], minlength=npix) / counts
+        )
+    stats["median"] = _segment_median(values, starts, counts)
+
+    # Absolute deviations from the median, sorted again within each pixel
+    deviations = np.abs(values - stats["median"][segments])
+    deviations = _segment_sort(deviations, segments)
+    stats["mad"] = scale * _segment_median(deviations, starts, counts)
+
+    if percentiles is not None:
+        stats["percentiles"] = np.full((len(percentiles), npix), np.nan)
+        has = counts > 0
+        for i, q in enumerate(percentiles):
+            position = (counts - 1) * (q / 100)
+            lo = np.floor(position).astype(np.int64)
+            hi = np.ceil(position).astype(np.int64)
+            frac = (position - lo)[has]
+
+            below = values[(starts + lo)[has]]
+            above = values[(starts + hi)[has]]
+            stats["percentiles"][i, has] = below + (above - below) * frac
+
+    return stats
+
+
+def ragged_stats(ragged, percentiles=None, scale=1.4826):
+    """Nan-aware statistics of every pixel of a ragged healpix map of pixel lists.
+
+    .. code-block:: python
+
+        import numpy as np
+        from embers.tile_maps.map_stats import ragged_stats
+
+        clean_map = np.load("S06XX_rf0XX_tile_maps.npz", allow_pickle=True)
+        stats = ragged_stats(clean_map["0"])
+        median, mad, count = stats["median"], stats["mad"], stats["count"]
+
+    :param ragged: list of samples in each pixel :class:`~list`
+    :param percentiles: percentiles between 0 and 100 to compute. Default=None :class:`~list`
+    :param scale: scale factor of the MAD. Default=1.4826 :class:`~float`
+
+    :returns:
+        - stats - statistics of every pixel, from :func:`~embers.tile_maps.map_stats.pixel_stats` :class:`~dict`
+
+    """
+
+    return pixel_stats(*ragged_offsets(ragged), percentiles=percentiles, scale=scale)
@@ -6,14 +6,14 @@ A set of tools to perform null tests on reference rf data and reference beam mod
 
 """
 
-from pathlib import Path
-
 import healpy as hp
 import matplotlib
 import numpy as np
 from embers.tile_maps.beam_utils import (chisq_fit_gain,
                                          healpix_cardinal_slices, map_slices,
                                          plt_slice, poly_fit, rotate_map)
+from embers.tile_maps.map_columns import (load_maps, map_path, pixel_lists,
+                                          pixel_maps)
 from matplotlib import pyplot as plt
 
 matplotlib.use("Agg")
@@ -33,11 +33,7 @@ def good_ref_maps(nside, map_dir, tile_pair):
 
     pointings = ["0", "2", "4", "41"]
 
-    # load data from map .npz file
-    f = Path(f"{map_dir}/{tile_pair[0]}_{tile_pair[1]}_sat_maps.npz")
-    tile_data = np.load(f, allow_pickle=True)
-    tile_data = {key: tile_data[key].item() for key in tile_data}
-    ref_map = tile_data["ref_map"]
+    f = map_path(map_dir, f"{tile_pair[0]}_{tile_pair[1]}_sat_maps")
 
     # Good sats from which to make plots
     good_sats = [
@@ -60,6 +56,17 @@ def good_ref_maps(nside, map_dir, tile_pair):
         44387,
     ]
 
+    # Only the good sat data is read from memory mapped maps
+    if f.suffix == ".tmap":
+        return pixel_lists(
+            *pixel_maps(load_maps(f), "ref", pointings=pointings, sats=good_sats)
+        )
+
+    # load data from map .npz file
+    tile_data = np.load(f, allow_pickle=True)
+    tile_data = {key: tile_data[key].item() for key in tile_data}
+    ref_map = tile_data["ref_map"]
+
     # Empty good ref map
     good_ref_map = [[] for pixel in range(hp.nside2npix(nside))]
 
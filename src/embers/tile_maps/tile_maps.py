@@ -8,6 +8,9 @@ A set of tools to project satellite passes onto a healpix map according to their
 
 import concurrent.futures
 import json
+import math
+import os
+import tempfile
 from itertools import repeat
 from pathlib import Path
 
@@ -16,54 +19,130 @@ import matplotlib
 import numpy as np
 from embers.rf_tools.colormaps import jade, spectral
 from embers.rf_tools.rf_data import tile_names
+from embers.sat_utils.chrono_ephem import chrono_path, read_chrono
 from embers.sat_utils.sat_channels import (noise_floor, read_aligned,
                                            time_filter, time_tree)
 from embers.sat_utils.sat_list import norad_ids
 from embers.tile_maps.beam_utils import (chisq_fit_gain, chisq_fit_test,
                                          plot_healpix, rotate_map)
+from embers.tile_maps.map_columns import (append_pass, column_maps,
+                                          load_maps, map_columns, map_path,
+                                          merge_columns, merge_sats,
+                                          pixel_maps, sat_pixel_maps,
+                                          save_maps, stack_columns)
+from embers.tile_maps.map_stats import pixel_stats, ragged_stats
 from matplotlib import pyplot as plt
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from scipy.stats import binned_statistic
-from scipy.stats import median_absolute_deviation as mad
 
 matplotlib.use("Agg")
 spec, _ = spectral()
 jade, _ = jade()
 
 
+def pointing_index(obs_point_json):
+    """Index the MWA sweet-pointings of all observations by timestamp.
+
+    :samp:`obs_pointings.json` is read once, and the timestamps of all pointings are sorted, so that the pointing of a
+    timestamp, or all the windows within a time interval, can be found by bisection instead of scanning the json lists.
+    Timestamps in more than one pointing list are assigned the first of 0, 2, 4, 41, like :func:`~embers.tile_maps.tile_maps.check_pointing`.
+
+    .. code-block:: python
+
+        from embers.tile_maps.tile_maps import check_pointing, pointing_index
+        point_index = pointing_index("embers_out/mwa_utils/obs_pointings.json")
+        point = check_pointing("2019-10-01-23:30", point_index)
+
+    :param obs_point_json: Path to :samp:`obs_point.json` output from :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from this function
+
+    :returns:
+        - point_index - sorted :samp:`timestamps` and their :samp:`pointings` :class:`~dict`
+
+    """
+
+    if isinstance(obs_point_json, dict):
+        return obs_point_json
+
+    # Read observation pointing list
+    with open(obs_point_json) as point:
+        obs_p = json.load(point)
+
+    # Earlier pointings take precedence over later ones
+    points = {}
+    for p in [41, 4, 2, 0]:
+        points.update(dict.fromkeys(obs_p[f"point_{p}"], p))
+
+    timestamps = sorted(points)
+
+    return {
+        "timestamps": np.array(timestamps, dtype=str),
+        "pointings": np.array([points[t] for t in timestamps], dtype=int),
+    }
+
+
 def check_pointing(timestamp, obs_point_json):
     """Check if timestamp is at MWA sweet-pointing 0, 2, 4, 41.
 
     :param timestamp: time at which MWA pointing is to be checked
-    :param obs_point_json: Path to :samp:`obs_point.json` output from :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`
+    :param obs_point_json: Path to :samp:`obs_point.json` output from :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
 
     :returns:
         - Pointing of MWA at given :samp:`timestamp`
 
     """
 
-    # Read observation pointing list
-    with open(obs_point_json) as point:
-        obs_p = json.load(point)
-        point_0 = obs_p["point_0"]
-        point_2 = obs_p["point_2"]
-        point_4 = obs_p["point_4"]
-        point_41 = obs_p["point_41"]
-
-    if timestamp in point_0:
-        point = 0
-    elif timestamp in point_2:
-        point = 2
-    elif timestamp in point_4:
-        point = 4
-    elif timestamp in point_41:
-        point = 41
+    point_index = pointing_index(obs_point_json)
+    timestamps = point_index["timestamps"]
+
+    i = np.searchsorted(timestamps, timestamp)
+
+    if i < timestamps.size and timestamps[i] == timestamp:
+        point = int(point_index["pointings"][i])
     else:
         point = None
 
     return point
 
 
+def pointing_windows(obs_point_json, start, stop, point=None):
+    """Find all observation windows at MWA sweet-pointings within a time interval.
+
+    .. code-block:: python
+
+        from embers.tile_maps.tile_maps import pointing_windows
+        windows, points = pointing_windows(
+            "embers_out/mwa_utils/obs_pointings.json", "2019-10-01-00:00", "2019-10-07-23:30", point=0
+        )
+
+    :param obs_point_json: Path to :samp:`obs_point.json` output from :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
+    :param start: First timestamp of interval in :samp:`YYYY-MM-DD-HH:MM` format
+    :param stop: Last timestamp of interval, included, in :samp:`YYYY-MM-DD-HH:MM` format
+    :param point: Only find windows at this pointing. Default=None, which finds windows at all pointings
+
+    :returns:
+        A :class:`~tuple` (windows, points)
+
+        - windows - chronological timestamps of observations within interval :class:`~numpy.ndarray`
+        - points - pointing of each window :class:`~numpy.ndarray`
+
+    """
+
+    point_index = pointing_index(obs_point_json)
+    timestamps = point_index["timestamps"]
+
+    first = np.searchsorted(timestamps, start, side="left")
+    last = np.searchsorted(timestamps, stop, side="right")
+
+    windows = timestamps[first:last]
+    points = point_index["pointings"][first:last]
+
+    if point is not None:
+        windows = windows[points == point]
+        points = points[points == point]
+
+    return (windows, points)
+
+
 def plt_channel(
     out_dir,
     times,
@@ -302,70 +381,64 @@ def rf_apply_thresholds(
     ref_noise = noise_floor(sat_thresh, noi_thresh, ref_p)
     tile_noise = noise_floor(sat_thresh, noi_thresh, tile_p)
 
-    with open(chrono_file) as chrono:
-        chrono_ephem = json.load(chrono)
-
-        norad_list = [chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))]
-
-        norad_index = norad_list.index(str(sat_id))
-
-        norad_ephem = chrono_ephem[norad_index]
-
-        rise_ephem = norad_ephem["time_array"][0]
-        set_ephem = norad_ephem["time_array"][-1]
-
-        intvl = time_filter(rise_ephem, set_ephem, np.asarray(times))
-
-        if intvl is not None:
-
-            w_start, w_stop = intvl
-
-            # Slice [crop] the ref/tile/times arrays to the times of sat pass and extract sat_chan
-            ref_c = ref_p[w_start : w_stop + 1, sat_chan]
-            tile_c = tile_p[w_start : w_stop + 1, sat_chan]
-            times_c = times[w_start : w_stop + 1]
-
-            alt = np.asarray(norad_ephem["sat_alt"])
-            az = np.asarray(norad_ephem["sat_az"])
-
-            if (np.nanmax(ref_c - ref_noise) >= pow_thresh) and (
-                np.nanmax(tile_c - tile_noise) >= pow_thresh
-            ):
-
-                # Apply noise criteria. In the window, where are ref_power and tile power
-                # above their respective thresholds?
-                if np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0].size != 0:
-                    good_ref = ref_c[
-                        np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
-                    ]
-                    good_tile = tile_c[
-                        np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
-                    ]
-                    good_alt = alt[
-                        np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
-                    ]
-                    good_az = az[
-                        np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
-                    ]
-
-                    if plots is True:
-                        plt_channel(
-                            f"{out_dir}/pass_plots/{tile}_{ref}/{point}",
-                            times_c,
-                            ref_c,
-                            tile_c,
-                            ref_noise,
-                            tile_noise,
-                            sat_chan,
-                            sat_id,
-                            point,
-                            timestamp,
-                        )
+    chrono_ephem = read_chrono(chrono_file)
+
+    norad_list = [chrono_ephem[s]["sat_id"][0] for s in range(len(chrono_ephem))]
+
+    norad_index = norad_list.index(str(sat_id))
+
+    norad_ephem = chrono_ephem[norad_index]
+
+    rise_ephem = norad_ephem["time_array"][0]
+    set_ephem = norad_ephem["time_array"][-1]
+
+    intvl = time_filter(rise_ephem, set_ephem, np.asarray(times))
 
-                    return [good_ref, good_tile, good_alt, good_az, times_c]
+    if intvl is not None:
 
-                else:
-                    return 0
+        w_start, w_stop = intvl
+
+        # Slice [crop] the ref/tile/times arrays to the times of sat pass and extract sat_chan
+        ref_c = ref_p[w_start : w_stop + 1, sat_chan]
+        tile_c = tile_p[w_start : w_stop + 1, sat_chan]
+        times_c = times[w_start : w_stop + 1]
+
+        alt = np.asarray(norad_ephem["sat_alt"])
+        az = np.asarray(norad_ephem["sat_az"])
+
+        if (np.nanmax(ref_c - ref_noise) >= pow_thresh) and (
+            np.nanmax(tile_c - tile_noise) >= pow_thresh
+        ):
+
+            # Apply noise criteria. In the window, where are ref_power and tile power
+            # above their respective thresholds?
+            if np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0].size != 0:
+                good_ref = ref_c[
+                    np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
+                ]
+                good_tile = tile_c[
+                    np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
+                ]
+                good_alt = alt[
+                    np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]
+                ]
+                good_az = az[np.where((ref_c >= ref_noise) & (tile_c >= tile_noise))[0]]
+
+                if plots is True:
+                    plt_channel(
+                        f"{out_dir}/pass_plots/{tile}_{ref}/{point}",
+                        times_c,
+                        ref_c,
+                        tile_c,
+                        ref_noise,
+                        tile_noise,
+                        sat_chan,
+                        sat_id,
+                        point,
+                        timestamp,
+                    )
+
+                return [good_ref, good_tile, good_alt, good_az, times_c]
 
             else:
                 return 0
@@ -373,6 +446,134 @@ def rf_apply_thresholds(
         else:
             return 0
 
+    else:
+        return 0
+
+
+def model_registry(ref_model, fee_map, nside, registry_dir):
+    """Rotate the reference and MWA FEE models once, and save them as arrays to be memory mapped.
+
+    Every worker of :func:`~embers.tile_maps.tile_maps.rfe_batch_cali` and
+    :func:`~embers.tile_maps.tile_maps.tile_maps_batch` used to decompress both models and
+    rotate the reference model. The rotated reference models of both polarizations and the
+    MWA FEE models of all pointings are instead saved as :samp:`.npy` files to
+    :samp:`registry_dir`, which workers memory map read-only with
+    :func:`~embers.tile_maps.tile_maps.load_models`, sharing a single copy in the page cache.
+
+    .. code-block:: python
+
+        from embers.tile_maps.tile_maps import model_registry
+        model_registry(
+            "~/embers_out/tile_maps/ref_models/ref_dipole_models.npz",
+            "~/embers_out/mwa_utils/mwa_fee/mwa_fee_beam.npz",
+            32,
+            "~/embers_out/tile_maps/models")
+
+    :param ref_model: Path to reference feko model :samp:`.npz` file, output by :func:`~embers.tile_maps.ref_fee_healpix.ref_healpix_save`
+    :param fee_map: Path to MWA fee model :samp:`.npz` file, output by :func:`~embers.mwa_utils.mwa_fee.mwa_fee_model`
+    :param nside: Healpix nside
+    :param registry_dir: Path to directory where the models will be saved :class:`~str`
+
+    :returns:
+        - rotated reference models and MWA FEE models saved to :samp:`registry_dir`
+
+    """
+
+    Path(registry_dir).mkdir(parents=True, exist_ok=True)
+
+    # Rotate the fee models by -pi/2 to move model from spherical (E=0) to Alt/Az (N=0)
+    ref_fee_model = np.load(ref_model, allow_pickle=True)
+    for pol in ["XX", "YY"]:
+        rotated_fee = rotate_map(
+            nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee_model[pol]
+        )
+        np.save(f"{registry_dir}/ref_{pol}.npy", rotated_fee)
+
+    fee_m = np.load(fee_map, allow_pickle=True)
+    for point in fee_m.files:
+        np.save(f"{registry_dir}/fee_{point}.npy", fee_m[point])
+
+
+def load_models(registry_dir, tile):
+    """Memory map the models of a tile, saved by :func:`~embers.tile_maps.tile_maps.model_registry`.
+
+    :param registry_dir: Path to directory of models from :func:`~embers.tile_maps.tile_maps.model_registry` :class:`~str`
+    :param tile: MWA tile name, which determines the polarization of the reference model :class:`~str`
+
+    :returns:
+        A :class:`~tuple` (rotated_fee, fee_m)
+
+        - rotated_fee: rotated reference model of the polarization of :samp:`tile` :class:`~numpy.memmap`
+        - fee_m: MWA FEE models of both polarizations, by pointing :class:`~dict`
+
+    """
+
+    pol = "XX" if "XX" in tile else "YY"
+    rotated_fee = np.load(f"{registry_dir}/ref_{pol}.npy", mmap_mode="r")
+
+    fee_m = {}
+    for fee in Path(registry_dir).glob("fee_*.npy"):
+        fee_m[fee.stem[4:]] = np.load(fee, mmap_mode="r")
+
+    return (rotated_fee, fee_m)
+
+
+def bin_pass(healpix_index, ref_power, tile_power, times):
+    """Bin the samples of a satellite pass into healpix pixels.
+
+    Multiple samples of a pass fall within a single healpix pixel. Each sample is
+    labelled with its pixel by :func:`~numpy.unique`, and the powers in each pixel
+    are averaged with :func:`~numpy.bincount`, ignoring NaNs, in a single pass
+    over the samples. Means keep the precision of float powers, and means of integer
+    powers are :class:`~numpy.float64`.
+
+    .. code-block:: python
+
+        import numpy as np
+        from embers.tile_maps.tile_maps import bin_pass
+
+        pixels, ref_pass, tile_pass, times_pass = bin_pass(
+            np.array([7, 7, 3]), np.array([-30, -31, -40]), np.array([-20, -22, -25]), np.array([1, 2, 3])
+        )
+
+        # pixels = [3, 7], ref_pass = [-40., -30.5], tile_pass = [-25., -21.], times_pass = [3, 1]
+
+    :param healpix_index: healpix pixel of each sample of the pass :class:`~numpy.ndarray`
+    :param ref_power: reference power of each sample :class:`~numpy.ndarray`
+    :param tile_power: tile power of each sample :class:`~numpy.ndarray`
+    :param times: times of the pass, of which the first :samp:`healpix_index.size` are the times of the samples :class:`~numpy.ndarray`
+
+    :returns:
+        A :class:`~tuple` (pixels, ref_pass, tile_pass, times_pass)
+
+        - pixels - sorted unique healpix pixels of the pass :class:`~numpy.ndarray`
+        - ref_pass - mean reference power in each pixel :class:`~numpy.ndarray`
+        - tile_pass - mean tile power in each pixel :class:`~numpy.ndarray`
+        - times_pass - time of the first sample in each pixel :class:`~numpy.ndarray`
+
+    """
+
+    pixels, first, inverse = np.unique(
+        healpix_index, return_index=True, return_inverse=True
+    )
+
+    means = []
+    for power in [np.asarray(ref_power), np.asarray(tile_power)]:
+        good = ~np.isnan(power)
+        sums = np.bincount(inverse[good], weights=power[good], minlength=pixels.size)
+        counts = np.bincount(inverse[good], minlength=pixels.size)
+
+        # Pixels with only NaN samples have a NaN mean
+        with np.errstate(invalid="ignore"):
+            means.append(
+                (sums / counts).astype(np.result_type(power.dtype, np.float32))
+            )
+
+    ref_pass, tile_pass = means
+    times_pass = np.asarray(times)[first]
+
+    return (pixels, ref_pass, tile_pass, times_pass)
+
 
 def rfe_calibration(
     start_date,
@@ -389,6 +590,7 @@ def rfe_calibration(
     chrono_dir,
     chan_map_dir,
     out_dir,
+    models=None,
 ):
     """Calibrate the gain variations of a RF Explorers at high powers.
 
@@ -405,11 +607,12 @@ def rfe_calibration(
     :param ref_model: Path to reference feko model :samp:`.npz` file, output by :func:`~embers.tile_maps.ref_fee_healpix.ref_healpix_save`
     :param fee_map: Path to MWA fee model :samp:`.npz` file, output by :func:`~embers.mwa_utils.mwa_fee.mwa_fee_model`
     :param nside: Healpix nside
-    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`
+    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
     :param align_dir: Path to directory containing aligned rf data files, output from :func:`~embers.rf_tools.align_data.save_aligned`
     :param chrono_dir: Path to directory containing chronological ephemeris data output from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem`
     :param chan_map_dir: Path to directory containing satellite frequency channel maps. Output from :func:`~embers.sat_utils.sat_channels.batch_window_map`
     :param out_dir: Output directory where rfe calibration data will be saved as a :samp:`json` file
+    :param models: Path to directory of models from :func:`~embers.tile_maps.tile_maps.model_registry`. Default=None, which loads :samp:`ref_model` and :samp:`fee_map`
 
     :returns:
         - Json file saved to out_dir which contains RF explorer calibration data.
@@ -422,242 +625,210 @@ def rfe_calibration(
 
     ref, tile = tile_pair
 
-    dates, timestamps = time_tree(start_date, stop_date)
+    dates, _ = time_tree(start_date, stop_date)
+    point_index = pointing_index(obs_point_json)
 
-    # Load reference FEE model
-    # Rotate the fee models by -pi/2 to move model from spherical (E=0) to Alt/Az (N=0)
-    ref_fee_model = np.load(ref_model, allow_pickle=True)
-
-    fee_m = np.load(fee_map, allow_pickle=True)
+    if models is not None:
+        rotated_fee, fee_m = load_models(models, tile)
 
-    if "XX" in tile:
-        ref_fee = ref_fee_model["XX"]
-        rotated_fee = rotate_map(nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee)
     else:
-        ref_fee = ref_fee_model["YY"]
-        rotated_fee = rotate_map(nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee)
+        # Load reference FEE model
+        # Rotate the fee models by -pi/2 to move model from spherical (E=0) to Alt/Az (N=0)
+        ref_fee_model = np.load(ref_model, allow_pickle=True)
 
-    for day in range(len(dates)):
+        fee_m = np.load(fee_map, allow_pickle=True)
 
-        for window in range(len(timestamps[day])):
-            timestamp = timestamps[day][window]
-
-            # pointing at timestamp
-            point = check_pointing(timestamp, obs_point_json)
-
-            if point == 0:
-
-                if "XX" in tile:
-                    mwa_fee = fee_m[str(point)][0]
-                else:
-                    mwa_fee = fee_m[str(point)][1]
+        if "XX" in tile:
+            ref_fee = ref_fee_model["XX"]
+            rotated_fee = rotate_map(
+                nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee
+            )
+        else:
+            ref_fee = ref_fee_model["YY"]
+            rotated_fee = rotate_map(
+                nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee
+            )
 
-                ali_file = Path(
-                    f"{align_dir}/{dates[day]}/{timestamp}/{ref}_{tile}_{timestamp}_aligned.npz"
-                )
+    # Only the observation windows at pointing 0
+    windows, points = pointing_windows(
+        point_index, f"{dates[0]}-00:00", f"{dates[-1]}-23:30", point=0
+    )
 
-                # check if file exists
-                if ali_file.is_file():
+    for timestamp, point in zip(windows.tolist(), points.tolist()):
+        date = timestamp[:10]
 
-                    # Chrono and map Ephemeris file
-                    chrono_file = Path(f"{chrono_dir}/{timestamp}.json")
-                    channel_map = Path(f"{chan_map_dir}/{timestamp}.json")
+        if "XX" in tile:
+            mwa_fee = fee_m[str(point)][0]
+        else:
+            mwa_fee = fee_m[str(point)][1]
 
-                    with open(chrono_file) as chrono:
-                        chrono_ephem = json.load(chrono)
+        ali_file = Path(
+            f"{align_dir}/{date}/{timestamp}/{ref}_{tile}_{timestamp}_aligned.npz"
+        )
 
-                        if chrono_ephem != []:
+        # check if file exists
+        if ali_file.is_file():
 
-                            norad_list = [
-                                chrono_ephem[s]["sat_id"][0]
-                                for s in range(len(chrono_ephem))
-                            ]
+            # Chrono and map Ephemeris file
+            chrono_file = chrono_path(chrono_dir, timestamp)
+            channel_map = Path(f"{chan_map_dir}/{timestamp}.json")
 
-                            if norad_list != []:
+            chrono_ephem = read_chrono(chrono_file)
 
-                                if channel_map.is_file():
+            if chrono_ephem != []:
 
-                                    with open(channel_map) as ch_map:
-                                        chan_map = json.load(ch_map)
+                norad_list = [
+                    chrono_ephem[s]["sat_id"][0]
+                    for s in range(len(chrono_ephem))
+                ]
 
-                                        chan_sat_ids = [
-                                            int(i) for i in list(chan_map.keys())
-                                        ]
+                if norad_list != []:
 
-                                        for sat in chan_sat_ids:
+                    if channel_map.is_file():
 
-                                            chan = chan_map[f"{sat}"]
+                        with open(channel_map) as ch_map:
+                            chan_map = json.load(ch_map)
 
-                                            sat_data = rf_apply_thresholds(
-                                                ali_file,
-                                                chrono_file,
-                                                sat,
-                                                chan,
-                                                sat_thresh,
-                                                noi_thresh,
-                                                pow_thresh,
-                                                point,
-                                                False,
-                                                out_dir,
-                                            )
+                            chan_sat_ids = [
+                                int(i) for i in list(chan_map.keys())
+                            ]
 
-                                            if sat_data != 0:
-
-                                                (
-                                                    ref_power,
-                                                    tile_power,
-                                                    alt,
-                                                    az,
-                                                    times,
-                                                ) = sat_data
-
-                                                # Altitude is in deg while az is in radians
-                                                # convert alt to radians
-                                                # za - zenith angle
-                                                alt = np.radians(alt)
-                                                za = np.pi / 2 - alt
-                                                az = np.asarray(az)
-
-                                                # Now convert to healpix coordinates
-                                                # healpix_index = hp.ang2pix(nside,θ, ɸ)
-                                                healpix_index = hp.ang2pix(
-                                                    nside, za, az
-                                                )
-
-                                                # multiple data points fall within a single healpix pixel
-                                                # find the unique pixels
-                                                u = np.unique(healpix_index)
-
-                                                ref_pass = np.array(
-                                                    [
-                                                        np.nanmean(
-                                                            ref_power[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )[0]
-                                                            ]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-
-                                                tile_pass = np.array(
-                                                    [
-                                                        np.nanmean(
-                                                            tile_power[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )[0]
-                                                            ]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-
-                                                times_pass = np.array(
-                                                    [
-                                                        np.mean(
-                                                            times[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )
-                                                            ][0]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-
-                                                ref_fee_pass = np.array(
-                                                    [rotated_fee[i] for i in u]
-                                                )
-
-                                                mwa_fee_pass = np.array(
-                                                    [mwa_fee[i] for i in u]
-                                                )
-
-                                                # This is the magic. Equation [1] of the paper
-                                                # A measured cross sectional slice of the MWA beam
-                                                mwa_pass = (
-                                                    np.array(tile_pass)
-                                                    - np.array(ref_pass)
-                                                    + np.array(ref_fee_pass)
-                                                )
-
-                                                # RFE distortion is seen in tile_pass when raw power is above -30dBm
-                                                # fit the mwa_pass data to the tile_pass power level
-                                                # Mask everything below -30dBm to fit distorted MWA and tile pass
-                                                peak_filter = np.where(tile_pass >= -30)
-                                                offset = chisq_fit_gain(
-                                                    data=tile_pass[peak_filter],
-                                                    model=mwa_pass[peak_filter],
-                                                )
-                                                # This is a slice of the MWA beam, scaled back to the power level of the raw, distorted tile data
-                                                mwa_pass = mwa_pass + offset[0]
-
-                                                # Single multiplicative gain factor to fit MWA FEE beam slice down to tile pass power level
-                                                # MWA pass Data above -50dBm masked out because it is distorted
-                                                # Data below -60dBm maked out because FEE nulls are much deeper than the dynamic range of satellite passes
-                                                dis_filter = np.where(mwa_pass <= -35)
-                                                mwa_pass_fil = mwa_pass[dis_filter]
-                                                mwa_fee_pass_fil = mwa_fee_pass[
-                                                    dis_filter
-                                                ]
-                                                null_filter = np.where(
-                                                    mwa_fee_pass_fil >= -55
-                                                )
-
-                                                offset = chisq_fit_gain(
-                                                    data=mwa_pass_fil[null_filter],
-                                                    model=mwa_fee_pass_fil[null_filter],
-                                                )
-                                                mwa_fee_pass = mwa_fee_pass + offset
-                                                mwa_pass_fit = mwa_pass
-
-                                                # more than 30 non distorted samples
+                            for sat in chan_sat_ids:
+
+                                chan = chan_map[f"{sat}"]
+
+                                sat_data = rf_apply_thresholds(
+                                    ali_file,
+                                    chrono_file,
+                                    sat,
+                                    chan,
+                                    sat_thresh,
+                                    noi_thresh,
+                                    pow_thresh,
+                                    point,
+                                    False,
+                                    out_dir,
+                                )
+
+                                if sat_data != 0:
+
+                                    (
+                                        ref_power,
+                                        tile_power,
+                                        alt,
+                                        az,
+                                        times,
+                                    ) = sat_data
+
+                                    # Altitude is in deg while az is in radians
+                                    # convert alt to radians
+                                    # za - zenith angle
+                                    alt = np.radians(alt)
+                                    za = np.pi / 2 - alt
+                                    az = np.asarray(az)
+
+                                    # Now convert to healpix coordinates
+                                    # healpix_index = hp.ang2pix(nside,θ, ɸ)
+                                    healpix_index = hp.ang2pix(nside, za, az)
+
+                                    # multiple data points fall within a single healpix pixel
+                                    # find the unique pixels and mean power in each
+                                    (
+                                        u,
+                                        ref_pass,
+                                        tile_pass,
+                                        times_pass,
+                                    ) = bin_pass(
+                                        healpix_index,
+                                        ref_power,
+                                        tile_power,
+                                        times,
+                                    )
+
+                                    ref_fee_pass = np.asarray(rotated_fee[u])
+                                    mwa_fee_pass = np.asarray(mwa_fee[u])
+
+                                    # This is the magic. Equation [1] of the paper
+                                    # A measured cross sectional slice of the MWA beam
+                                    mwa_pass = (
+                                        np.array(tile_pass)
+                                        - np.array(ref_pass)
+                                        + np.array(ref_fee_pass)
+                                    )
+
+                                    # RFE distortion is seen in tile_pass when raw power is above -30dBm
+                                    # fit the mwa_pass data to the tile_pass power level
+                                    # Mask everything below -30dBm to fit distorted MWA and tile pass
+                                    peak_filter = np.where(tile_pass >= -30)
+                                    offset = chisq_fit_gain(
+                                        data=tile_pass[peak_filter],
+                                        model=mwa_pass[peak_filter],
+                                    )
+                                    # This is a slice of the MWA beam, scaled back to the power level of the raw, distorted tile data
+                                    mwa_pass = mwa_pass + offset[0]
+
+                                    # Single multiplicative gain factor to fit MWA FEE beam slice down to tile pass power level
+                                    # MWA pass Data above -50dBm masked out because it is distorted
+                                    # Data below -60dBm maked out because FEE nulls are much deeper than the dynamic range of satellite passes
+                                    dis_filter = np.where(mwa_pass <= -35)
+                                    mwa_pass_fil = mwa_pass[dis_filter]
+                                    mwa_fee_pass_fil = mwa_fee_pass[dis_filter]
+                                    null_filter = np.where(
+                                        mwa_fee_pass_fil >= -55
+                                    )
+
+                                    offset = chisq_fit_gain(
+                                        data=mwa_pass_fil[null_filter],
+                                        model=mwa_fee_pass_fil[null_filter],
+                                    )
+                                    mwa_fee_pass = mwa_fee_pass + offset
+                                    mwa_pass_fit = mwa_pass
+
+                                    # more than 30 non distorted samples
+                                    if (
+                                        mwa_fee_pass[dis_filter][
+                                            null_filter
+                                        ].size
+                                        >= 30
+                                    ):
+
+                                        # determine how well the data fits the model with chi-square
+                                        pval = chisq_fit_test(
+                                            data=mwa_pass_fit[dis_filter][
+                                                null_filter
+                                            ],
+                                            model=mwa_fee_pass[dis_filter][
+                                                null_filter
+                                            ],
+                                        )
+
+                                        # a goodness of fit threshold
+                                        if pval >= 0.8:
+
+                                            # consider residuals of sats which pass within 21 deg of zenith
+                                            # an hp index of 111 approx corresponds to a zenith angle of 21 degrees
+                                            #  hp_10_deg = 111
+                                            hp_21_deg = 414
+
+                                            if np.amin(u) <= hp_21_deg:
+
+                                                # only passes longer than 10 minutes
                                                 if (
-                                                    mwa_fee_pass[dis_filter][
-                                                        null_filter
-                                                    ].size
-                                                    >= 30
-                                                ):
-
-                                                    # determine how well the data fits the model with chi-square
-                                                    pval = chisq_fit_test(
-                                                        data=mwa_pass_fit[dis_filter][
-                                                            null_filter
-                                                        ],
-                                                        model=mwa_fee_pass[dis_filter][
-                                                            null_filter
-                                                        ],
+                                                    np.amax(times_pass)
+                                                    - np.amin(times_pass)
+                                                ) >= 600:
+
+                                                    # residuals between scaled FEE and mwa pass
+                                                    resi = (
+                                                        mwa_fee_pass
+                                                        - mwa_pass_fit
                                                     )
-
-                                                    # a goodness of fit threshold
-                                                    if pval >= 0.8:
-
-                                                        # consider residuals of sats which pass within 21 deg of zenith
-                                                        # an hp index of 111 approx corresponds to a zenith angle of 21 degrees
-                                                        #  hp_10_deg = 111
-                                                        hp_21_deg = 414
-
-                                                        if np.amin(u) <= hp_21_deg:
-
-                                                            # only passes longer than 10 minutes
-                                                            if (
-                                                                np.amax(times_pass)
-                                                                - np.amin(times_pass)
-                                                            ) >= 600:
-
-                                                                # residuals between scaled FEE and mwa pass
-                                                                resi = (
-                                                                    mwa_fee_pass
-                                                                    - mwa_pass_fit
-                                                                )
-                                                                resi_gain[
-                                                                    "pass_data"
-                                                                ].extend(mwa_pass_fit)
-                                                                resi_gain[
-                                                                    "pass_resi"
-                                                                ].extend(resi)
+                                                    resi_gain[
+                                                        "pass_data"
+                                                    ].extend(mwa_pass_fit)
+                                                    resi_gain[
+                                                        "pass_resi"
+                                                    ].extend(resi)
 
     # Save gain residuals to json file
     with open(f"{out_dir}/{tile}_{ref}_gain_fit.json", "w") as outfile:
@@ -799,7 +970,7 @@ def rfe_batch_cali(
     :param ref_model: Path to reference feko model :samp:`.npz` file, output by :func:`~embers.tile_maps.ref_fee_healpix.ref_healpix_save`
     :param fee_map: Path to MWA fee model :samp:`.npz` file, output by :func:`~embers.mwa_utils.mwa_fee.mwa_fee_model`
     :param nside: Healpix nside
-    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`
+    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
     :param align_dir: Path to directory containing aligned rf data files, output from :func:`~embers.rf_tools.align_data.save_aligned`
     :param chrono_dir: Path to directory containing chronological ephemeris data output from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem`
     :param chan_map_dir: Path to directory containing satellite frequency channel maps. Output from :func:`~embers.sat_utils.sat_channels.batch_window_map`
@@ -828,25 +999,33 @@ def rfe_batch_cali(
     # Save logs
     Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-    # Parallization magic happens here
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
-        executor.map(
-            rfe_calibration,
-            repeat(start_date),
-            repeat(stop_date),
-            tile_pairs,
-            repeat(sat_thresh),
-            repeat(noi_thresh),
-            repeat(pow_thresh),
-            repeat(ref_model),
-            repeat(fee_map),
-            repeat(nside),
-            repeat(obs_point_json),
-            repeat(align_dir),
-            repeat(chrono_dir),
-            repeat(chan_map_dir),
-            repeat(out_dir),
-        )
+    # Index pointings once, to be shared by all workers
+    point_index = pointing_index(obs_point_json)
+
+    # Rotate models once, to be shared by all workers
+    with tempfile.TemporaryDirectory(dir=out_dir) as models:
+        model_registry(ref_model, fee_map, nside, models)
+
+        # Parallization magic happens here
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+            executor.map(
+                rfe_calibration,
+                repeat(start_date),
+                repeat(stop_date),
+                tile_pairs,
+                repeat(sat_thresh),
+                repeat(noi_thresh),
+                repeat(pow_thresh),
+                repeat(ref_model),
+                repeat(fee_map),
+                repeat(nside),
+                repeat(point_index),
+                repeat(align_dir),
+                repeat(chrono_dir),
+                repeat(chan_map_dir),
+                repeat(out_dir),
+                repeat(models),
+            )
 
     rfe_collate_cali(start_gain, stop_gain, out_dir)
 
@@ -869,6 +1048,8 @@ def project_tile_healpix(
     out_dir,
     plots,
     rfe_cali_bool,
+    models=None,
+    map_format="npz",
 ):
     """There be magic here. Project satellite RF data onto a sky healpix map.
 
@@ -904,6 +1085,11 @@ def project_tile_healpix(
     purposes, and determining where errors in the final tile maps come from. The time maps contain the times of every data point added
     to the above maps.
 
+    With :samp:`map_format="tmap"`, the maps are instead saved to a :samp:`.tmap` file by :func:`~embers.tile_maps.map_columns.save_maps`,
+    as flat arrays of samples with CSR style offsets of the healpix pixels of each satellite at each pointing. These are memory mapped
+    by :func:`~embers.tile_maps.map_columns.load_maps`, without pickle, and only the samples of the satellites and pointings selected
+    by :func:`~embers.tile_maps.map_columns.pixel_maps` are read from disk.
+
     :param start_date: Start date in :samp:`YYYY-MM-DD-HH:MM` format
     :param stop_date: Stop date in :samp:`YYYY-MM-DD-HH:MM` format
     :param tile_pair: A pair of reference and MWA tile names. Ex: ["rf0XX", "S06XX"]
@@ -914,24 +1100,80 @@ def project_tile_healpix(
     :param fee_map: Path to MWA fee model :samp:`.npz` file, output by :func:`~embers.mwa_utils.mwa_fee.mwa_fee_model`
     :param rfe_cali: Path to RFE gain calibration solution, output by :func:`~embers.tile_maps.tile_maps.rfe_collate_cali`
     :param nside: Healpix nside
-    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`
+    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
     :param align_dir: Path to directory containing aligned rf data files, output from :func:`~embers.rf_tools.align_data.save_aligned`
     :param chrono_dir: Path to directory containing chronological ephemeris data output from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem`
     :param chan_map_dir: Path to directory containing satellite frequency channel maps. Output from :func:`~embers.sat_utils.sat_channels.batch_window_map`
     :param out_dir: Output directory where rfe calibration data will be saved as a :samp:`json` file
     :param plots: If True, create a zillion diagnostic plots
     :param rfe_cali_bool: Turn RFE calibration on or off. True/False
+    :param models: Path to directory of models from :func:`~embers.tile_maps.tile_maps.model_registry`. Default=None, which loads :samp:`ref_model` and :samp:`fee_map`
+    :param map_format: Format of tile maps, :samp:`npz` or :samp:`tmap`. Default=npz :class:`~str`
 
     :returns:
-        - Tile maps saved as :samp:`.npz` file to :samp:`out_dir`
+        - Tile maps saved as :samp:`.npz` or :samp:`.tmap` file to :samp:`out_dir`
 
     """
 
-    ref, tile = tile_pair
+    tile_data = project_tile_passes(
+        start_date,
+        stop_date,
+        tile_pair,
+        sat_thresh,
+        noi_thresh,
+        pow_thresh,
+        ref_model,
+        fee_map,
+        rfe_cali,
+        nside,
+        obs_point_json,
+        align_dir,
+        chrono_dir,
+        chan_map_dir,
+        out_dir,
+        plots,
+        rfe_cali_bool,
+        models=models,
+    )
 
-    pointings = ["0", "2", "4", "41"]
+    save_tile_maps(tile_data, tile_pair, nside, out_dir, map_format=map_format)
 
-    dates, timestamps = time_tree(start_date, stop_date)
+
+def project_tile_passes(
+    start_date,
+    stop_date,
+    tile_pair,
+    sat_thresh,
+    noi_thresh,
+    pow_thresh,
+    ref_model,
+    fee_map,
+    rfe_cali,
+    nside,
+    obs_point_json,
+    align_dir,
+    chrono_dir,
+    chan_map_dir,
+    out_dir,
+    plots,
+    rfe_cali_bool,
+    models=None,
+):
+    """Project satellite passes of a tile pair within a date interval onto healpix pixels.
+
+    The projection step of :func:`~embers.tile_maps.tile_maps.project_tile_healpix`, which takes the same parameters. Passes are
+    accumulated in map columns, so that the columns of consecutive date intervals can be projected in parallel and joined with
+    :func:`~embers.tile_maps.map_columns.merge_columns`.
+
+    :returns:
+        - tile_data - map columns from :func:`~embers.tile_maps.map_columns.map_columns` :class:`~dict`
+
+    """
+
+    ref, tile = tile_pair
+
+    dates, _ = time_tree(start_date, stop_date)
+    point_index = pointing_index(obs_point_json)
 
     if plots is True:
         Path(f"{out_dir}/tile_maps_raw/pass_plots/{tile}_{ref}/0").mkdir(
@@ -960,328 +1202,264 @@ def project_tile_healpix(
             parents=True, exist_ok=True
         )
 
-    # Initialize an empty dictionary for tile data
-    # The map is list of length 12288 of empty lists to append pixel values to
-    # keep track of which satellites contributed which data
-    tile_data = {
-        "mwa_maps": {
-            p: [[] for pixel in range(hp.nside2npix(nside))] for p in pointings
-        },
-        "ref_maps": {
-            p: [[] for pixel in range(hp.nside2npix(nside))] for p in pointings
-        },
-        "tile_maps": {
-            p: [[] for pixel in range(hp.nside2npix(nside))] for p in pointings
-        },
-        "sat_map": {
-            p: [[] for pixel in range(hp.nside2npix(nside))] for p in pointings
-        },
-        "times": {p: [[] for pixel in range(hp.nside2npix(nside))] for p in pointings},
-    }
+    # Initialize empty columns of tile data
+    # Every pixel of every pass is appended along with the pointing and satellite
+    # to keep track of which satellites contributed which data
+    tile_data = map_columns()
 
-    # Load reference FEE model
-    # Rotate the fee models by -pi/2 to move model from spherical (E=0) to Alt/Az (N=0)
-    ref_fee_model = np.load(ref_model, allow_pickle=True)
+    if models is not None:
+        rotated_fee, fee_m = load_models(models, tile)
 
-    fee_m = np.load(fee_map, allow_pickle=True)
-
-    if "XX" in tile:
-        ref_fee = ref_fee_model["XX"]
-        rotated_fee = rotate_map(nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee)
     else:
-        ref_fee = ref_fee_model["YY"]
-        rotated_fee = rotate_map(nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee)
+        # Load reference FEE model
+        # Rotate the fee models by -pi/2 to move model from spherical (E=0) to Alt/Az (N=0)
+        ref_fee_model = np.load(ref_model, allow_pickle=True)
+
+        fee_m = np.load(fee_map, allow_pickle=True)
 
-    for day in range(len(dates)):
+        if "XX" in tile:
+            ref_fee = ref_fee_model["XX"]
+            rotated_fee = rotate_map(
+                nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee
+            )
+        else:
+            ref_fee = ref_fee_model["YY"]
+            rotated_fee = rotate_map(
+                nside, angle=-(1 * np.pi) / 2.0, healpix_array=ref_fee
+            )
 
-        for window in range(len(timestamps[day])):
-            timestamp = timestamps[day][window]
+    # Only the observation windows at MWA sweet-pointings
+    windows, points = pointing_windows(
+        point_index, f"{dates[0]}-00:00", f"{dates[-1]}-23:30"
+    )
 
-            # pointing at timestamp
-            point = check_pointing(timestamp, obs_point_json)
+    for timestamp, point in zip(windows.tolist(), points.tolist()):
+        date = timestamp[:10]
 
-            if point is not None:
+        if "XX" in tile:
+            mwa_fee = fee_m[str(point)][0]
+        else:
+            mwa_fee = fee_m[str(point)][1]
 
-                if "XX" in tile:
-                    mwa_fee = fee_m[str(point)][0]
-                else:
-                    mwa_fee = fee_m[str(point)][1]
+        ali_file = Path(
+            f"{align_dir}/{date}/{timestamp}/{ref}_{tile}_{timestamp}_aligned.npz"
+        )
 
-                ali_file = Path(
-                    f"{align_dir}/{dates[day]}/{timestamp}/{ref}_{tile}_{timestamp}_aligned.npz"
-                )
+        # check if file exists
+        if ali_file.is_file():
 
-                # check if file exists
-                if ali_file.is_file():
+            # Chrono and map Ephemeris file
+            chrono_file = chrono_path(chrono_dir, timestamp)
+            channel_map = Path(f"{chan_map_dir}/{timestamp}.json")
 
-                    # Chrono and map Ephemeris file
-                    chrono_file = Path(f"{chrono_dir}/{timestamp}.json")
-                    channel_map = Path(f"{chan_map_dir}/{timestamp}.json")
+            chrono_ephem = read_chrono(chrono_file)
 
-                    with open(chrono_file) as chrono:
-                        chrono_ephem = json.load(chrono)
+            if chrono_ephem != []:
 
-                        if chrono_ephem != []:
+                norad_list = [
+                    chrono_ephem[s]["sat_id"][0]
+                    for s in range(len(chrono_ephem))
+                ]
 
-                            norad_list = [
-                                chrono_ephem[s]["sat_id"][0]
-                                for s in range(len(chrono_ephem))
-                            ]
+                if norad_list != []:
 
-                            if norad_list != []:
+                    if channel_map.is_file():
 
-                                if channel_map.is_file():
+                        with open(channel_map) as ch_map:
+                            chan_map = json.load(ch_map)
 
-                                    with open(channel_map) as ch_map:
-                                        chan_map = json.load(ch_map)
+                            chan_sat_ids = [
+                                int(i) for i in list(chan_map.keys())
+                            ]
 
-                                        chan_sat_ids = [
-                                            int(i) for i in list(chan_map.keys())
+                            for sat in chan_sat_ids:
+
+                                chan = chan_map[f"{sat}"]
+
+                                sat_data = rf_apply_thresholds(
+                                    ali_file,
+                                    chrono_file,
+                                    sat,
+                                    chan,
+                                    sat_thresh,
+                                    noi_thresh,
+                                    pow_thresh,
+                                    point,
+                                    plots,
+                                    f"{out_dir}/tile_maps_raw",
+                                )
+
+                                if sat_data != 0:
+
+                                    (
+                                        ref_power,
+                                        tile_power,
+                                        alt,
+                                        az,
+                                        times,
+                                    ) = sat_data
+
+                                    # Altitude is in deg while az is in radians
+                                    # convert alt to radians
+                                    # za - zenith angle
+                                    alt = np.radians(alt)
+                                    za = np.pi / 2 - alt
+                                    az = np.asarray(az)
+
+                                    # Now convert to healpix coordinates
+                                    # healpix_index = hp.ang2pix(nside,θ, ɸ)
+                                    healpix_index = hp.ang2pix(nside, za, az)
+
+                                    # multiple data points fall within a single healpix pixel
+                                    # find the unique pixels and mean power in each
+                                    (
+                                        u,
+                                        ref_pass,
+                                        tile_pass,
+                                        times_pass,
+                                    ) = bin_pass(
+                                        healpix_index,
+                                        ref_power,
+                                        tile_power,
+                                        times,
+                                    )
+
+                                    ref_fee_pass = np.asarray(rotated_fee[u])
+                                    mwa_fee_pass = np.asarray(mwa_fee[u])
+
+                                    # implement RFE gain corrections here
+                                    # Read in RFE gain calibration solution
+                                    rfe_polyfit = np.load(rfe_cali)
+                                    gain_cal = np.poly1d(rfe_polyfit)
+
+                                    # The max root of the polynomial is where we begin to apply the gain correction from
+                                    rfe_thresh = max(gain_cal.roots)
+
+                                    # Turn RFE calibrati on or off
+                                    if rfe_cali_bool is True:
+
+                                        # When the power exceeds rfe_thresh, add to it using the rfe gain polynomial
+                                        tile_pass_rfe = [
+                                            i + gain_cal(i)
+                                            if i >= rfe_thresh
+                                            else i
+                                            for i in tile_pass
                                         ]
 
-                                        for sat in chan_sat_ids:
-
-                                            chan = chan_map[f"{sat}"]
+                                    else:
+                                        tile_pass_rfe = tile_pass
+
+                                    # magic here
+                                    # the beam shape finally emerges
+                                    # mwa_pass = np.array(tile_pass) - np.array(ref_pass) + np.array(ref_fee_pass)
+                                    mwa_pass = (
+                                        np.array(tile_pass_rfe)
+                                        - np.array(ref_pass)
+                                        + np.array(ref_fee_pass)
+                                    )
+
+                                    # fit the power level of the pass to the mwa_fee model using a single gain value
+                                    offset = chisq_fit_gain(
+                                        data=mwa_pass, model=mwa_fee_pass
+                                    )
+
+                                    mwa_pass_fit = mwa_pass - offset[0]
+
+                                    if mwa_pass_fit.size != 0:
+
+                                        # determine how well the data fits the model with chi-square
+                                        pval = chisq_fit_test(
+                                            data=mwa_pass_fit,
+                                            model=mwa_fee_pass,
+                                        )
+
+                                        if plots is True:
+                                            mwa_pass_raw = (
+                                                np.array(tile_pass)
+                                                - np.array(ref_pass)
+                                                + np.array(ref_fee_pass)
+                                            )
+                                            offset = chisq_fit_gain(
+                                                data=mwa_pass_raw,
+                                                model=mwa_fee_pass,
+                                            )
+                                            mwa_pass_fit_raw = (
+                                                mwa_pass_raw - offset[0]
+                                            )
 
-                                            sat_data = rf_apply_thresholds(
-                                                ali_file,
-                                                chrono_file,
-                                                sat,
-                                                chan,
-                                                sat_thresh,
-                                                noi_thresh,
-                                                pow_thresh,
+                                            plt_fee_fit(
+                                                times_pass,
+                                                mwa_fee_pass,
+                                                mwa_pass_fit_raw,
+                                                mwa_pass_fit,
+                                                f"{out_dir}/tile_maps_raw/fit_plots/{tile}_{ref}/",
                                                 point,
-                                                plots,
-                                                f"{out_dir}/tile_maps_raw",
+                                                timestamp,
+                                                sat,
                                             )
 
-                                            if sat_data != 0:
-
-                                                (
-                                                    ref_power,
-                                                    tile_power,
-                                                    alt,
-                                                    az,
-                                                    times,
-                                                ) = sat_data
-
-                                                # Altitude is in deg while az is in radians
-                                                # convert alt to radians
-                                                # za - zenith angle
-                                                alt = np.radians(alt)
-                                                za = np.pi / 2 - alt
-                                                az = np.asarray(az)
-
-                                                # Now convert to healpix coordinates
-                                                # healpix_index = hp.ang2pix(nside,θ, ɸ)
-                                                healpix_index = hp.ang2pix(
-                                                    nside, za, az
-                                                )
-
-                                                # multiple data points fall within a single healpix pixel
-                                                # find the unique pixels
-                                                u = np.unique(healpix_index)
-
-                                                ref_pass = np.array(
-                                                    [
-                                                        np.nanmean(
-                                                            ref_power[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )[0]
-                                                            ]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-                                                tile_pass = np.array(
-                                                    [
-                                                        np.nanmean(
-                                                            tile_power[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )[0]
-                                                            ]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-                                                times_pass = np.array(
-                                                    [
-                                                        np.mean(
-                                                            times[
-                                                                np.where(
-                                                                    healpix_index == i
-                                                                )
-                                                            ][0]
-                                                        )
-                                                        for i in u
-                                                    ]
-                                                )
-                                                ref_fee_pass = np.array(
-                                                    [rotated_fee[i] for i in u]
-                                                )
-                                                mwa_fee_pass = np.array(
-                                                    [mwa_fee[i] for i in u]
-                                                )
-
-                                                # implement RFE gain corrections here
-                                                # Read in RFE gain calibration solution
-                                                rfe_polyfit = np.load(rfe_cali)
-                                                gain_cal = np.poly1d(rfe_polyfit)
-
-                                                # The max root of the polynomial is where we begin to apply the gain correction from
-                                                rfe_thresh = max(gain_cal.roots)
-
-                                                # Turn RFE calibrati on or off
-                                                if rfe_cali_bool is True:
-
-                                                    # When the power exceeds rfe_thresh, add to it using the rfe gain polynomial
-                                                    tile_pass_rfe = [
-                                                        i + gain_cal(i)
-                                                        if i >= rfe_thresh
-                                                        else i
-                                                        for i in tile_pass
-                                                    ]
-
-                                                else:
-                                                    tile_pass_rfe = tile_pass
-
-                                                # magic here
-                                                # the beam shape finally emerges
-                                                # mwa_pass = np.array(tile_pass) - np.array(ref_pass) + np.array(ref_fee_pass)
-                                                mwa_pass = (
-                                                    np.array(tile_pass_rfe)
-                                                    - np.array(ref_pass)
-                                                    + np.array(ref_fee_pass)
-                                                )
-
-                                                # fit the power level of the pass to the mwa_fee model using a single gain value
-                                                offset = chisq_fit_gain(
-                                                    data=mwa_pass, model=mwa_fee_pass
-                                                )
-
-                                                mwa_pass_fit = mwa_pass - offset[0]
-
-                                                if mwa_pass_fit.size != 0:
-
-                                                    # determine how well the data fits the model with chi-square
-                                                    pval = chisq_fit_test(
-                                                        data=mwa_pass_fit,
-                                                        model=mwa_fee_pass,
-                                                    )
+                                        # a goodness of fit threshold
+                                        if pval >= 0.8:
 
-                                                    if plots is True:
-                                                        mwa_pass_raw = (
-                                                            np.array(tile_pass)
-                                                            - np.array(ref_pass)
-                                                            + np.array(ref_fee_pass)
-                                                        )
-                                                        offset = chisq_fit_gain(
-                                                            data=mwa_pass_raw,
-                                                            model=mwa_fee_pass,
-                                                        )
-                                                        mwa_pass_fit_raw = (
-                                                            mwa_pass_raw - offset[0]
-                                                        )
-
-                                                        plt_fee_fit(
-                                                            times_pass,
-                                                            mwa_fee_pass,
-                                                            mwa_pass_fit_raw,
-                                                            mwa_pass_fit,
-                                                            f"{out_dir}/tile_maps_raw/fit_plots/{tile}_{ref}/",
-                                                            point,
-                                                            timestamp,
-                                                            sat,
-                                                        )
-
-                                                    # a goodness of fit threshold
-                                                    if pval >= 0.8:
-
-                                                        # loop though all healpix pixels for the pass
-                                                        for i in range(len(u)):
-
-                                                            tile_data["mwa_maps"][
-                                                                f"{point}"
-                                                            ][u[i]].append(
-                                                                mwa_pass_fit[i]
-                                                            )
-                                                            tile_data["ref_maps"][
-                                                                f"{point}"
-                                                            ][u[i]].append(ref_pass[i])
-                                                            tile_data["tile_maps"][
-                                                                f"{point}"
-                                                            ][u[i]].append(tile_pass[i])
-                                                            tile_data["times"][
-                                                                f"{point}"
-                                                            ][u[i]].append(
-                                                                times_pass[i]
-                                                            )
-                                                            tile_data["sat_map"][
-                                                                f"{point}"
-                                                            ][u[i]].append(sat)
-
-                else:
-                    print(f"Missing {ref}_{tile}_{timestamp}_aligned.npz")
-                    continue
+                                            append_pass(
+                                                tile_data,
+                                                u,
+                                                point,
+                                                sat,
+                                                times_pass,
+                                                mwa_pass_fit,
+                                                ref_pass,
+                                                tile_pass,
+                                            )
 
-    # Sort data by satellites
+        else:
+            print(f"Missing {ref}_{tile}_{timestamp}_aligned.npz")
+            continue
 
-    # list of all possible satellites
-    sat_ids = list(norad_ids().values())
+    return tile_data
 
-    # create a dictionary, with the keys being sat_ids and the values being healpix maps of data from those sats
-    # Fist level keys are pointings with dictionaty values
-    # Second level keys are satellite ids with healpix map lists
-    mwa_sat_data = {}
-    ref_sat_data = {}
-    tile_sat_data = {}
-    time_sat_data = {}
 
-    # loop over pointings for all maps
-    for p in pointings:
+def save_tile_maps(tile_data, tile_pair, nside, out_dir, map_format="npz"):
+    """Sort projected tile data by satellite and save raw tile maps.
 
-        mwa_map = np.asarray(tile_data["mwa_maps"][p])
-        tile_map = np.asarray(tile_data["tile_maps"][p])
-        ref_map = np.asarray(tile_data["ref_maps"][p])
-        sat_map = np.asarray(tile_data["sat_map"][p])
-        time_map = np.asarray(tile_data["times"][p])
+    :param tile_data: map columns from :func:`~embers.tile_maps.tile_maps.project_tile_passes` :class:`~dict`
+    :param tile_pair: A pair of reference and MWA tile names. Ex: ["rf0XX", "S06XX"]
+    :param nside: Healpix nside
+    :param out_dir: Output directory where tile maps will be saved
+    :param map_format: Format of tile maps, :samp:`npz` or :samp:`tmap`. Default=npz :class:`~str`
 
-        mwa_sat_data[p] = {}
-        ref_sat_data[p] = {}
-        tile_sat_data[p] = {}
-        time_sat_data[p] = {}
+    :returns:
+        - Tile maps saved as :samp:`.npz` or :samp:`.tmap` file to :samp:`{out_dir}/tile_maps_raw`
 
-        # loop over all sats
-        for s in sat_ids:
+    """
 
-            mwa_sat_data[p][s] = []
-            ref_sat_data[p][s] = []
-            tile_sat_data[p][s] = []
-            time_sat_data[p][s] = []
+    ref, tile = tile_pair
 
-            # loop over every healpix pixel
-            for i in range(len(ref_map)):
+    pointings = ["0", "2", "4", "41"]
 
-                # Find subset of data for each sat
-                sat_idx = np.where(np.asarray(sat_map[i]) == s)
-                mwa_sat_data[p][s].append((np.asarray(mwa_map[i])[sat_idx]).tolist())
-                ref_sat_data[p][s].append((np.asarray(ref_map[i])[sat_idx]).tolist())
-                tile_sat_data[p][s].append((np.asarray(tile_map[i])[sat_idx]).tolist())
-                time_sat_data[p][s].append((np.asarray(time_map[i])[sat_idx]).tolist())
+    # Sort data by satellites
+
+    # list of all possible satellites
+    sat_ids = list(norad_ids().values())
 
-    # Save map arrays to npz file
-    tile_sat_data = {
-        "mwa_map": mwa_sat_data,
-        "ref_map": ref_sat_data,
-        "tile_map": tile_sat_data,
-        "time_map": time_sat_data,
-    }
     tile_maps_raw = Path(f"{out_dir}/tile_maps_raw")
     tile_maps_raw.mkdir(parents=True, exist_ok=True)
-    np.savez_compressed(f"{tile_maps_raw}/{tile}_{ref}_sat_maps.npz", **tile_sat_data)
+
+    if map_format == "tmap":
+        # Save CSR maps of each satellite at each pointing
+        tile_sat_data = column_maps(stack_columns(tile_data), pointings, sat_ids, nside)
+        save_maps(tile_sat_data, f"{tile_maps_raw}/{tile}_{ref}_sat_maps.tmap")
+
+    else:
+        # create a dictionary, with the keys being sat_ids and the values being healpix maps of data from those sats
+        # Fist level keys are map names, second level keys are pointings
+        # Third level keys are satellite ids with healpix map lists
+        tile_sat_data = sat_pixel_maps(tile_data, pointings, sat_ids, nside)
+
+        # Save map arrays to npz file
+        np.savez_compressed(
+            f"{tile_maps_raw}/{tile}_{ref}_sat_maps.npz", **tile_sat_data
+        )
 
 
 def mwa_clean_maps(nside, tile_map_raw, out_dir):
@@ -1293,8 +1471,11 @@ def mwa_clean_maps(nside, tile_map_raw, out_dir):
     satellites, identified for being active in the frequency band. Using this list of :samp:`good_sats`, significantly improves the
     quality of beam maps.
 
+    Raw :samp:`.tmap` maps are cleaned into :samp:`.tmap` maps by :func:`~embers.tile_maps.map_columns.merge_sats`, which only reads
+    the samples of the good satellites, and stores them under a single satellite ID of 0 at each pointing.
+
     :param nside: Healpix nside
-    :param tile_map_raw: Path to a tile_map_raw.npz file created by :func:`~embers.tile_maps.tile_maps.project_tile_healpix`
+    :param tile_map_raw: Path to a tile_map_raw.npz or .tmap file created by :func:`~embers.tile_maps.tile_maps.project_tile_healpix`
     :param out_dir: Output directory where rfe calibration data will be saved as a :samp:`json` file
 
     :returns:
@@ -1326,6 +1507,17 @@ def mwa_clean_maps(nside, tile_map_raw, out_dir):
         44387,
     ]
 
+    mwa_good = Path(f"{out_dir}/tile_maps_clean")
+    mwa_good.mkdir(parents=True, exist_ok=True)
+
+    if Path(tile_map_raw).suffix == ".tmap":
+        tile_raw = load_maps(tile_map_raw)
+        save_maps(
+            merge_sats(tile_raw, good_sats, "mwa"),
+            f"{mwa_good}/{tile}_{ref}_tile_maps.tmap",
+        )
+        return
+
     # list of beam pointings
     pointings = ["0", "2", "4", "41"]
 
@@ -1350,8 +1542,6 @@ def mwa_clean_maps(nside, tile_map_raw, out_dir):
         mwa_maps_good[p].extend(mwa_map_good)
 
     # Save map arrays to npz file
-    mwa_good = Path(f"{out_dir}/tile_maps_clean")
-    mwa_good.mkdir(parents=True, exist_ok=True)
     np.savez_compressed(f"{mwa_good}/{tile}_{ref}_tile_maps.npz", **mwa_maps_good)
 
 
@@ -1366,13 +1556,16 @@ def plt_sat_maps(sat, out_dir):
 
     """
 
-    f = Path(f"{out_dir}/tile_maps_raw/S07XX_rf0XX_sat_maps.npz")
+    f = map_path(f"{out_dir}/tile_maps_raw", "S07XX_rf0XX_sat_maps")
 
     pointings = ["0", "2", "4", "41"]
 
-    # load data from map .npz file
-    tile_data = np.load(f, allow_pickle=True)
-    tile_data = {key: tile_data[key].item() for key in tile_data}
+    # load data from map file
+    if f.suffix == ".tmap":
+        maps = load_maps(f)
+    else:
+        tile_data = np.load(f, allow_pickle=True)
+        tile_data = {key: tile_data[key].item() for key in tile_data}
 
     for p in pointings:
 
@@ -1384,11 +1577,12 @@ def plt_sat_maps(sat, out_dir):
             plt.style.use("seaborn")
             fig = plt.figure(figsize=(10, 10))
             fig.suptitle(f"Satellite [{sat}] @ pointing {p}", fontsize=16)
-            tile_sat_med = [
-                (np.median(i) if i != [] else np.nan)
-                for i in tile_data["mwa_map"][p][sat]
-            ]
-            plot_healpix(data_map=np.asarray(tile_sat_med), sub=(1, 1, 1), cmap=jade)
+            if f.suffix == ".tmap":
+                sat_stats = pixel_stats(*pixel_maps(maps, "mwa", [p], [sat]))
+            else:
+                sat_stats = ragged_stats(tile_data["mwa_map"][p][sat])
+            tile_sat_med = sat_stats["median"]
+            plot_healpix(data_map=tile_sat_med, sub=(1, 1, 1), cmap=jade)
             plt.savefig(
                 f"{out_dir}/tile_maps_raw/sat_plots/{p}/{sat}_{p}_passes.png",
                 bbox_inches="tight",
@@ -1401,7 +1595,7 @@ def plt_sat_maps(sat, out_dir):
 def plt_clean_maps(clean_map, out_dir):
     """Plot healpix clean beam, error and count maps at all pointings.
 
-    :param clean_map: Path to a clean_map.npz data file created by :func:`~embers.tile_maps.tile_maps.mwa_clean_maps`
+    :param clean_map: Path to a clean_map.npz or .tmap data file created by :func:`~embers.tile_maps.tile_maps.mwa_clean_maps`
     :param out_dir: The output directory where the clean maps will be saved
 
     :returns:
@@ -1414,8 +1608,11 @@ def plt_clean_maps(clean_map, out_dir):
 
     pointings = ["0", "2", "4", "41"]
 
-    # load data from map .npz file
-    tile_data = np.load(f, allow_pickle=True)
+    # load data from map file
+    if f.suffix == ".tmap":
+        maps = load_maps(f)
+    else:
+        tile_data = np.load(f, allow_pickle=True)
 
     for p in pointings:
 
@@ -1429,11 +1626,19 @@ def plt_clean_maps(clean_map, out_dir):
             parents=True, exist_ok=True
         )
 
+        # median, MAD and counts of all pixels at once
+        try:
+            if f.suffix == ".tmap":
+                tile_stats = pixel_stats(*pixel_maps(maps, "mwa", [p]))
+            else:
+                tile_stats = ragged_stats(tile_data[p])
+        except Exception as e:
+            print(e)
+            continue
+
         # healpix meadian map
         try:
-            tile_map_med = np.asarray(
-                [(np.nanmedian(i) if i != [] else np.nan) for i in tile_data[p]]
-            )
+            tile_map_med = tile_stats["median"]
 
             plt.style.use("seaborn")
             fig = plt.figure(figsize=(10, 10))
@@ -1451,14 +1656,7 @@ def plt_clean_maps(clean_map, out_dir):
 
         # Plot MAD
         try:
-            tile_map_mad = []
-            for j in tile_data[p]:
-                if j != []:
-                    j = np.asarray(j)
-                    j = j[~np.isnan(j)]
-                    tile_map_mad.append(mad(j))
-                else:
-                    tile_map_mad.append(np.nan)
+            tile_map_mad = tile_stats["mad"]
 
             vmin = np.nanmin(tile_map_mad)
             vmax = np.nanmax(tile_map_mad)
@@ -1483,7 +1681,7 @@ def plt_clean_maps(clean_map, out_dir):
 
         # Plot satellite pass counts in pix
         try:
-            tile_map_counts = [len(np.array(i)[~np.isnan(i)]) for i in tile_data[p]]
+            tile_map_counts = tile_stats["count"]
 
             plt.style.use("seaborn")
             fig = plt.figure(figsize=(10, 10))
@@ -1504,6 +1702,23 @@ def plt_clean_maps(clean_map, out_dir):
             print(e)
 
 
+def _date_chunks(start_date, stop_date, chunk_days):
+    """Split a date interval into consecutive intervals of :samp:`chunk_days` days."""
+
+    dates, _ = time_tree(start_date, stop_date)
+
+    return [
+        (dates[i], dates[min(i + chunk_days, len(dates)) - 1])
+        for i in range(0, len(dates), chunk_days)
+    ]
+
+
+def _save_merged_maps(partials, tile_pair, nside, out_dir, map_format):
+    """Merge the map columns of all chunks of a tile pair, in order of date, and save its raw tile maps."""
+
+    save_tile_maps(merge_columns(partials), tile_pair, nside, out_dir, map_format)
+
+
 def tile_maps_batch(
     start_date,
     stop_date,
@@ -1522,6 +1737,8 @@ def tile_maps_batch(
     plots,
     rfe_cali_bool=True,
     max_cores=None,
+    map_format="npz",
+    chunk_days=None,
 ):
     """Batch process satellite RF data to create clean beam maps and all intermediate data products.
 
@@ -1529,6 +1746,12 @@ def tile_maps_batch(
     contain data from only the 18 satellites found to be consitently transmitting in the correct frequency band. Plots of satellite
     coverage and final clean beam maps are also saved to the out_dir.
 
+    The date interval is split into chunks of :samp:`chunk_days` days, and every chunk of every tile pair is projected in parallel by
+    :func:`~embers.tile_maps.tile_maps.project_tile_passes`. As soon as all chunks of a tile pair are projected, its partial map columns
+    are merged with :func:`~embers.tile_maps.map_columns.merge_columns` and saved by :func:`~embers.tile_maps.tile_maps.save_tile_maps`
+    in a single worker of the same pool, while the chunks of other pairs are still being projected. All :samp:`max_cores` cores are
+    kept busy even when there are fewer tile pairs than cores, and only the chunks of unfinished pairs are held in memory.
+
     :param start_date: Start date in :samp:`YYYY-MM-DD-HH:MM` format
     :param stop_date: Stop date in :samp:`YYYY-MM-DD-HH:MM` format
     :param start_gain: Power at which RFE gain variations begin. Ex: -50dBm
@@ -1540,7 +1763,7 @@ def tile_maps_batch(
     :param fee_map: Path to MWA fee model :samp:`.npz` file, output by :func:`~embers.mwa_utils.mwa_fee.mwa_fee_model`
     :param rfe_cali: Path to RFE gain calibration solution, output by :func:`~embers.tile_maps.tile_maps.rfe_collate_cali`
     :param nside: Healpix nside
-    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`
+    :param obs_point_json: Path to :samp:`obs_pointings.json` created by :func:`~embers.mwa_utils.mwa_pointings.obs_pointings`, or an index from :func:`~embers.tile_maps.tile_maps.pointing_index`
     :param align_dir: Path to directory containing aligned rf data files, output from :func:`~embers.rf_tools.align_data.save_aligned`
     :param chrono_dir: Path to directory containing chronological ephemeris data output from :func:`~embers.sat_utils.chrono_ephem.save_chrono_ephem`
     :param chan_map_dir: Path to directory containing satellite frequency channel maps. Output from :func:`~embers.sat_utils.sat_channels.batch_window_map`
@@ -1548,6 +1771,8 @@ def tile_maps_batch(
     :param plots: If True, create a zillion diagnostic plots for the :func:`~embers.tile_maps.tile_maps.project_tile_healpix` stage
     :param rfe_cali_bool: Turn RFE calibration on or off. Default=True.
     :param max_cores: Maximum number of cores to be used by this script. Default=None, which means that all available cores are used
+    :param map_format: Format of tile maps, :samp:`npz` or :samp:`tmap`. Default=npz :class:`~str`
+    :param chunk_days: Number of days projected by each worker. Default=None, which splits each tile pair into about two chunks per core
 
     """
 
@@ -1568,37 +1793,88 @@ def tile_maps_batch(
     # Save logs
     Path(out_dir).mkdir(parents=True, exist_ok=True)
 
-    # Parallization magic happens here
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
-        executor.map(
-            project_tile_healpix,
-            repeat(start_date),
-            repeat(stop_date),
-            tile_pairs,
-            repeat(sat_thresh),
-            repeat(noi_thresh),
-            repeat(pow_thresh),
-            repeat(ref_model),
-            repeat(fee_map),
-            repeat(rfe_cali),
-            repeat(nside),
-            repeat(obs_point_json),
-            repeat(align_dir),
-            repeat(chrono_dir),
-            repeat(chan_map_dir),
-            repeat(out_dir),
-            repeat(plots),
-            repeat(rfe_cali_bool),
-        )
+    # Index pointings once, to be shared by all workers
+    point_index = pointing_index(obs_point_json)
+
+    # Rotate models once, to be shared by all workers
+    with tempfile.TemporaryDirectory(dir=out_dir) as models:
+        model_registry(ref_model, fee_map, nside, models)
+
+        # Split the date interval of every tile pair into chunks of days
+        if chunk_days is None:
+            cores = max_cores or os.cpu_count()
+            days = len(time_tree(start_date, stop_date)[0])
+            chunks_per_pair = math.ceil(2 * cores / len(tile_pairs))
+            chunk_days = max(1, math.ceil(days / chunks_per_pair))
+
+        chunks = _date_chunks(start_date, stop_date, chunk_days)
+
+        # Parallization magic happens here
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
+            projections = {}
+            for i, tile_pair in enumerate(tile_pairs):
+                for j, (start, stop) in enumerate(chunks):
+                    future = executor.submit(
+                        project_tile_passes,
+                        start,
+                        stop,
+                        tile_pair,
+                        sat_thresh,
+                        noi_thresh,
+                        pow_thresh,
+                        ref_model,
+                        fee_map,
+                        rfe_cali,
+                        nside,
+                        point_index,
+                        align_dir,
+                        chrono_dir,
+                        chan_map_dir,
+                        out_dir,
+                        plots,
+                        rfe_cali_bool,
+                        models,
+                    )
+                    projections[future] = (i, j)
+
+            # Merge and save each tile pair as soon as all of its chunks are projected,
+            # keeping the chunks of each pair in order of date
+            pair_data = [[None] * len(chunks) for _ in tile_pairs]
+            n_pending = [len(chunks)] * len(tile_pairs)
+            saves = []
+            for future in concurrent.futures.as_completed(projections):
+                i, j = projections.pop(future)
+                pair_data[i][j] = future.result()
+                n_pending[i] -= 1
+
+                if n_pending[i] == 0:
+                    saves.append(
+                        executor.submit(
+                            _save_merged_maps,
+                            pair_data[i],
+                            tile_pairs[i],
+                            nside,
+                            out_dir,
+                            map_format,
+                        )
+                    )
+                    pair_data[i] = None
+
+            for future in saves:
+                future.result()
 
     sat_list = list(norad_ids().values())
-    with concurrent.futures.ProcessPoolExecutor() as executor:
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
         executor.map(plt_sat_maps, sat_list, repeat(out_dir))
 
-    raw_map_files = [f for f in Path(f"{out_dir}/tile_maps_raw").glob("*.npz")]
-    with concurrent.futures.ProcessPoolExecutor() as executor:
+    raw_map_files = [
+        f for f in Path(f"{out_dir}/tile_maps_raw").glob(f"*.{map_format}")
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
         executor.map(mwa_clean_maps, repeat(nside), raw_map_files, repeat(out_dir))
 
-    clean_map_files = [f for f in Path(f"{out_dir}/tile_maps_clean").glob("*.npz")]
-    with concurrent.futures.ProcessPoolExecutor() as executor:
+    clean_map_files = [
+        f for f in Path(f"{out_dir}/tile_maps_clean").glob(f"*.{map_format}")
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_cores) as executor:
         executor.map(plt_clean_maps, clean_map_files, repeat(out_dir))
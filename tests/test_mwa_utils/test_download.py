@@ -0,0 +1,180 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+
+import pytest
+from embers.mwa_utils.download import (download_batch, download_file,
+                                       rate_limiter)
+from embers.mwa_utils.mwa_pointings import download_meta
+
+# Files served by the local stand-in, with ETags
+files = {
+    "/a.txt": (b"0123456789" * 10, '"a1"'),
+    "/b.txt": (b"abcdefghij" * 5, '"b1"'),
+    "/no_etag.txt": (b"no etag here", None),
+}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Local stand-in of a web server, supporting HEAD, ETag and range requests."""
+
+    failures = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, body_required):
+        path, _, query = self.path.partition("?")
+
+        # Fail requests to flaky files a few times before they succeed
+        if path.startswith("/flaky"):
+            count = StandIn.failures.get(self.path, 0)
+            StandIn.failures[self.path] = count + 1
+            if count < 2:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            path = "/a.txt"
+
+        if path == "/metadata/find":
+            body, etag = f'{{"query": "{query}"}}'.encode(), None
+        elif path in files:
+            body, etag = files[path]
+        else:
+            self.send_error(404)
+            return
+
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        status = 200
+        byte_range = self.headers.get("Range")
+        if byte_range is not None:
+            start = int(byte_range[len("bytes=") : -1])
+            if start >= len(body):
+                self.send_response(416)
+                self.end_headers()
+                return
+            body = body[start:]
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if body_required:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_rate_limiter_none():
+    acquire = rate_limiter(None)
+    start = time.monotonic()
+    for _ in range(100):
+        acquire()
+    assert time.monotonic() - start < 0.1
+
+
+def test_rate_limiter_rate():
+    acquire = rate_limiter(20)
+    start = time.monotonic()
+    for _ in range(5):
+        acquire()
+    assert time.monotonic() - start >= 0.19
+
+
+def test_download_file(server, tmp_path):
+    status = download_file(f"{server}/a.txt", tmp_path / "a.txt")
+    assert status == "downloaded"
+    assert (tmp_path / "a.txt").read_bytes() == files["/a.txt"][0]
+    assert (tmp_path / "a.txt.etag").read_text() == '"a1"'
+    assert not (tmp_path / "a.txt.part").exists()
+
+
+def test_download_file_etag_skip(server, tmp_path):
+    download_file(f"{server}/a.txt", tmp_path / "a.txt")
+    assert download_file(f"{server}/a.txt", tmp_path / "a.txt") == "skipped"
+
+
+def test_download_file_size_skip(server, tmp_path):
+    Path(tmp_path / "no_etag.txt").write_bytes(b"x" * len(files["/no_etag.txt"][0]))
+    status = download_file(f"{server}/no_etag.txt", tmp_path / "no_etag.txt")
+    assert status == "skipped"
+
+
+def test_download_file_size_changed(server, tmp_path):
+    Path(tmp_path / "no_etag.txt").write_bytes(b"x")
+    status = download_file(f"{server}/no_etag.txt", tmp_path / "no_etag.txt")
+    assert status == "downloaded"
+    assert (tmp_path / "no_etag.txt").read_bytes() == files["/no_etag.txt"][0]
+
+
+def test_download_file_resume(server, tmp_path):
+    Path(tmp_path / "a.txt.part").write_bytes(files["/a.txt"][0][:37])
+    status = download_file(f"{server}/a.txt", tmp_path / "a.txt")
+    assert status == "resumed"
+    assert (tmp_path / "a.txt").read_bytes() == files["/a.txt"][0]
+
+
+def test_download_file_resume_complete(server, tmp_path):
+    Path(tmp_path / "a.txt.part").write_bytes(files["/a.txt"][0])
+    download_file(f"{server}/a.txt", tmp_path / "a.txt")
+    assert (tmp_path / "a.txt").read_bytes() == files["/a.txt"][0]
+
+
+def test_download_file_retry(server, tmp_path):
+    status = download_file(f"{server}/flaky?retry", tmp_path / "a.txt", backoff=0)
+    assert status == "downloaded"
+    assert StandIn.failures["/flaky?retry"] == 3
+
+
+def test_download_file_retry_fail(server, tmp_path):
+    with pytest.raises(HTTPError):
+        download_file(
+            f"{server}/flaky?fail", tmp_path / "a.txt", retries=1, backoff=0
+        )
+
+
+def test_download_file_missing(server, tmp_path):
+    with pytest.raises(HTTPError):
+        download_file(f"{server}/missing.txt", tmp_path / "missing.txt", backoff=0)
+
+
+def test_download_batch(server, tmp_path):
+    names = ["a.txt", "b.txt", "no_etag.txt"]
+    status = download_batch(
+        [f"{server}/{n}" for n in names], [tmp_path / n for n in names], rate=100
+    )
+    assert status == ["downloaded"] * 3
+    for n in names:
+        assert (tmp_path / n).read_bytes() == files[f"/{n}"][0]
+
+
+def test_download_meta_local(server, tmp_path):
+    download_meta(
+        "2019-10-01", "2019-10-10", 2, tmp_path, 0, url=f"{server}/metadata/find"
+    )
+    page = Path(f"{tmp_path}/mwa_pointings/page_002.json")
+    assert page.is_file()
+    assert "page=2" in page.read_text()
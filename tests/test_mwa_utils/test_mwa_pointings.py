@@ -2,11 +2,13 @@ import shutil
 from os import path
 from pathlib import Path
 
+import numpy as np
 from embers.mwa_utils.mwa_pointings import (clean_meta_json, combine_pointings,
                                             download_meta, mwa_point_meta,
                                             obs_pointings, plt_hist_array,
                                             point_integration, pointing_hist,
-                                            rf_obs_times, tile_integration)
+                                            pointing_occupancy, rf_obs_times,
+                                            tile_integration)
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -102,6 +104,38 @@ def test_obs_pointings():
         obs_p.unlink()
 
 
+def test_obs_pointings_occupancy():
+    obs_pointings(
+        "2019-10-01",
+        "2019-10-01",
+        "Australia/Perth",
+        f"{test_data}/mwa_utils",
+        save_occupancy=True,
+    )
+    occu = Path(f"{test_data}/mwa_utils/obs_occupancy.npz")
+    assert occu.is_file()
+    if occu.is_file():
+        occu.unlink()
+    obs_p = Path(f"{test_data}/mwa_utils/obs_pointings.json")
+    if obs_p.is_file():
+        obs_p.unlink()
+
+
+def test_pointing_occupancy():
+    obs_gps = np.array([0, 1800, 3600])
+    occupancy = pointing_occupancy(
+        obs_gps,
+        obs_gps + 1800,
+        [-900, 900, 1800, 4500, 4000],
+        [900, 1800, 3600, 6000, 4200],
+        [0, 2, 4, 41, 5],
+    )
+    assert occupancy.shape == (3, 4)
+    assert occupancy[0].tolist() == [0.5, 0.5, 0, 0]
+    assert occupancy[1].tolist() == [0, 0, 1, 0]
+    assert occupancy[2].tolist() == [0, 0, 0, 0.5]
+
+
 def test_tile_integration():
     obs_pointings(
         "2019-10-01", "2019-10-01", "Australia/Perth", f"{test_data}/mwa_utils"
@@ -2,8 +2,14 @@ import shutil
 from os import path
 from pathlib import Path
 
-from embers.rf_tools.align_data import (plot_savgol_interp, save_aligned,
-                                        savgol_interp)
+import numpy as np
+from embers.rf_tools.align_data import (align_batch, align_timestamp,
+                                        interp_weights, plot_savgol_interp,
+                                        save_aligned, savgol_interp,
+                                        savgol_weights)
+from embers.rf_tools.rf_data import read_data, tile_pairs
+from scipy import interpolate
+from scipy.signal import savgol_filter
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -46,6 +52,47 @@ def test_savgol_interp_ref_time_arrow():
     assert time_array[0] <= time_array[-1]
 
 
+def test_savgol_interp_fused():
+    (ref_fused, tile_fused, time_fused, _, _, _, _) = savgol_interp(
+        f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt",
+        f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt",
+        savgol_window_1=11,
+        savgol_window_2=15,
+        polyorder=2,
+        interp_type="cubic",
+        interp_freq=1,
+        engine="fused",
+    )
+    assert np.array_equal(time_fused, time_array)
+    assert np.allclose(ref_fused, ref_ali)
+    assert np.allclose(tile_fused, tile_ali)
+
+
+def test_interp_weights_linear():
+    power, times = read_data(
+        f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    )
+    interp = interp_weights(times, time_array, "linear")
+    f = interpolate.interp1d(times, power, axis=0, kind="linear")
+    assert np.allclose(interp(power), f(time_array))
+
+
+def test_interp_weights_range():
+    times = np.arange(10.0)
+    try:
+        interp_weights(times, np.arange(5, 15), "cubic")
+        assert False
+    except ValueError:
+        assert True
+
+
+def test_savgol_weights_short():
+    array = np.random.default_rng(0).normal(size=(20, 3))
+    smooth = savgol_weights(20, 11, 15, 2)
+    expected = savgol_filter(savgol_filter(array, 11, 2, axis=0), 15, 2, axis=0)
+    assert np.allclose(smooth(array), expected)
+
+
 def test_plot_savgol_interp():
     plot_savgol_interp(
         ref=f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt",
@@ -78,6 +125,28 @@ def test_save_aligned_file():
     assert ali_file.is_file() is True
     if ali_file.is_file() is True:
         shutil.rmtree(f"{test_data}/rf_tools/2019-10-01")
+        Path(f"{test_data}/rf_tools/manifest.jsonl").unlink()
+
+
+def test_save_aligned_fused():
+    out_str = save_aligned(
+        ("rf0XX", "S06XX"),
+        "2019-10-01-14:30",
+        11,
+        15,
+        2,
+        "cubic",
+        1,
+        f"{test_data}/rf_tools/rf_data",
+        f"{test_data}/rf_tools/fused",
+        engine="fused",
+    )
+    ali_file = Path(
+        f"{test_data}/rf_tools/fused/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
+    )
+    assert out_str == f"Saved aligned file to {ali_file}"
+    if ali_file.is_file() is True:
+        shutil.rmtree(f"{test_data}/rf_tools/fused")
 
 
 def test_save_aligned_err():
@@ -93,3 +162,125 @@ def test_save_aligned_err():
         f"{test_data}/rf_tools",
     )
     assert type(out_str).__name__ == "FileNotFoundError"
+
+
+def test_align_timestamp():
+    for engine in ["scipy", "fused"]:
+        results = align_timestamp(
+            "2019-10-01-14:30",
+            11,
+            15,
+            2,
+            "cubic",
+            1,
+            f"{test_data}/rf_tools/rf_data",
+            f"{test_data}/rf_tools/{engine}",
+            engine=engine,
+        )
+        assert len(results) == len(tile_pairs(None))
+
+        ali_file = f"{test_data}/rf_tools/{engine}/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
+        assert results[0] == f"Saved aligned file to {ali_file}"
+        assert type(results[1]).__name__ == "FileNotFoundError"
+
+        aligned = np.load(ali_file)
+        assert np.array_equal(aligned["time_array"], time_array)
+        assert np.allclose(aligned["ref_ali"], ref_ali, atol=1e-4)
+        assert np.allclose(aligned["tile_ali"], tile_ali, atol=1e-4)
+        shutil.rmtree(f"{test_data}/rf_tools/{engine}")
+
+
+def test_align_timestamp_off_grid(tmp_path):
+    # Tile data starts a second after the reference, so at 0.5 Hz the times
+    # of the pair lie between the times of the reference grid
+    ref_file = f"{tmp_path}/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt"
+    tile_file = f"{tmp_path}/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    for rf_file in [ref_file, tile_file]:
+        Path(rf_file).parent.mkdir(parents=True)
+    shutil.copy(
+        f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt",
+        ref_file,
+    )
+    data = Path(
+        f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    ).read_bytes()
+    header = data.index(b"\n") + 1
+    start = data.index(b"\n1569911404.") + 1
+    Path(tile_file).write_bytes(data[:header] + data[start:])
+
+    for engine in ["scipy", "fused"]:
+        ref_ali, tile_ali, time_array, *_ = savgol_interp(
+            ref_file, tile_file, 11, 15, 2, "cubic", 0.5, engine=engine
+        )
+        results = align_timestamp(
+            "2019-10-01-14:30",
+            11,
+            15,
+            2,
+            "cubic",
+            0.5,
+            tmp_path,
+            f"{tmp_path}/{engine}",
+            engine=engine,
+            pairs=[("rf0XX", "S06XX")],
+        )
+        aligned = np.load(results[0].split()[-1])
+        assert np.array_equal(aligned["time_array"], time_array)
+        assert np.allclose(aligned["ref_ali"], ref_ali, atol=1e-4)
+        assert np.allclose(aligned["tile_ali"], tile_ali, atol=1e-4)
+
+
+def test_align_batch():
+    align_batch(
+        start_date="2019-10-01",
+        stop_date="2019-10-01",
+        savgol_window_1=11,
+        savgol_window_2=15,
+        polyorder=2,
+        interp_type="cubic",
+        interp_freq=1,
+        data_dir=f"{test_data}/rf_tools/rf_data",
+        out_dir=f"{test_data}/rf_tools/batch",
+        max_cores=2,
+    )
+    ali_file = Path(
+        f"{test_data}/rf_tools/batch/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
+    )
+    assert ali_file.is_file() is True
+    if ali_file.is_file() is True:
+        shutil.rmtree(f"{test_data}/rf_tools/batch")
+
+
+def test_align_batch_resume():
+    kwargs = dict(
+        start_date="2019-10-01",
+        stop_date="2019-10-01",
+        savgol_window_1=11,
+        savgol_window_2=15,
+        polyorder=2,
+        interp_type="cubic",
+        interp_freq=1,
+        data_dir=f"{test_data}/rf_tools/rf_data",
+        out_dir=f"{test_data}/rf_tools/resume",
+        max_cores=1,
+    )
+    align_batch(**kwargs)
+    ali_file = Path(
+        f"{test_data}/rf_tools/resume/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
+    )
+    mtime = ali_file.stat().st_mtime_ns
+
+    # Up to date files are skipped
+    align_batch(**kwargs, resume=True)
+    assert ali_file.stat().st_mtime_ns == mtime
+
+    # Files aligned with other parameters are stale
+    kwargs["savgol_window_2"] = 13
+    align_batch(**kwargs, resume=True)
+    assert ali_file.stat().st_mtime_ns != mtime
+
+    # Files aligned with another engine are stale
+    mtime = ali_file.stat().st_mtime_ns
+    align_batch(**kwargs, engine="fused", resume=True)
+    assert ali_file.stat().st_mtime_ns != mtime
+    shutil.rmtree(f"{test_data}/rf_tools/resume")
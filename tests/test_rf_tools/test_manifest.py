@@ -0,0 +1,46 @@
+import shutil
+from os import path
+from pathlib import Path
+
+from embers.rf_tools.manifest import (fingerprint, manifest_path,
+                                      read_manifest, record_outputs,
+                                      up_to_date)
+
+# Save the path to this directory
+dirpath = path.dirname(__file__)
+
+# Obtain path to directory with test_data
+test_data = path.abspath(path.join(dirpath, "../data"))
+
+rf_file = f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+out_dir = f"{test_data}/rf_tools/manifest"
+
+
+def test_fingerprint():
+    assert fingerprint(rf_file).split(":")[0] == "2231811"
+
+
+def test_fingerprint_missing():
+    assert fingerprint(f"{test_data}/missing.txt") is None
+
+
+def test_read_manifest_empty():
+    assert read_manifest(out_dir) == {}
+
+
+def test_up_to_date():
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    Path(f"{out_dir}/out.txt").write_text("out")
+    record_outputs(out_dir, ["out.txt"], [rf_file], {"window": 11})
+    manifest = read_manifest(out_dir)
+
+    assert manifest_path(out_dir).is_file() is True
+    assert up_to_date(manifest, out_dir, ["out.txt"], [rf_file], {"window": 11})
+    assert not up_to_date(manifest, out_dir, ["out.txt"], [rf_file], {"window": 15})
+    assert not up_to_date(manifest, out_dir, ["new.txt"], [rf_file], {"window": 11})
+
+    # Modified outputs are stale
+    Path(f"{out_dir}/out.txt").write_text("changed")
+    assert not up_to_date(manifest, out_dir, ["out.txt"], [rf_file], {"window": 11})
+
+    shutil.rmtree(out_dir)
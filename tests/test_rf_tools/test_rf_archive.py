@@ -0,0 +1,58 @@
+import shutil
+from os import path
+
+import numpy as np
+from embers.rf_tools.rf_archive import load_archive, pack_archive, read_archive
+from embers.rf_tools.rf_data import read_data
+
+# Save the path to this directory
+dirpath = path.dirname(__file__)
+
+# Obtain path to directory with test_data
+test_data = path.abspath(path.join(dirpath, "../data"))
+
+out_str = pack_archive(
+    "S06XX", "2019-10-01", f"{test_data}/rf_tools/rf_data", f"{test_data}/rf_tools"
+)
+archive = f"{test_data}/rf_tools/S06XX/S06XX_2019-10-01.rfa"
+index, times, data = load_archive(archive)
+power_1430, times_1430 = read_archive(archive, "2019-10-01-14:30")
+power_1400, times_1400 = read_archive(archive, "2019-10-01-14:00")
+shutil.rmtree(f"{test_data}/rf_tools/S06XX")
+
+
+def test_pack_archive_str():
+    assert out_str == f"Archive saved to {archive}"
+
+
+def test_pack_archive_empty():
+    out_str = pack_archive(
+        "S06XX", "2019-10-02", f"{test_data}/rf_tools/rf_data", f"{test_data}/rf_tools"
+    )
+    assert out_str == "No rf data found for S06XX on 2019-10-02, skipping"
+
+
+def test_load_archive_index():
+    assert index.shape == (49,)
+    assert index[29] == 0
+    assert index[30] == 16655
+    assert index[-1] == 16655
+
+
+def test_load_archive_shape():
+    assert times.shape == (16655,)
+    assert data.shape == (16655, 112)
+
+
+def test_read_archive():
+    power, times = read_data(
+        f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    )
+    assert power_1430.dtype == power.dtype
+    assert np.array_equal(power_1430, power)
+    assert np.array_equal(times_1430, times)
+
+
+def test_read_archive_missing():
+    assert power_1400.shape == (0, 112)
+    assert times_1400.shape == (0,)
@@ -2,9 +2,15 @@ import shutil
 from os import path
 from pathlib import Path
 
-from embers.rf_tools.rf_data import (batch_waterfall, plt_waterfall, read_data,
-                                     single_waterfall, tile_names, tile_pairs,
-                                     time_tree)
+import numpy as np
+import pytest
+from embers.rf_tools.rf_data import (_read_data_lines, batch_waterfall,
+                                     decode_data, live_waterfall,
+                                     plt_waterfall, prune_rf_cache, read_data,
+                                     read_new_data, rf_cache_paths, run_batch,
+                                     single_waterfall, tail_data, tile_names,
+                                     tile_pairs, time_tree, warm_rf_cache,
+                                     waterfall_batch)
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -48,6 +54,149 @@ def test_read_data_time_arrow():
     assert times[0] <= times[-1]
 
 
+def test_read_data_lines_power():
+    rf_file = f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    power, _ = read_data(rf_file)
+    power_ref, _ = _read_data_lines(rf_file)
+    assert power.dtype == power_ref.dtype
+    assert np.array_equal(power, power_ref)
+
+
+def test_read_data_lines_times():
+    rf_file = f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-10/rf0XX_2019-10-10-02:30.txt"
+    _, times = read_data(rf_file)
+    _, times_ref = _read_data_lines(rf_file)
+    assert times.dtype == times_ref.dtype
+    assert np.array_equal(times, times_ref)
+
+
+def test_decode_data_variable_times():
+    rf_bytes = b"header\n1.5$Sp\x01\x02\r\n1569911403.25$Sp\x03\x04\r\n"
+    power, times = decode_data(rf_bytes)
+    assert power.tolist() == [[-0.5, -1.0], [-1.5, -2.0]]
+    assert times.tolist() == [1.5, 1569911403.25]
+
+
+def test_decode_data_partial_line():
+    rf_bytes = b"header\n1.5$Sp\x01\x02\r\n2.5$Sp\x03"
+    power, times = decode_data(rf_bytes)
+    assert power.shape == (1, 2)
+    assert times.tolist() == [1.5]
+
+
+def test_decode_data_header_only():
+    power, times = decode_data(b"header\n")
+    assert power.shape == (0,)
+    assert times.shape == (0,)
+
+
+def test_decode_data_no_sep():
+    with pytest.raises(ValueError):
+        decode_data(b"header\n1.5$Sp\x01\r\n2.5\x03\r\n")
+
+
+def test_read_new_data():
+    rf_file = f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt"
+    power, times = read_data(rf_file)
+    with open(rf_file, "rb") as f:
+        rf_bytes = f.read()
+
+    # Write the file in uneven chunks, splitting lines
+    growing_file = Path(f"{test_data}/rf_tools/growing.txt")
+    offset = 0
+    power_blocks = []
+    times_blocks = []
+    with open(growing_file, "wb") as f:
+        for chunk in range(0, len(rf_bytes), 100000):
+            f.write(rf_bytes[chunk : chunk + 100000])
+            f.flush()
+            power_block, times_block, offset = read_new_data(growing_file, offset)
+            power_blocks.append(power_block.reshape(-1, 112))
+            times_blocks.append(times_block)
+    growing_file.unlink()
+
+    assert offset == len(rf_bytes)
+    assert np.array_equal(np.concatenate(power_blocks), power)
+    assert np.array_equal(np.concatenate(times_blocks), times)
+
+
+def test_read_new_data_partial():
+    rf_file = Path(f"{test_data}/rf_tools/growing.txt")
+    rf_file.write_bytes(b"header\n1.5$Sp\x01\x02\r\n2.5$Sp\x03")
+    power, times, offset = read_new_data(rf_file, 7)
+    rf_file.unlink()
+    assert power.shape == (1, 2)
+    assert times.tolist() == [1.5]
+    assert offset == 17
+
+
+def test_tail_data():
+    rf_file = f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-01/rf0XX_2019-10-01-14:30.txt"
+    blocks = list(tail_data(rf_file, interval=0.01, timeout=0.1))
+    assert len(blocks) == 1
+    assert blocks[0][1].shape == (11420,)
+
+
+def test_live_waterfall():
+    live_waterfall(
+        f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt",
+        f"{test_data}/rf_tools",
+        interval=0.01,
+        timeout=0.1,
+    )
+    live_waterfall_png = Path(f"{test_data}/rf_tools/S06XX_2019-10-01-14:30.png")
+    assert live_waterfall_png.is_file() is True
+    if live_waterfall_png.is_file() is True:
+        live_waterfall_png.unlink()
+
+
+def test_read_data_cache():
+    rf_file = f"{test_data}/rf_tools/rf_data/S06XX/2019-10-01/S06XX_2019-10-01-14:30.txt"
+    cache_dir = f"{test_data}/rf_tools/rf_cache"
+    power, times = read_data(rf_file, cache_dir=cache_dir)
+    power_path, times_path = rf_cache_paths(rf_file, cache_dir)
+    assert power_path.is_file() is True
+    assert times_path.is_file() is True
+    power_cached, times_cached = read_data(rf_file, cache_dir=cache_dir)
+    assert type(power_cached).__name__ == "memmap"
+    assert np.array_equal(power, power_cached)
+    assert np.array_equal(times, times_cached)
+    shutil.rmtree(cache_dir)
+
+
+def test_warm_rf_cache():
+    cache_dir = f"{test_data}/rf_tools/rf_cache"
+    out_str = warm_rf_cache(
+        "rf0XX", "2019-10-10-02:30", f"{test_data}/rf_tools/rf_data", cache_dir
+    )
+    power_path, _ = rf_cache_paths(
+        f"{test_data}/rf_tools/rf_data/rf0XX/2019-10-10/rf0XX_2019-10-10-02:30.txt",
+        cache_dir,
+    )
+    assert out_str == f"Cached rf data saved to {power_path}"
+    assert power_path.is_file() is True
+    shutil.rmtree(cache_dir)
+
+
+def test_warm_rf_cache_err():
+    e = warm_rf_cache("S06XX", "2019-10-01-14:00", ".", ".")
+    assert type(e).__name__ == "FileNotFoundError"
+
+
+def test_prune_rf_cache():
+    cache_dir = f"{test_data}/rf_tools/rf_cache"
+    warm_rf_cache("rf0XX", "2019-10-10-02:30", f"{test_data}/rf_tools/rf_data", cache_dir)
+    stale = Path(f"{cache_dir}/rf0XX/2019-10-10/rf0XX_2019-10-10-02:00_0123_power.npy")
+    stale.touch()
+    out_str = prune_rf_cache(
+        "rf0XX", "2019-10-10", f"{test_data}/rf_tools/rf_data", cache_dir
+    )
+    assert out_str == f"Pruned 1 stale files from {cache_dir}/rf0XX/2019-10-10"
+    assert stale.is_file() is False
+    assert len(list(Path(f"{cache_dir}/rf0XX/2019-10-10").glob("*.npy"))) == 2
+    shutil.rmtree(cache_dir)
+
+
 def test_tile_names_first():
     tiles = tile_names()
     assert tiles[0] == "rf0XX"
@@ -142,8 +291,48 @@ def test_batch_waterfall():
     assert batch_waterfall_png.is_file() is True
     if batch_waterfall_png.is_file() is True:
         shutil.rmtree(f"{test_data}/rf_tools/waterfalls")
+        Path(f"{test_data}/rf_tools/manifest.jsonl").unlink()
 
 
 def test_batch_waterfall_err():
     e = batch_waterfall("S06XX", "2019-10-01-14:30", ".", ".")
     assert type(e).__name__ == "FileNotFoundError"
+
+
+def test_run_batch():
+    results = run_batch(pow, [(2, i) for i in range(10)], max_cores=2, chunk_size=3)
+    assert sorted(results) == [2 ** i for i in range(10)]
+
+
+def test_run_batch_empty():
+    assert list(run_batch(pow, [])) == []
+
+
+def test_waterfall_batch():
+    out_dir = f"{test_data}/rf_tools/waterfall_batch"
+    waterfall_batch(
+        "2019-10-01", "2019-10-01", f"{test_data}/rf_tools/rf_data", out_dir, max_cores=2
+    )
+    waterfall_png = Path(
+        f"{out_dir}/waterfalls/2019-10-01/2019-10-01-14:30/S06XX_2019-10-01-14:30.png"
+    )
+    assert waterfall_png.is_file() is True
+
+    # Resumed runs only replace missing plots
+    waterfall_png.unlink()
+    rf0_png = Path(
+        f"{out_dir}/waterfalls/2019-10-01/2019-10-01-14:30/rf0XX_2019-10-01-14:30.png"
+    )
+    rf0_mtime = rf0_png.stat().st_mtime_ns
+    waterfall_batch(
+        "2019-10-01",
+        "2019-10-01",
+        f"{test_data}/rf_tools/rf_data",
+        out_dir,
+        max_cores=2,
+        resume=True,
+    )
+    assert waterfall_png.is_file() is True
+    assert waterfall_png.stat().st_mtime_ns > rf0_mtime
+    assert rf0_png.stat().st_mtime_ns == rf0_mtime
+    shutil.rmtree(out_dir)
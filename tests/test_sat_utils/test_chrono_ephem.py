@@ -4,8 +4,10 @@ from os import path
 from pathlib import Path
 
 import numpy as np
-from embers.sat_utils.chrono_ephem import (interp_ephem, obs_times,
-                                           save_chrono_ephem, write_json)
+from embers.sat_utils.chrono_ephem import (chrono_path, interp_ephem,
+                                           obs_times, read_chrono,
+                                           save_chrono_ephem, time_index,
+                                           write_json, write_npz)
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -58,6 +60,19 @@ def test_interp_ephem_sky():
     assert len(sat_alt) == len(sat_az)
 
 
+def test_time_index():
+    times = np.arange(1569911400, 1569913200, 1.0)
+    assert time_index(times, 1569911410) == 10
+    assert time_index(times, 1569911410.4) == 10
+    assert time_index(times, 1569911410.6) == 11
+
+
+def test_time_index_edges():
+    times = np.arange(1569911400, 1569913200, 1.0)
+    assert time_index(times, 1569911300) == 0
+    assert time_index(times, 1569913300) == 1799
+
+
 def test_write_json():
     data = [1, 2, 3]
     write_json(data, "tmp.json", f"{test_data}/sat_utils")
@@ -85,3 +100,107 @@ def test_save_chrono_ephem():
 
     assert len(files) == 48
     shutil.rmtree(out_dir)
+
+
+def test_save_chrono_ephem_split_pass():
+    out_dir = Path(f"{test_data}/sat_utils/ephem_chrono_tmp")
+    save_chrono_ephem(
+        "Australia/Perth",
+        "2019-10-01",
+        "2019-10-01",
+        "cubic",
+        1,
+        f"{test_data}/sat_utils/ephem_data",
+        out_dir,
+        max_cores=1,
+    )
+    with open(f"{out_dir}/2019-10-01-03:00.json") as f:
+        obs_0300 = json.load(f)
+    with open(f"{out_dir}/2019-10-01-03:30.json") as f:
+        obs_0330 = json.load(f)
+    shutil.rmtree(out_dir)
+
+    # A single pass is split between successive observations
+    assert obs_0300[0]["sat_id"] == ["25986"]
+    assert len(obs_0300[0]["time_array"]) == 478
+    assert len(obs_0330[0]["time_array"]) == 498
+    assert obs_0300[0]["time_array"][-1] == obs_0330[0]["time_array"][0]
+
+
+def test_write_npz():
+    chrono_file = f"{test_data}/sat_utils/chrono_json/2019-10-01-14:30.json"
+    with open(chrono_file) as f:
+        data = json.load(f)
+    write_npz(data, "tmp.npz", f"{test_data}/sat_utils")
+    npz_data = read_chrono(f"{test_data}/sat_utils/tmp.npz")
+    Path(f"{test_data}/sat_utils/tmp.npz").unlink()
+
+    assert len(npz_data) == len(data)
+    for npz_pass, json_pass in zip(npz_data, data):
+        assert npz_pass["sat_id"] == json_pass["sat_id"]
+        assert np.array_equal(npz_pass["time_array"], json_pass["time_array"])
+        assert np.allclose(npz_pass["sat_alt"], json_pass["sat_alt"], atol=1e-4)
+        assert np.allclose(npz_pass["sat_az"], json_pass["sat_az"], atol=1e-6)
+
+
+def test_read_chrono_json():
+    chrono_file = f"{test_data}/sat_utils/chrono_json/2019-10-01-14:30.json"
+    with open(chrono_file) as f:
+        data = json.load(f)
+    assert read_chrono(chrono_file) == data
+
+
+def test_chrono_path_json():
+    chrono_file = chrono_path(f"{test_data}/sat_utils/chrono_json", "2019-10-01-14:30")
+    assert chrono_file.suffix == ".json"
+
+
+def test_save_chrono_ephem_npz():
+    out_dir = Path(f"{test_data}/sat_utils/ephem_chrono_tmp")
+    save_chrono_ephem(
+        "Australia/Perth",
+        "2019-10-01",
+        "2019-10-01",
+        "cubic",
+        1,
+        f"{test_data}/sat_utils/ephem_data",
+        out_dir,
+        max_cores=1,
+        chrono_format="npz",
+    )
+    files = [f.stem for f in out_dir.glob("*.npz")]
+    chrono_file = chrono_path(out_dir, "2019-10-01-03:00")
+    obs_0300 = read_chrono(chrono_file)
+    empty = read_chrono(chrono_path(out_dir, "2019-10-01-02:00"))
+    shutil.rmtree(out_dir)
+
+    assert len(files) == 48
+    assert chrono_file.suffix == ".npz"
+    assert obs_0300[0]["sat_id"] == ["25986"]
+    assert obs_0300[0]["time_array"].shape[0] == 478
+    assert empty == []
+
+
+def test_save_chrono_ephem_switch_format():
+    out_dir = Path(f"{test_data}/sat_utils/ephem_chrono_tmp")
+    for chrono_format in ["npz", "json"]:
+        save_chrono_ephem(
+            "Australia/Perth",
+            "2019-10-01",
+            "2019-10-01",
+            "cubic",
+            1,
+            f"{test_data}/sat_utils/ephem_data",
+            out_dir,
+            max_cores=1,
+            chrono_format=chrono_format,
+        )
+    npz_files = list(out_dir.glob("*.npz"))
+    json_files = list(out_dir.glob("*.json"))
+    chrono_file = chrono_path(out_dir, "2019-10-01-03:00")
+    shutil.rmtree(out_dir)
+
+    # Files of the previous run in npz format are removed
+    assert npz_files == []
+    assert len(json_files) == 48
+    assert chrono_file.suffix == ".json"
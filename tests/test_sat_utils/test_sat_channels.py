@@ -4,10 +4,13 @@ from os import path
 from pathlib import Path
 
 import numpy as np
-from embers.sat_utils.sat_channels import (batch_window_map, good_chans,
+from embers.sat_utils.chrono_ephem import read_chrono, write_npz
+from embers.sat_utils.sat_channels import (batch_window_map,
+                                           channel_scores, good_chans,
                                            noise_floor, plt_channel, plt_sats,
                                            plt_window_chans, read_aligned,
-                                           time_filter, window_chan_map)
+                                           time_filter, window_chan_map,
+                                           window_data)
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -88,6 +91,15 @@ def test_time_filter_IV():
     assert intvl == [0, 1778]
 
 
+def test_time_filter_sub_sample():
+    ali_file = Path(
+        f"{test_data}/rf_tools/align_data/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
+    )
+    ref_pow, tile_pow, times = read_aligned(ali_file=ali_file)
+    intvl = time_filter(1569911410.3, 1569913099.8, times)
+    assert intvl == [6, 1696]
+
+
 def test_time_filter_V():
     ali_file = Path(
         f"{test_data}/rf_tools/align_data/2019-10-01/2019-10-01-14:30/rf0XX_S06XX_2019-10-01-14:30_aligned.npz"
@@ -180,6 +192,71 @@ def test_good_chans_45():
     assert good_chan == 45
 
 
+def test_good_chans_45_npz():
+    with open(chrono_file_2) as f:
+        data = json.load(f)
+    write_npz(data, "2019-10-10-02:30.npz", f"{test_data}/sat_utils")
+    good_chan = good_chans(
+        ali_file_2,
+        f"{test_data}/sat_utils/2019-10-10-02:30.npz",
+        "41188",
+        1,
+        3,
+        15,
+        0.8,
+        "2019-10-10-02:30",
+        f"{test_data}/sat_utils/good_chans_tmp",
+    )
+    Path(f"{test_data}/sat_utils/2019-10-10-02:30.npz").unlink()
+    assert good_chan == 45
+
+
+def test_window_data():
+    power, times, p_med, noise_threshold, norad_ephem = window_data(
+        ali_file_2, read_chrono(chrono_file_2), 1, 3
+    )
+    assert p_med == np.median(power)
+    assert noise_threshold == noise_floor(1, 3, power)
+    assert norad_ephem["41188"]["sat_id"] == ["41188"]
+
+
+def test_channel_scores():
+    power, times, p_med, noise_threshold, norad_ephem = window_data(
+        ali_file_2, read_chrono(chrono_file_2), 1, 3
+    )
+    ephem = norad_ephem["41188"]["time_array"]
+    w_start, w_stop = time_filter(ephem[0], ephem[-1], times)
+    power_c = power[w_start : w_stop + 1]
+
+    # The satellite rises before the start of the observation
+    scores = channel_scores(power_c, noise_threshold, p_med, 15, 0.8, head=False)
+
+    assert w_start == 0
+    assert scores.shape == (power.shape[1],)
+    assert scores["peak"][45] == np.amax(power_c[:, 45])
+    assert 45 in np.flatnonzero(scores["possible"])
+
+
+def test_good_chans_window():
+    window = window_data(ali_file_2, read_chrono(chrono_file_2), 1, 3)
+    good_chan = [
+        good_chans(
+            ali_file_2,
+            chrono_file_2,
+            sat_id,
+            1,
+            3,
+            15,
+            0.8,
+            "2019-10-10-02:30",
+            f"{test_data}/sat_utils/good_chans_tmp",
+            window=window,
+        )
+        for sat_id in ["41188", "44387"]
+    ]
+    assert good_chan == [45, 59]
+
+
 def test_good_chans_45_plts():
     good_chans(
         ali_file_2,
@@ -2,9 +2,12 @@ import shutil
 from os import path
 from pathlib import Path
 
-from embers.sat_utils.sat_ephemeris import (ephem_data, epoch_ranges,
-                                            epoch_time_array, load_tle,
-                                            sat_pass, sat_plot, save_ephem)
+import numpy as np
+from embers.sat_utils.sat_ephemeris import (ephem_batch, ephem_data,
+                                            epoch_ranges, epoch_time_array,
+                                            epoch_time_arrays, find_passes,
+                                            load_tle, sat_altaz, sat_pass,
+                                            sat_plot, save_ephem)
 
 # Save the path to this directory
 dirpath = path.dirname(__file__)
@@ -118,6 +121,50 @@ def test_ephem_data_az():
     assert sat_az.shape[0] == 98
 
 
+def test_epoch_time_arrays():
+    tle_file = f"{test_data}/sat_utils/TLE/25986.txt"
+    sats, epochs = load_tle(tle_file)
+    epoch_range = epoch_ranges(epochs)[:4]
+    t_arr, index = epoch_time_arrays(epoch_range, cadence=10)
+    for i in range(3):
+        t_i, _ = epoch_time_array(epoch_range, index_epoch=i, cadence=10)
+        assert np.array_equal(t_arr.tt[index[i] : index[i + 1]], t_i.tt)
+
+
+def test_sat_altaz():
+    tle_file = f"{test_data}/sat_utils/TLE/25986.txt"
+    location = (-26.703319, 116.670815, 337.83)
+    sats, epochs = load_tle(tle_file)
+    epoch_range = epoch_ranges(epochs)[:4]
+    t_arr, index = epoch_time_arrays(epoch_range, cadence=10)
+    alt, az = sat_altaz(sats, t_arr, index, location=location)
+    for i in range(3):
+        t_i, _ = epoch_time_array(epoch_range, index_epoch=i, cadence=10)
+        _, alt_i, az_i = sat_pass(sats, t_i, i, location=location)
+        # Older Skyfield rounds times to a single Julian date, within an arcsecond
+        assert np.allclose(
+            alt.degrees[index[i] : index[i + 1]], alt_i.degrees, atol=1e-4
+        )
+        assert np.allclose(
+            az.radians[index[i] : index[i + 1]], az_i.radians, atol=1e-5
+        )
+
+
+def test_find_passes():
+    tle_file = f"{test_data}/sat_utils/TLE/25986.txt"
+    location = (-26.703319, 116.670815, 337.83)
+    sats, epochs = load_tle(tle_file)
+    epoch_range = epoch_ranges(epochs)[:9]
+    t_arr, index = epoch_time_arrays(epoch_range, cadence=4)
+    passes = find_passes(sats, t_arr, index, location=location, cadence=4, step=60)
+    dense = []
+    for i in range(8):
+        t_i, _ = epoch_time_array(epoch_range, index_epoch=i, cadence=4)
+        passes_i, _, _ = sat_pass(sats, t_i, i, location=location)
+        dense.extend(passes_i + index[i])
+    assert np.array_equal(passes, np.array(dense))
+
+
 def test_sat_plot():
     tle_file = f"{test_data}/sat_utils/TLE/25986.txt"
     sats, epochs = load_tle(tle_file)
@@ -155,3 +202,82 @@ def test_save_ephem_plot():
     assert png.is_file() is True
     if png.is_file() is True:
         shutil.rmtree(f"{test_data}/sat_utils/ephem_tmp")
+
+
+def test_save_ephem_passes():
+    save_ephem(
+        "25986",
+        f"{test_data}/sat_utils/TLE",
+        10,
+        (-26.703319, 116.670815, 337.83),
+        0.5,
+        f"{test_data}/sat_utils/ephem_tmp",
+    )
+    ephem = np.load(
+        f"{test_data}/sat_utils/ephem_tmp/ephem_data/25986.npz", allow_pickle=True
+    )
+
+    # First pass of the first epoch, from test_ephem_data_time
+    assert ephem["time_array"][0].shape[0] == 98
+    assert ephem["sat_alt"][0].shape[0] == 98
+
+    # Matches the pass computed with Skyfield
+    sats, epochs = load_tle(f"{test_data}/sat_utils/TLE/25986.txt")
+    t_arr, _ = epoch_time_array(epoch_ranges(epochs), index_epoch=0, cadence=10)
+    location = (-26.703319, 116.670815, 337.83)
+    passes, alt, az = sat_pass(sats, t_arr, 0, location=location)
+    time_array, sat_alt, sat_az = ephem_data(t_arr, passes[0], alt, az)
+    assert np.allclose(ephem["time_array"][0], time_array)
+    assert np.allclose(ephem["sat_alt"][0], sat_alt, atol=1e-4)
+    assert np.allclose(ephem["sat_az"][0], sat_az, atol=1e-5)
+    shutil.rmtree(f"{test_data}/sat_utils/ephem_tmp")
+
+
+def test_save_ephem_coarse_step():
+    ephem = []
+    for coarse_step in [None, 60]:
+        save_ephem(
+            "44387",
+            f"{test_data}/sat_utils/TLE",
+            10,
+            (-26.703319, 116.670815, 337.83),
+            0.5,
+            f"{test_data}/sat_utils/ephem_tmp",
+            coarse_step=coarse_step,
+        )
+        ephem.append(
+            np.load(
+                f"{test_data}/sat_utils/ephem_tmp/ephem_data/44387.npz",
+                allow_pickle=True,
+            )["sat_alt"]
+        )
+    shutil.rmtree(f"{test_data}/sat_utils/ephem_tmp")
+
+    assert len(ephem[0]) == len(ephem[1])
+    for dense, coarse in zip(*ephem):
+        assert np.array_equal(dense, coarse)
+
+
+def test_ephem_batch_resume():
+    kwargs = dict(
+        tle_dir=f"{test_data}/sat_utils/TLE",
+        cadence=10,
+        location=(-26.703319, 116.670815, 337.83),
+        alpha=0.5,
+        out_dir=f"{test_data}/sat_utils/ephem_resume",
+        max_cores=1,
+        coarse_step=60,
+    )
+    ephem_batch(**kwargs)
+    ephem_file = Path(f"{test_data}/sat_utils/ephem_resume/ephem_data/44387.npz")
+    mtime = ephem_file.stat().st_mtime_ns
+
+    # Up to date satellites are skipped
+    ephem_batch(**kwargs, resume=True)
+    assert ephem_file.stat().st_mtime_ns == mtime
+
+    # Satellites scanned with another coarse step are stale
+    kwargs["coarse_step"] = 30
+    ephem_batch(**kwargs, resume=True)
+    assert ephem_file.stat().st_mtime_ns != mtime
+    shutil.rmtree(f"{test_data}/sat_utils/ephem_resume")
@@ -1,6 +1,34 @@
+from datetime import datetime
+from os import path
 from pathlib import Path
 
-from embers.sat_utils.sat_list import download_tle, norad_ids
+from embers.sat_utils.sat_list import (download_tle, norad_ids, read_tle,
+                                       tle_epoch)
+
+# Save the path to this directory
+dirpath = path.dirname(__file__)
+
+# Obtain path to directory with test_data
+test_data = path.abspath(path.join(dirpath, "../data"))
+
+
+class StandInClient:
+    """Local stand-in of the space-track client, serving TLEs from the test data."""
+
+    def __init__(self, sat_ids):
+        self.queries = []
+        self.tles = []
+        for sat_id in sat_ids:
+            self.tles.extend(read_tle(f"{test_data}/sat_utils/TLE/{sat_id}.txt"))
+
+    def tle(self, iter_lines, norad_cat_id, orderby, epoch, format):
+        self.queries.append((norad_cat_id, epoch))
+        start, stop = epoch.split("--")
+        start = datetime.strptime(start, "%Y-%m-%d")
+        for line1, line2 in sorted(self.tles, key=lambda t: tle_epoch(t[0])):
+            if int(line1[2:7]) in norad_cat_id and tle_epoch(line1) >= start:
+                yield line1
+                yield line2
 
 
 def test_norad_ids_length():
@@ -59,3 +87,51 @@ def test_download_tle_write():
     assert txt.is_file() is True
     if txt.is_file() is True:
         txt.unlink()
+
+
+def test_tle_epoch():
+    epoch = tle_epoch(
+        "1 25986U 99065G   19255.49978013 +.00000005 +00000-0 +53080-4 0  9997"
+    )
+    assert epoch.strftime("%Y-%m-%d %H:%M") == "2019-09-12 11:59"
+
+
+def test_download_tle_batch(tmp_path):
+    client = StandInClient([25986, 44387])
+    download_tle(
+        "2019-09-01",
+        "2019-10-31",
+        {"FM 5": 25986, "Meteor M2-2": 44387},
+        out_dir=tmp_path,
+        sleep=0,
+        client=client,
+    )
+    assert len(client.queries) == 1
+    for sat_id in [25986, 44387]:
+        assert read_tle(f"{tmp_path}/{sat_id}.txt") == read_tle(
+            f"{test_data}/sat_utils/TLE/{sat_id}.txt"
+        )
+
+
+def test_download_tle_incremental(tmp_path):
+    tles = read_tle(f"{test_data}/sat_utils/TLE/25986.txt")
+    with open(f"{tmp_path}/25986.txt", "w") as fp:
+        for line1, line2 in tles[:2]:
+            fp.write(f"{line1}\n{line2}\n")
+
+    client = StandInClient([25986])
+    download_tle(
+        "2019-09-01",
+        "2019-10-31",
+        {"FM 5": 25986},
+        out_dir=tmp_path,
+        sleep=0,
+        incremental=True,
+        client=client,
+    )
+
+    # Only TLEs from the day of the last epoch are requested, once per epoch
+    assert client.queries[0][1] == "2019-09-13--2019-10-31"
+    epochs = [tle_epoch(line1) for line1, _ in tles]
+    unique = [tle for i, tle in enumerate(tles) if epochs[i] not in epochs[:i]]
+    assert read_tle(f"{tmp_path}/25986.txt") == unique
@@ -0,0 +1,167 @@
+import shutil
+from os import path
+from pathlib import Path
+
+import numpy as np
+from embers.tile_maps.map_columns import (append_pass, column_maps,
+                                          group_columns, load_maps,
+                                          map_columns, map_path,
+                                          maps_to_nested, merge_columns,
+                                          merge_sats,
+                                          nested_to_maps, pixel_lists,
+                                          pixel_maps, sat_pixel_maps,
+                                          save_maps, stack_columns)
+
+# Save the path to this directory
+dirpath = path.dirname(__file__)
+
+# Obtain path to directory with test_data
+test_data = path.abspath(path.join(dirpath, "../data"))
+
+nside = 2
+
+
+def sample_columns():
+    columns = map_columns()
+    append_pass(columns, [3, 5], 2, 25338, [1, 2], [-1, -2], [-10, -20], [-11, -22])
+    append_pass(columns, [5], 41, 99999, [3], [-3], [-30], [-33])
+    append_pass(columns, [5, 9], 2, 41188, [4, 6], [-4, -6], [-40, -60], [-44, -66])
+    append_pass(columns, [5], 2, 25338, [5], [-5], [-50], [-55])
+    return columns
+
+
+def test_stack_columns_empty():
+    columns = stack_columns(map_columns())
+    assert columns["pixel"].dtype == np.int64
+    assert columns["mwa"].size == 0
+
+
+def test_merge_columns():
+    first, second = map_columns(), map_columns()
+    append_pass(first, [3, 5], 2, 25338, [1, 2], [-1, -2], [-10, -20], [-11, -22])
+    append_pass(second, [5], 41, 99999, [3], [-3], [-30], [-33])
+    append_pass(second, [5, 9], 2, 41188, [4, 6], [-4, -6], [-40, -60], [-44, -66])
+    append_pass(second, [5], 2, 25338, [5], [-5], [-50], [-55])
+    merged = stack_columns(merge_columns([first, map_columns(), second]))
+    columns = stack_columns(sample_columns())
+    for col in columns:
+        assert merged[col].tolist() == columns[col].tolist()
+
+
+def test_group_columns():
+    columns = map_columns()
+    append_pass(columns, [3, 5], 0, 25338, [1, 2], [-1, -2], [-10, -20], [-11, -22])
+    append_pass(columns, [5, 7], 0, 41188, [3, 4], [-3, -4], [-30, -40], [-33, -44])
+    append_pass(columns, [5], 0, 25338, [5], [-5], [-50], [-55])
+    columns = stack_columns(columns)
+
+    order, groups, offsets = group_columns(columns, ["sat", "pixel"])
+    assert groups.tolist() == [[25338, 3], [25338, 5], [41188, 5], [41188, 7]]
+    assert offsets.tolist() == [0, 1, 3, 4, 5]
+
+    # Samples keep the order in which they were appended
+    assert columns["mwa"][order][offsets[1] : offsets[2]].tolist() == [-2, -5]
+
+
+def test_group_columns_empty():
+    order, groups, offsets = group_columns(stack_columns(map_columns()), ["sat"])
+    assert order.size == 0
+    assert groups.shape == (0, 1)
+    assert offsets.tolist() == [0]
+
+
+def test_sat_pixel_maps():
+    columns = map_columns()
+    append_pass(columns, [3, 5], 2, 25338, [1, 2], [-1, -2], [-10, -20], [-11, -22])
+    append_pass(columns, [5], 41, 99999, [3], [-3], [-30], [-33])
+    append_pass(columns, [5], 2, 25338, [5], [-5], [-50], [-55])
+
+    maps = sat_pixel_maps(columns, ["0", "2", "4", "41"], [25338, 41188], nside)
+    assert sorted(maps.keys()) == ["mwa_map", "ref_map", "tile_map", "time_map"]
+    assert len(maps["mwa_map"]["2"][25338]) == 48
+    assert maps["mwa_map"]["2"][25338][3] == [-1.0]
+    assert maps["ref_map"]["2"][25338][5] == [-20.0, -50.0]
+    assert maps["time_map"]["2"][25338][5] == [2.0, 5.0]
+    assert maps["tile_map"]["41"][41188] == [[] for pixel in range(48)]
+    assert 99999 not in maps["mwa_map"]["41"]
+
+
+def test_sat_pixel_maps_interleaved():
+    columns = map_columns()
+    append_pass(columns, [5, 7], 0, 25338, [1, 2], [-1, -2], [-10, -20], [-11, -22])
+    append_pass(columns, [3, 5], 0, 25338, [3, 4], [-3, -4], [-30, -40], [-33, -44])
+
+    maps = sat_pixel_maps(columns, ["0", "2", "4", "41"], [25338], nside)
+    assert maps["mwa_map"]["0"][25338][3] == [-3.0]
+    assert maps["mwa_map"]["0"][25338][5] == [-1.0, -4.0]
+    assert maps["mwa_map"]["0"][25338][7] == [-2.0]
+    assert maps["time_map"]["0"][25338][5] == [1.0, 4.0]
+
+
+def test_column_maps():
+    maps = column_maps(
+        stack_columns(sample_columns()), ["0", "2", "4", "41"], [25338, 41188], nside
+    )
+    assert maps["groups"].tolist() == [[-1, -1], [0, 1], [-1, -1], [-1, -1]]
+    assert maps["indptr"].shape == (2, 49)
+    assert maps["indptr"][0, [3, 4, 5, 6]].tolist() == [0, 1, 1, 3]
+    assert maps["mwa"].tolist() == [-1, -2, -5, -4, -6]
+
+
+def test_save_load_maps():
+    map_dir = Path(f"{test_data}/tile_maps/tmap_tmp")
+    map_dir.mkdir(parents=True, exist_ok=True)
+    maps = column_maps(
+        stack_columns(sample_columns()), ["0", "2", "4", "41"], [25338, 41188], nside
+    )
+    save_maps(maps, f"{map_dir}/S06XX_rf0XX_sat_maps.tmap")
+    tmap = load_maps(f"{map_dir}/S06XX_rf0XX_sat_maps.tmap")
+
+    assert isinstance(tmap["mwa"], np.memmap)
+    assert list(tmap.keys()) == list(maps.keys())
+    for key in maps:
+        assert np.array_equal(tmap[key], maps[key])
+    assert map_path(map_dir, "S06XX_rf0XX_sat_maps").suffix == ".tmap"
+    assert map_path(map_dir, "S06YY_rf0YY_sat_maps").suffix == ".npz"
+    shutil.rmtree(map_dir)
+
+
+def test_pixel_maps():
+    maps = column_maps(
+        stack_columns(sample_columns()), ["0", "2", "4", "41"], [25338, 41188], nside
+    )
+
+    values, offsets = pixel_maps(maps, "ref", pointings=["2"], sats=[41188, 25338])
+    pixels = pixel_lists(values, offsets)
+    assert len(pixels) == 48
+    assert pixels[3] == [-10.0]
+    assert pixels[5] == [-40.0, -20.0, -50.0]
+    assert pixels[9] == [-60.0]
+
+    values, offsets = pixel_maps(maps, "ref", pointings=["0"])
+    assert values.size == 0
+    assert offsets.tolist() == [0] * 49
+
+
+def test_nested_maps():
+    columns = sample_columns()
+    pointings = ["0", "2", "4", "41"]
+    nested = sat_pixel_maps(columns, pointings, [25338, 41188], nside)
+    maps = nested_to_maps(nested, nside)
+
+    assert maps_to_nested(maps) == nested
+    expected = column_maps(stack_columns(columns), pointings, [25338, 41188], nside)
+    for key in expected:
+        assert np.array_equal(maps[key], expected[key])
+
+
+def test_merge_sats():
+    maps = column_maps(
+        stack_columns(sample_columns()), ["0", "2", "4", "41"], [25338, 41188], nside
+    )
+    clean = merge_sats(maps, [25338, 41188], "mwa")
+
+    assert clean["sats"].tolist() == [0]
+    assert "ref" not in clean
+    assert pixel_lists(*pixel_maps(clean, "mwa", ["2"]))[5] == [-2.0, -5.0, -4.0]
+    assert maps_to_nested(clean)["mwa_map"]["41"][0] == [[] for pixel in range(48)]
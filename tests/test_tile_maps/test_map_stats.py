@@ -0,0 +1,50 @@
+from os import path
+from pathlib import Path
+
+import numpy as np
+from embers.tile_maps.map_stats import (pixel_stats, ragged_offsets,
+                                        ragged_stats)
+from scipy.stats import median_absolute_deviation as mad
+
+# Save the path to this directory
+dirpath = path.dirname(__file__)
+
+# Obtain path to directory with test_data
+test_data = path.abspath(path.join(dirpath, "../data"))
+clean_map = Path(f"{test_data}/tile_maps/tile_maps_clean/S06XX_rf0XX_tile_maps.npz")
+map_data = np.load(clean_map, allow_pickle=True)
+
+
+def test_ragged_offsets():
+    values, offsets = ragged_offsets([[1, 2], [], [3]])
+    assert values.tolist() == [1.0, 2.0, 3.0]
+    assert offsets.tolist() == [0, 2, 2, 3]
+
+
+def test_pixel_stats():
+    values = [4, np.nan, 1, 3, np.nan, 2, 8, 5]
+    offsets = [0, 3, 3, 5, 8]
+    stats = pixel_stats(values, offsets, percentiles=[25, 50])
+
+    assert stats["count"].tolist() == [2, 0, 1, 3]
+    assert np.isnan(stats["median"][1])
+    assert stats["median"][[0, 2, 3]].tolist() == [2.5, 3.0, 5.0]
+    assert stats["mean"][3] == 5.0
+    assert stats["mad"][3] == 1.4826 * 3
+    assert stats["percentiles"][:, 0].tolist() == [1.75, 2.5]
+    assert stats["percentiles"][:, 3].tolist() == [3.5, 5.0]
+
+
+def test_ragged_stats_median():
+    stats = ragged_stats(map_data["0"])
+    median = [(np.nanmedian(i) if len(i) else np.nan) for i in map_data["0"]]
+    assert np.allclose(stats["median"], median, rtol=0, atol=0, equal_nan=True)
+
+
+def test_ragged_stats_mad():
+    stats = ragged_stats(map_data["41"])
+    map_mad = [
+        (mad(np.asarray(i)[~np.isnan(i)]) if len(i) else np.nan) for i in map_data["41"]
+    ]
+    assert np.allclose(stats["mad"], map_mad, equal_nan=True)
+    assert stats["count"].sum() == 253
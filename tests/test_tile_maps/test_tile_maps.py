@@ -1,9 +1,15 @@
+import shutil
 from os import path
 from pathlib import Path
 
-from embers.tile_maps.tile_maps import (check_pointing, mwa_clean_maps,
+import healpy as hp
+import numpy as np
+from embers.tile_maps.beam_utils import rotate_map
+from embers.tile_maps.tile_maps import (bin_pass, check_pointing, load_models,
+                                        model_registry, mwa_clean_maps,
                                         plt_channel, plt_clean_maps,
                                         plt_fee_fit, plt_sat_maps,
+                                        pointing_index, pointing_windows,
                                         project_tile_healpix,
                                         rf_apply_thresholds, rfe_batch_cali,
                                         rfe_calibration, rfe_collate_cali,
@@ -51,3 +57,110 @@ def test_check_pointing_none():
         "2019-10-08-00:00", f"{test_data}/tile_maps/obs_pointings.json"
     )
     assert point is None
+
+
+def test_check_pointing_index():
+    point_index = pointing_index(f"{test_data}/tile_maps/obs_pointings.json")
+    assert check_pointing("2019-10-01-23:30", point_index) == 0
+    assert check_pointing("2019-10-07-05:30", point_index) == 41
+    assert check_pointing("2019-10-08-00:00", point_index) is None
+
+
+def test_pointing_windows():
+    point_index = pointing_index(f"{test_data}/tile_maps/obs_pointings.json")
+    windows, points = pointing_windows(
+        point_index, "2019-10-01-23:00", "2019-10-02-00:00"
+    )
+    assert windows.tolist() == [
+        "2019-10-01-23:00",
+        "2019-10-01-23:30",
+        "2019-10-02-00:00",
+    ]
+    assert points.tolist() == [2, 0, 4]
+
+
+def test_pointing_windows_point():
+    windows, points = pointing_windows(
+        f"{test_data}/tile_maps/obs_pointings.json",
+        "2019-10-01-00:00",
+        "2019-10-02-08:00",
+        point=0,
+    )
+    assert windows.tolist() == [
+        "2019-10-01-23:30",
+        "2019-10-02-07:30",
+        "2019-10-02-08:00",
+    ]
+    assert set(points) == {0}
+
+
+def test_model_registry():
+    model_dir = Path(f"{test_data}/tile_maps/models_tmp")
+    model_dir.mkdir(parents=True, exist_ok=True)
+    npix = hp.nside2npix(nside)
+    ref_xx = np.linspace(-30, 0, npix)
+    np.savez_compressed(f"{model_dir}/ref.npz", XX=ref_xx, YY=ref_xx[::-1])
+    np.savez_compressed(
+        f"{model_dir}/fee.npz",
+        **{p: [ref_xx + i, ref_xx - i] for i, p in enumerate(["0", "2", "4", "41"])},
+    )
+
+    model_registry(
+        f"{model_dir}/ref.npz", f"{model_dir}/fee.npz", nside, f"{model_dir}/models"
+    )
+    rotated_fee, fee_m = load_models(f"{model_dir}/models", "S06XX")
+
+    assert np.array_equal(
+        rotated_fee, rotate_map(nside, angle=-np.pi / 2.0, healpix_array=ref_xx)
+    )
+    assert sorted(fee_m.keys()) == ["0", "2", "4", "41"]
+    assert np.array_equal(fee_m["41"][1], ref_xx - 3)
+    shutil.rmtree(model_dir)
+
+
+def test_bin_pass():
+    healpix_index = np.array([7, 3, 7, 7, 9, 3])
+    ref_power = np.array([-30, -40, np.nan, -32, np.nan, -42], dtype=np.float32)
+    tile_power = np.array([-20, -25, -22, -21, -26, -27], dtype=np.float32)
+    times = np.arange(8, dtype=np.float64)
+
+    pixels, ref_pass, tile_pass, times_pass = bin_pass(
+        healpix_index, ref_power, tile_power, times
+    )
+    assert pixels.tolist() == [3, 7, 9]
+    assert ref_pass.dtype == np.float32
+    assert ref_pass[:2].tolist() == [-41, -31]
+    assert np.isnan(ref_pass[2])
+    assert tile_pass.tolist() == [-26, -21, -26]
+    assert times_pass.tolist() == [1, 0, 4]
+
+
+def test_bin_pass_int():
+    _, ref_pass, tile_pass, _ = bin_pass(
+        np.array([7, 7, 3]),
+        np.array([-30, -31, -40]),
+        np.array([-20, -22, -25]),
+        np.array([1, 2, 3]),
+    )
+    assert ref_pass.dtype == np.float64
+    assert ref_pass.tolist() == [-40, -30.5]
+    assert tile_pass.tolist() == [-25, -21]
+
+
+def test_plt_clean_maps_bad_pointing(tmp_path):
+    clean_map = np.load(
+        f"{test_data}/tile_maps/tile_maps_clean/S06XX_rf0XX_tile_maps.npz",
+        allow_pickle=True,
+    )
+    clean_map = {p: clean_map[p] for p in clean_map}
+
+    # Pixel lists of pointing 0 can not be converted to powers
+    clean_map["0"] = np.array([[-30.0], "bad"], dtype=object)
+    bad_map = f"{tmp_path}/S06XX_rf0XX_tile_maps.npz"
+    np.savez_compressed(bad_map, **clean_map)
+
+    plt_clean_maps(bad_map, tmp_path)
+    plots = Path(f"{tmp_path}/tile_maps_clean/clean_plots")
+    assert list(plots.glob("0/*/*.png")) == []
+    for p in ["2", "4", "41"]:
+        assert len(list(plots.glob(f"{p}/*/*.png"))) == 3